@@ -0,0 +1,12 @@
+from .pagination import EstimatedCountPaginator
+
+
+class EstimatedCountAdminMixin:
+    '''
+    Admin changelist that estimates the number of rows of large
+    tables instead of counting them on every page view
+    '''
+
+    paginator = EstimatedCountPaginator
+    # Avoids a second count of the unfiltered table
+    show_full_result_count = False
@@ -0,0 +1,140 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+
+def is_cache_shared():
+    '''
+    Check if the default cache is shared by all server processes
+
+    Returns
+    --------------
+    boolean
+        False for the local memory and the dummy cache, whose
+        entries are only seen by the process that wrote them
+    '''
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def get_cache_version(namespace):
+    '''
+    Return the current version of a cache namespace
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+
+    Returns
+    --------------
+    version : int
+        Version number that is part of every key in the namespace
+    '''
+    version_key = f'{namespace}:version'
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, 1, timeout=None)
+        version = cache.get(version_key, 1)
+    return version
+
+
+def bump_cache_version(namespace):
+    '''
+    Invalidate all entries of a cache namespace by
+    incrementing the namespace version and remember
+    the time of the change
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+    '''
+    version_key = f'{namespace}:version'
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.add(version_key, 1, timeout=None)
+        cache.incr(version_key)
+    cache.set(f'{namespace}:changed-at', timezone.now(), timeout=None)
+
+
+def get_cache_changed_at(namespace):
+    '''
+    Return the time of the last version change of a cache namespace
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+
+    Returns
+    --------------
+    Datetime or None
+        None if the namespace has not changed since the cache was cleared
+    '''
+    return cache.get(f'{namespace}:changed-at')
+
+
+def build_cache_key(namespace, *parts):
+    '''
+    Build a versioned cache key
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+    parts : list
+        Values that identify the entry within the namespace
+
+    Returns
+    --------------
+    str
+        Cache key containing the current namespace version
+    '''
+    version = get_cache_version(namespace)
+    key_parts = ':'.join(str(part) for part in parts)
+    return f'{namespace}:{version}:{key_parts}'
+
+
+def record_cache_access(namespace, hit):
+    '''
+    Count a hit or a miss of a cache namespace
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+    hit : boolean
+        True if the entry was found in the cache
+    '''
+    counter_key = f'{namespace}:{"hits" if hit else "misses"}'
+    if not cache.add(counter_key, 1, timeout=None):
+        try:
+            cache.incr(counter_key)
+        except ValueError:
+            cache.add(counter_key, 1, timeout=None)
+
+
+def get_cache_stats(namespace):
+    '''
+    Return hit and miss counts of a cache namespace
+
+    Parameters
+    --------------
+    namespace : str
+        Name of the group of cache entries
+
+    Returns
+    --------------
+    dict
+        Number of hits, misses and the hit ratio
+    '''
+    hits = cache.get(f'{namespace}:hits', 0)
+    misses = cache.get(f'{namespace}:misses', 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0
+    }
@@ -0,0 +1,183 @@
+from calendar import timegm
+from hashlib import md5
+
+from django.db.models import Count, Max, Sum
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    '''
+    Conditional GET (ETag and Last-Modified) for API views.
+
+    The validators are computed from one aggregate query (latest
+    modification time and row count) so that a 304 response can be
+    returned without serializing any model instance.
+
+    Methods
+    -------------
+    get_validator_scope(request):
+        Returns values that distinguish responses for the same data
+    compute_validators(request, queryset, modified_fields, count_fields, sum_fields, changed_at):
+        Returns ETag and Last-Modified timestamp of a queryset
+    check_not_modified(request, queryset, modified_fields, count_fields, sum_fields, changed_at):
+        Returns a 304 response if the client copy is still valid
+    set_validator_headers(response):
+        Sets ETag and Last-Modified headers in the response
+    '''
+
+    etag = None
+    last_modified = None
+
+    def get_validator_scope(self, request):
+        '''
+        Return values that change the response for the same data -
+        the URL, the active language and the role of the user.
+
+        Parameters
+        -------------
+        request : Request
+
+        Returns
+        -------------
+        tuple
+        '''
+        user = getattr(request, 'user', None)
+        if user is None:
+            role = 'anonymous'
+        elif user.is_staff:
+            role = 'admin'
+        else:
+            role = 'user'
+        return (
+            request.get_full_path(),
+            translation.get_language(),
+            role
+        )
+
+    def compute_validators(
+        self,
+        request,
+        queryset,
+        modified_fields=('updated_at',),
+        count_fields=('id',),
+        sum_fields=(),
+        changed_at=None
+    ):
+        '''
+        Compute ETag and Last-Modified timestamp with one aggregate query
+
+        Parameters
+        -------------
+        request : Request
+        queryset : Queryset
+            Rows that make up the response
+        modified_fields : tuple
+            Date time fields whose latest value is the modification time
+        count_fields : tuple
+            Fields whose number of distinct values are part of the ETag
+        sum_fields : tuple
+            Numeric fields changed without the modification time
+            whose totals are part of the ETag
+        changed_at : Datetime (optional)
+            Time of the last change that may have removed rows, so
+            that Last-Modified does not go back when the latest
+            modified row is removed
+
+        Returns
+        -------------
+        etag : str
+        last_modified : int or None
+            Unix timestamp of the latest modification
+        '''
+        aggregates = {}
+        for index, field_name in enumerate(modified_fields):
+            aggregates[f'modified_{index}'] = Max(field_name)
+        for index, field_name in enumerate(count_fields):
+            aggregates[f'count_{index}'] = Count(field_name, distinct=True)
+        for index, field_name in enumerate(sum_fields):
+            aggregates[f'sum_{index}'] = Sum(field_name)
+        values = queryset.order_by().aggregate(**aggregates)
+        modified_at = [
+            values[f'modified_{index}'] for index in range(len(modified_fields))
+            if values[f'modified_{index}'] is not None
+        ]
+        if changed_at is not None:
+            modified_at.append(changed_at)
+        last_modified = None
+        if modified_at:
+            last_modified = timegm(max(modified_at).utctimetuple())
+        validator_data = repr((
+            self.get_validator_scope(request),
+            sorted(values.items()),
+            changed_at
+        ))
+        etag = md5(validator_data.encode('utf-8')).hexdigest()
+        return etag, last_modified
+
+    def check_not_modified(
+        self,
+        request,
+        queryset,
+        modified_fields=('updated_at',),
+        count_fields=('id',),
+        sum_fields=(),
+        changed_at=None
+    ):
+        '''
+        Compare validators with If-None-Match and If-Modified-Since headers
+
+        Parameters
+        -------------
+        request : Request
+        queryset : Queryset
+            Rows that make up the response
+        modified_fields : tuple
+            Date time fields whose latest value is the modification time
+        count_fields : tuple
+            Fields whose number of distinct values are part of the ETag
+        sum_fields : tuple
+            Numeric fields changed without the modification time
+            whose totals are part of the ETag
+        changed_at : Datetime (optional)
+            Time of the last change that may have removed rows, so
+            that Last-Modified does not go back when the latest
+            modified row is removed
+
+        Returns
+        -------------
+        304 response if the client copy is valid else None
+        '''
+        self.etag, self.last_modified = self.compute_validators(
+            request,
+            queryset,
+            modified_fields=modified_fields,
+            count_fields=count_fields,
+            sum_fields=sum_fields,
+            changed_at=changed_at
+        )
+        return get_conditional_response(
+            request,
+            etag=quote_etag(self.etag),
+            last_modified=self.last_modified
+        )
+
+    def set_validator_headers(self, response):
+        '''
+        Set ETag and Last-Modified headers of a successful response
+
+        Parameters
+        -------------
+        response : Response
+
+        Returns
+        -------------
+        response : Response
+        '''
+        if response.status_code != 200 or self.etag is None:
+            return response
+        response['ETag'] = quote_etag(self.etag)
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,297 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections, transaction, DatabaseError
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .error_definitions import CustomAPIError
+
+ESTIMATED_COUNT_CACHE_PREFIX = 'estimated-count'
+
+
+def get_table_estimate(model, using='default'):
+    '''
+    Return number of rows of a table from database statistics
+
+    Parameters
+    --------------
+    model : Model class
+    using : str
+        Database alias
+
+    Returns
+    --------------
+    int or None
+        Estimated number of rows or None if the database
+        has no statistics of the table
+    '''
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'mysql':
+        sql = 'SELECT table_rows FROM information_schema.tables ' \
+            'WHERE table_schema = DATABASE() AND table_name = %s'
+    elif connection.vendor == 'sqlite':
+        # Filled by ANALYZE, first number of stat is the number of rows
+        # of the table or index - partial indexes have fewer rows
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s'
+    else:
+        return None
+    try:
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [table])
+                rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    try:
+        estimate = max(
+            int(float(str(row[0]).split()[0]))
+            for row in rows if row[0] is not None
+        )
+    except (ValueError, IndexError):
+        return None
+    # Tables never analyzed have negative estimates in PostgreSQL
+    return estimate if estimate >= 0 else None
+
+
+def estimate_count(queryset):
+    '''
+    Return number of items of a queryset. Small querysets are counted
+    exactly. Large querysets are estimated from database statistics
+    if the queryset is not filtered, or from an exact count cached for
+    ESTIMATED_COUNT_CACHE_TIMEOUT seconds.
+
+    Parameters
+    --------------
+    queryset : Queryset or list
+
+    Returns
+    --------------
+    int
+    '''
+    if not hasattr(queryset, 'query'):
+        return len(queryset)
+    estimate = None
+    if not queryset.query.where:
+        estimate = get_table_estimate(queryset.model, using=queryset.db)
+    if estimate is None:
+        sql, params = queryset.query.sql_with_params()
+        cache_key = '{}:{}:{}'.format(
+            ESTIMATED_COUNT_CACHE_PREFIX,
+            queryset.model._meta.label_lower,
+            md5(repr((sql, params)).encode('utf-8')).hexdigest()
+        )
+        estimate = cache.get(cache_key)
+        if estimate is None:
+            estimate = queryset.count()
+            cache.set(
+                cache_key,
+                estimate,
+                timeout=settings.ESTIMATED_COUNT_CACHE_TIMEOUT
+            )
+            return estimate
+    if estimate < settings.ESTIMATED_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    '''
+    Paginator that estimates the number of items of large
+    querysets instead of counting them on every page
+    '''
+
+    @cached_property
+    def count(self):
+        '''Return estimated number of items'''
+        return estimate_count(self.object_list)
+
+
+class KeysetPagination(BasePagination):
+    '''
+    Pagination with an opaque cursor built from the values of the
+    ordering fields of the last item of a page. Every page is fetched
+    with an indexed range filter, so page N costs the same as page 1.
+
+    Attributes
+    --------------
+    ordering : tuple
+        Fields (ascending) that uniquely order the queryset.
+        The last field must be unique.
+    page_size : int
+        Default number of items in a page
+    max_page_size : int
+        Maximum number of items a client can ask for in a page
+    page_size_query_param : str
+        Query parameter with the page size asked for by the client
+    cursor_query_param : str
+        Query parameter with the cursor of the next page
+    paginate_query_param : str
+        Query parameter to opt out of pagination with value "false"
+    include_count : boolean
+        Add estimated number of items to the response
+
+    Methods
+    --------------
+    paginate_queryset(queryset, request, view=None):
+        Returns the items of the page requested
+    get_paginated_response(data):
+        Returns response with next page link and page items
+    '''
+
+    ordering = ('id',)
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    paginate_query_param = 'paginate'
+    include_count = False
+
+    def get_page_size(self, request):
+        '''
+        Return page size from query parameters or the default page size
+
+        Raises
+        -------------
+        400 error
+            If page size is not a positive integer
+        '''
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return self.page_size
+        try:
+            page_size = int(page_size)
+            if page_size <= 0:
+                raise ValueError
+        except ValueError:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Page size must be a positive number')
+            )
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, item):
+        '''
+        Return opaque cursor with ordering field values of an item
+        '''
+        position = [
+            str(getattr(item, field_name)) for field_name in self.ordering
+        ]
+        return urlsafe_b64encode(
+            json.dumps(position).encode('utf-8')
+        ).decode('ascii')
+
+    def decode_cursor(self, request, model):
+        '''
+        Return ordering field values from cursor in query parameters
+
+        Raises
+        -------------
+        400 error
+            If the cursor cannot be decoded
+        '''
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            position = json.loads(
+                urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            )
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(field_name).to_python(value)
+                for field_name, value in zip(self.ordering, position)
+            ]
+            if any(value is None for value in position):
+                raise ValueError
+        except (ValueError, UnicodeError, ValidationError):
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Invalid cursor')
+            )
+        return position
+
+    def get_position_filter(self, position):
+        '''
+        Return filter for items after a position in the ordering:
+        (a > x) or (a = x and b > y) or ...
+        '''
+        position_filter = Q()
+        for index, field_name in enumerate(self.ordering):
+            item_filter = Q(**{f'{field_name}__gt': position[index]})
+            for prev_index in range(index):
+                item_filter &= Q(
+                    **{self.ordering[prev_index]: position[prev_index]}
+                )
+            position_filter |= item_filter
+        return position_filter
+
+    def paginate_queryset(self, queryset, request, view=None):
+        '''
+        Return items of requested page or None if the client
+        opted out of pagination
+
+        Parameters
+        -------------
+        queryset : Queryset
+        request : Request
+        view : View
+
+        Returns
+        -------------
+        List of model instances in the page
+        '''
+        if request.query_params.get(self.paginate_query_param) == 'false':
+            return None
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model)
+        if self.include_count:
+            self.count = estimate_count(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        items = list(queryset[:page_size + 1])
+        self.next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            self.next_cursor = self.encode_cursor(items[-1])
+        return items
+
+    def get_next_link(self):
+        '''Return URL of the next page or None if this is the last page'''
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        '''
+        Return response with link to next page and items of the page
+        '''
+        response_data = OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data)
+        ])
+        if self.include_count:
+            response_data['count'] = self.count
+            response_data.move_to_end('count', last=False)
+        return Response(response_data)
@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    '''
+    Clear the cache before every test as the database
+    is rolled back between tests but the cache is not
+    '''
+    cache.clear()
+    yield
+    cache.clear()
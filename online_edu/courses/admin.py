@@ -1,10 +1,11 @@
 from django.contrib import admin
 from modeltranslation.admin import TranslationAdmin
 
+from common.admin import EstimatedCountAdminMixin
 from .models import Course
 
 
-class CourseAdmin(TranslationAdmin):
+class CourseAdmin(EstimatedCountAdminMixin, TranslationAdmin):
     '''
     Translated model of Course model for admin
     '''
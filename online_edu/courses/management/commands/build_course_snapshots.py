@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from courses.models import Course, CourseSnapshot
+
+
+class Command(BaseCommand):
+    '''
+    Build snapshot documents of all published courses.
+    Needed once for courses published before snapshots existed.
+    '''
+
+    help = 'Build snapshot documents of published courses'
+
+    def handle(self, *args, **options):
+        no_of_courses = 0
+        for course in Course.objects.filter(is_draft=False).iterator():
+            CourseSnapshot.objects.build_snapshot(course)
+            no_of_courses += 1
+        self.stdout.write(f'Built snapshots of {no_of_courses} courses')
@@ -0,0 +1,29 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from courses.models import ArchivedCourse
+
+
+class Command(BaseCommand):
+    '''
+    Move courses that have been archived for long with their
+    lectures and registrations to cold storage.
+    '''
+
+    help = 'Move long archived courses to cold storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.COLD_STORAGE_AFTER_DAYS,
+            help='Days since the last update of an archived course'
+        )
+
+    def handle(self, *args, **options):
+        no_of_courses = ArchivedCourse.objects.move_to_cold_storage(
+            timezone.now() - timedelta(days=options['days'])
+        )
+        self.stdout.write(f'Moved {no_of_courses} courses to cold storage')
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.models import Course
+from courses.search import rebuild_search_index, is_search_index_supported
+
+
+class Command(BaseCommand):
+    '''
+    Recreate the full text search index of courses.
+    Needed after changing settings.LANGUAGES or if the
+    index is out of sync with the course table.
+    '''
+
+    help = 'Rebuild the full text search index of courses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of courses inserted at a time'
+        )
+
+    def handle(self, *args, **options):
+        if not is_search_index_supported():
+            self.stderr.write(
+                'Full text search index is only supported with SQLite'
+            )
+            return
+        with transaction.atomic():
+            no_of_courses = rebuild_search_index(
+                Course.objects.all(),
+                batch_size=options['batch_size']
+            )
+        self.stdout.write(f'Indexed {no_of_courses} courses')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from courses.models import Course
+
+
+class Command(BaseCommand):
+    '''
+    Repair student, lecture and video counters of courses
+    that have drifted from the actual counts.
+    '''
+
+    help = 'Recompute course counters and repair the ones that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of courses checked at a time'
+        )
+
+    def handle(self, *args, **options):
+        no_of_repaired = Course.objects.reconcile_counters(
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(f'Repaired counters of {no_of_repaired} courses')
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from courses.recommendations import refresh_recommendations, DEFAULT_TOP_K
+
+
+class Command(BaseCommand):
+    '''
+    Compute "students who took this also took" recommendations
+    of courses from student registrations.
+    '''
+
+    help = 'Refresh course recommendations from student registrations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=DEFAULT_TOP_K,
+            help='Number of recommendations stored per course'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute all courses instead of courses with new registrations'
+        )
+
+    def handle(self, *args, **options):
+        no_of_courses = refresh_recommendations(
+            top_k=options['top_k'],
+            full=options['full']
+        )
+        self.stdout.write(f'Refreshed recommendations of {no_of_courses} courses')
@@ -1,12 +1,87 @@
 import logging
-from django.db import models
+import math
+import uuid
+from hashlib import md5
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
+from django.db.models import Q, F, Count, Sum, Exists, OuterRef, \
+    Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Exp, Ln, Greatest, Least
+from django.utils import timezone, translation
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
+from modeltranslation.translator import translator
+from modeltranslation.utils import build_localized_fieldname
 
 from common.error_definitions import CustomAPIError
+from common.cache_handling import bump_cache_version, \
+    build_cache_key, \
+    get_cache_version
+from common.error_handling import extract_serializer_error
+from .utils import normalize_title, \
+    normalized_title_field, \
+    get_field_values
+from .search import is_search_index_supported, \
+    search_course_ids, \
+    build_search_subquery, \
+    index_courses, \
+    SEARCH_FIELDS
 
 logger = logging.getLogger(__name__)
 
+COURSE_CACHE_NAMESPACE = 'course-catalog'
+INSTRUCTOR_CACHE_NAMESPACE = 'course-instructors'
+COURSE_COUNTER_FIELDS = (
+    'student_count',
+    'lecture_count',
+    'video_count',
+    'video_bytes'
+)
+# Lower and upper (excluded) price of paid courses in price facet
+COURSE_PRICE_BUCKETS = (
+    (0, 10),
+    (10, 25),
+    (25, 50),
+    (50, None)
+)
+# Trending score added by every event
+TRENDING_EVENT_WEIGHTS = {
+    'registration': 1.0,
+    'lecture_access': 0.1
+}
+# Rank keys are log scores scaled to this fixed time
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+COURSE_BULK_UPDATE_FIELDS = (
+    'subtitle',
+    'description',
+    'price',
+    'is_free',
+    'is_draft',
+    'is_archived'
+)
+SLUG_HISTORY_VERSION_KEY = 'course-slug-history:version'
+# Paths of course collection endpoints that would hide courses with these slugs
+RESERVED_COURSE_SLUGS = (
+    'new-course',
+    'search',
+    'facets',
+    'trending',
+    'taught',
+    'bulk-update',
+    'cache-stats'
+)
+# Retired slugs of this process, reloaded when the version in cache changes
+_slug_redirects = {
+    'version': None,
+    'redirects': {}
+}
+
 
 class CourseManager(models.Manager):
     '''
@@ -18,10 +93,40 @@ class CourseManager(models.Manager):
         Returns list of published courses that are not archived
 
     get_course_by_slug(slug, admin_only=True):
-        Returns course object from course slug
+        Returns course object from current or retired course slug
 
     check_if_title_duplicate(id, title):
         Throws error if course with different id has same title
+
+    search_courses(text, limit=20):
+        Returns published courses matching search text
+
+    get_search_languages():
+        Returns languages searched
+
+    filter_by_search(courses, text):
+        Narrows courses to the ones matching search text
+
+    adjust_counters(course_id, **deltas):
+        Increments or decrements counter columns of a course
+
+    reconcile_counters(batch_size=500):
+        Repairs counter columns that differ from actual counts
+
+    bulk_update_courses(user, items):
+        Updates several courses of an instructor in one transaction
+
+    clone_course(course, title):
+        Copies a course with its lectures and video links
+
+    get_instructors():
+        Returns instructors of published courses
+
+    get_facets(search_text=None, filters=None):
+        Returns facet counts of published courses
+
+    get_taught_courses(user):
+        Returns courses of an instructor with their statistics
     '''
 
     def fetch_courses(self, is_draft=False, is_archived=False):
@@ -75,7 +180,15 @@ class CourseManager(models.Manager):
                 detail=_('Slug missing')
             )
         try:
-            course = self.get_queryset().get(slug=slug)
+            # Retired slugs are resolved from the in-process map
+            redirect = apps.get_model(
+                'courses',
+                'CourseSlugHistory'
+            ).objects.get_redirect(slug)
+            if redirect is not None:
+                course = self.get_queryset().get(pk=redirect[0])
+            else:
+                course = self.get_queryset().get(slug=slug)
             if not admin_only:
                 if course.is_draft or course.is_archived:
                     logger.critical(
@@ -92,7 +205,9 @@ class CourseManager(models.Manager):
 
     def check_if_title_duplicate(self, id, title):
         '''
-        Check if course with same title exists
+        Check if course with same title (case insensitive) exists
+        in the active language. Looks up the unique index of the
+        normalized title column.
 
         Parameters
         -------------
@@ -110,9 +225,1526 @@ class CourseManager(models.Manager):
         -------------
         boolean: False if not duplicate
         '''
-        if self.get_queryset().exclude(id=id).filter(title__iexact=title).count() >= 1:
+        normalized_title = normalize_title(title)
+        if normalized_title is None:
+            return False
+        if self.get_queryset().filter(
+            **{normalized_title_field(): normalized_title}
+        ).exclude(id=id).exists():
             raise CustomAPIError(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=_('A course with this title already exists')
             )
         return False
+
+    def search_courses(self, text, limit=20):
+        '''
+        Search published courses in the active language
+        (and the default language as fallback).
+        Uses the full text search index if the database supports it.
+
+        Parameters
+        -------------
+        text : str
+            Search text
+        limit : int, optional
+            Maximum number of courses returned. Default is 20.
+
+        Returns
+        -------------
+        List of course model instances with the best match first
+        '''
+        languages = self.get_search_languages()
+        if is_search_index_supported():
+            course_ids = search_course_ids(text, languages, limit)
+            courses = self.fetch_courses().in_bulk(course_ids)
+            return [
+                courses[course_id] for course_id in course_ids
+                if course_id in courses
+            ]
+        return list(self.filter_by_search(self.fetch_courses(), text)[:limit])
+
+    def get_search_languages(self):
+        '''
+        Return languages searched - the active language
+        and the default language as fallback
+
+        Returns
+        -------------
+        List of language codes
+        '''
+        supported_languages = dict(settings.LANGUAGES)
+        languages = [settings.LANGUAGE_CODE]
+        active_language = translation.get_language()
+        if active_language in supported_languages and \
+                active_language != settings.LANGUAGE_CODE:
+            languages.insert(0, active_language)
+        return languages
+
+    def filter_by_search(self, courses, text):
+        '''
+        Narrow courses to the ones matching search text without
+        ranking them. The search index is used as a subquery
+        if the database supports it.
+
+        Parameters
+        -------------
+        courses : Queryset
+        text : str
+            Search text
+
+        Returns
+        -------------
+        Queryset
+        '''
+        languages = self.get_search_languages()
+        if is_search_index_supported():
+            subquery = build_search_subquery(text, languages)
+            if subquery is None:
+                return courses.none()
+            return courses.filter(pk__in=RawSQL(*subquery))
+        search_filter = Q()
+        for language in languages:
+            for field_name in SEARCH_FIELDS:
+                search_filter |= Q(
+                    **{f'{field_name}_{language}__icontains': text}
+                )
+        return courses.filter(search_filter)
+
+    def adjust_counters(self, course_id, **deltas):
+        '''
+        Increment or decrement counter columns of a course in a
+        single UPDATE so that concurrent changes are not lost.
+        The modification time and the catalog cache are left
+        as they are - cached responses of the course expire
+        as the counters are part of its ETag.
+
+        Parameters
+        -------------
+        course_id : int
+            Id of course. Nothing is done if None.
+        deltas : dict
+            Change of every counter column, for example student_count=1
+        '''
+        if course_id is None:
+            return
+        changes = {
+            field_name: F(field_name) + delta
+            for field_name, delta in deltas.items()
+            if field_name in COURSE_COUNTER_FIELDS and delta
+        }
+        if not changes:
+            return
+        self.get_queryset().filter(pk=course_id).update(**changes)
+
+    def get_actual_counters(self):
+        '''
+        Return courses annotated with counts from the
+        registration, lecture and video tables
+
+        Returns
+        -------------
+        Queryset of courses with actual_<counter> annotations
+        '''
+        related_models = {
+            'student_count': (
+                apps.get_model('registration', 'CourseStudentRegistration'),
+                Count('pk')
+            ),
+            'lecture_count': (
+                apps.get_model('lectures', 'Lecture'),
+                Count('pk')
+            ),
+            'video_count': (
+                apps.get_model('video_contents', 'VideoContent'),
+                Count('pk')
+            ),
+            'video_bytes': (
+                apps.get_model('video_contents', 'VideoContent'),
+                Sum('file_size')
+            ),
+        }
+        annotations = {}
+        for field_name, (model, aggregate) in related_models.items():
+            annotations[f'actual_{field_name}'] = Coalesce(
+                Subquery(
+                    model.objects.filter(course=OuterRef('pk'))
+                    .order_by()
+                    .values('course')
+                    .annotate(total=aggregate)
+                    .values('total')
+                ),
+                Value(0)
+            )
+        return self.get_queryset().annotate(**annotations)
+
+    def reconcile_counters(self, batch_size=500):
+        '''
+        Repair counter columns that differ from actual counts.
+        Courses are processed in batches of primary keys.
+
+        Parameters
+        -------------
+        batch_size : int, optional
+            Number of courses checked at a time. Default is 500.
+
+        Returns
+        -------------
+        int
+            Number of courses whose counters were repaired
+        '''
+        no_of_repaired = 0
+        last_id = 0
+        while True:
+            courses = list(
+                self.get_actual_counters()
+                .filter(pk__gt=last_id)
+                .order_by('pk')[:batch_size]
+            )
+            if not courses:
+                break
+            last_id = courses[-1].pk
+            repaired_courses = []
+            for course in courses:
+                is_drifted = False
+                for field_name in COURSE_COUNTER_FIELDS:
+                    actual_value = getattr(course, f'actual_{field_name}')
+                    if getattr(course, field_name) != actual_value:
+                        setattr(course, field_name, actual_value)
+                        is_drifted = True
+                if is_drifted:
+                    repaired_courses.append(course)
+            if repaired_courses:
+                self.get_queryset().bulk_update(
+                    repaired_courses,
+                    COURSE_COUNTER_FIELDS
+                )
+                no_of_repaired += len(repaired_courses)
+        if no_of_repaired:
+            bump_cache_version(COURSE_CACHE_NAMESPACE)
+            logger.info(f'Counters of {no_of_repaired} courses repaired')
+        return no_of_repaired
+
+    def bulk_update_courses(self, user, items):
+        '''
+        Update several courses of an instructor in one transaction.
+        All items are validated first with one query for the courses
+        and the instructor check, then valid changes are saved with
+        a single bulk update. Course titles cannot be changed in bulk.
+
+        Parameters
+        -------------
+        user : User model instance
+            Instructor updating the courses
+        items : list
+            Dictionaries with course slug and fields to be changed
+
+        Returns
+        -------------
+        List of results in the order of items, each with slug,
+        status code and course data or error detail
+        '''
+        from .serializers import CourseSerializer
+        slugs = [item.get('slug', None) for item in items]
+        courses = {
+            course.slug: course
+            for course in self.get_queryset().filter(slug__in=slugs).annotate(
+                is_instructor=Exists(
+                    self.model.instructors.through.objects.filter(
+                        course_id=OuterRef('pk'),
+                        user_id=user.pk
+                    )
+                )
+            )
+        }
+        results = []
+        updated_courses = []
+        update_fields = {'updated_at'}
+        language = translation.get_language()
+        translated_fields = translator.get_options_for_model(self.model).fields
+        for slug, item in zip(slugs, items):
+            course = courses.get(slug, None)
+            fields = item.get('fields', None)
+            error = None
+            if course is None:
+                error = (status.HTTP_404_NOT_FOUND, _('Course not found'))
+            elif not course.is_instructor:
+                error = (
+                    status.HTTP_403_FORBIDDEN,
+                    _('Only an instructor of a course can update a course')
+                )
+            elif not isinstance(fields, dict) or not fields:
+                error = (status.HTTP_400_BAD_REQUEST, _('Empty request body'))
+            elif 'title' in fields:
+                error = (
+                    status.HTTP_400_BAD_REQUEST,
+                    _('Course title cannot be changed in a bulk update')
+                )
+            if error is None:
+                serializer = CourseSerializer(course, data=fields, partial=True)
+                if serializer.is_valid():
+                    changes = {
+                        field_name: value
+                        for field_name, value in serializer.validated_data.items()
+                        if field_name in COURSE_BULK_UPDATE_FIELDS
+                    }
+                    is_free = changes.get('is_free', course.is_free)
+                    price = changes.get('price', course.price)
+                    if not is_free and (price is None or price <= 0):
+                        error = (
+                            status.HTTP_400_BAD_REQUEST,
+                            _('Course price is required')
+                        )
+                else:
+                    error = (
+                        status.HTTP_400_BAD_REQUEST,
+                        extract_serializer_error(serializer.errors)
+                    )
+            if error is not None:
+                logger.error(
+                    f'Bulk update of course {slug} by user {user.id} failed - {error[1]}'
+                )
+                results.append({
+                    'slug': slug,
+                    'status_code': error[0],
+                    'detail': error[1]
+                })
+                continue
+            for field_name, value in changes.items():
+                setattr(course, field_name, value)
+                update_fields.add(field_name)
+                if field_name in translated_fields:
+                    update_fields.add(
+                        build_localized_fieldname(field_name, language)
+                    )
+            updated_courses.append(course)
+            results.append({'slug': slug, 'status_code': status.HTTP_200_OK})
+        if updated_courses:
+            now = timezone.now()
+            for course in updated_courses:
+                course.updated_at = now
+            with transaction.atomic():
+                self.bulk_update(updated_courses, sorted(update_fields))
+            # bulk_update skips model signals
+            bump_cache_version(COURSE_CACHE_NAMESPACE)
+            index_courses(updated_courses)
+            snapshot_manager = apps.get_model('courses', 'CourseSnapshot').objects
+            for course in updated_courses:
+                if not course.is_draft:
+                    snapshot_manager.build_snapshot(course)
+            logger.info(
+                f'{len(updated_courses)} courses updated in bulk by user {user.id}'
+            )
+        course_data = {
+            course.slug: CourseSerializer(course).data
+            for course in updated_courses
+        }
+        for result in results:
+            if result['status_code'] == status.HTTP_200_OK:
+                result['course'] = course_data[result['slug']]
+        return results
+
+    def clone_course(self, course, title):
+        '''
+        Copy a course with its lectures and the videos of the lectures.
+        The copy is a draft with the same instructors. Lectures are
+        inserted in one query and keep their sequence numbers. Videos
+        are shared with the original course and not copied.
+
+        Parameters
+        -------------
+        course : Course model instance
+            Course being copied
+        title : str
+            Title of the new course
+
+        Raises
+        -------------
+        400 error
+            If title is missing or another course has the same title
+
+        Returns
+        -------------
+        Course model instance
+        '''
+        if not title:
+            logger.error(f'Copy of course {course.id} without title')
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Course title is required')
+            )
+        self.check_if_title_duplicate(None, title)
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        lectures = list(lecture_model.objects.filter(course=course))
+        video_links = list(
+            lecture_model.videos.through.objects.filter(
+                lecture__course=course
+            ).values_list('lecture_id', 'videocontent_id')
+        )
+        instructor_ids = list(course.instructors.values_list('id', flat=True))
+        with transaction.atomic():
+            new_course = self.create(
+                title=title,
+                is_draft=True,
+                lecture_count=len(lectures),
+                **get_field_values(
+                    course,
+                    ['subtitle', 'description', 'price', 'is_free']
+                )
+            )
+            new_course.instructors.add(*instructor_ids)
+            # bulk_create skips the signals that number and count lectures
+            new_lectures = lecture_model.objects.bulk_create([
+                lecture_model(
+                    course=new_course,
+                    **get_field_values(
+                        lecture,
+                        ['title', 'description', 'position']
+                    )
+                )
+                for lecture in lectures
+            ])
+            new_lecture_ids = {
+                lecture.id: new_lecture.id
+                for lecture, new_lecture in zip(lectures, new_lectures)
+            }
+            lecture_model.videos.through.objects.bulk_create([
+                lecture_model.videos.through(
+                    lecture_id=new_lecture_ids[lecture_id],
+                    videocontent_id=video_id
+                )
+                for lecture_id, video_id in video_links
+            ])
+        logger.info(
+            f'Course {course.id} copied to course {new_course.id} with {len(lectures)} lectures'
+        )
+        return new_course
+
+    def get_instructors(self):
+        '''
+        Return instructors of published courses that are not archived.
+        Cached until courses or their instructors change.
+
+        Returns
+        -------------
+        List of dicts with id and display name of instructor
+        '''
+        cache_key = build_cache_key(
+            COURSE_CACHE_NAMESPACE,
+            'instructors',
+            get_cache_version(INSTRUCTOR_CACHE_NAMESPACE)
+        )
+        instructors = cache.get(cache_key)
+        if instructors is None:
+            instructors = [
+                {
+                    'id': user_id,
+                    'name': f'{first_name} {last_name}'.strip()
+                }
+                for user_id, first_name, last_name in
+                self.model.instructors.field.related_model.objects.filter(
+                    courses_taught__is_draft=False,
+                    courses_taught__is_archived=False
+                ).distinct().order_by('id').values_list(
+                    'id', 'first_name', 'last_name'
+                )
+            ]
+            cache.set(cache_key, instructors, timeout=None)
+        return instructors
+
+    def get_facets(self, search_text=None, filters=None):
+        '''
+        Return facet counts of published courses computed with one
+        conditional aggregation query. Results are cached for every
+        combination of search text, filters and language.
+
+        Parameters
+        -------------
+        search_text : str (optional)
+            Only courses matching the text are counted
+        filters : dict (optional)
+            Only courses matching the filters are counted:
+            - is_free : boolean
+            - instructor : int (user id)
+            - price_min : float
+            - price_max : float
+
+        Returns
+        -------------
+        dict
+            Number of courses in total, free and paid, in every
+            price bucket, of every instructor and in every language
+        '''
+        filters = filters or {}
+        instructors = self.get_instructors()
+        signature = repr((search_text, sorted(filters.items())))
+        cache_key = build_cache_key(
+            COURSE_CACHE_NAMESPACE,
+            'facets',
+            get_cache_version(INSTRUCTOR_CACHE_NAMESPACE),
+            translation.get_language(),
+            md5(signature.encode('utf-8')).hexdigest()
+        )
+        facets = cache.get(cache_key)
+        if facets is not None:
+            return facets
+        courses = self.fetch_courses()
+        if search_text:
+            courses = self.filter_by_search(courses, search_text)
+        if filters.get('is_free', None) is not None:
+            courses = courses.filter(is_free=filters['is_free'])
+        if filters.get('instructor', None) is not None:
+            courses = courses.filter(
+                pk__in=self.model.instructors.through.objects.filter(
+                    user_id=filters['instructor']
+                ).values('course_id')
+            )
+        if filters.get('price_min', None) is not None:
+            courses = courses.filter(price__gte=filters['price_min'])
+        if filters.get('price_max', None) is not None:
+            courses = courses.filter(price__lte=filters['price_max'])
+
+        # Courses are joined with their instructors for the instructor
+        # counts, so every count is distinct
+        def count(condition=None):
+            return Count('pk', filter=condition, distinct=True)
+
+        aggregates = {
+            'total': count(),
+            'free': count(Q(is_free=True)),
+            'paid': count(Q(is_free=False))
+        }
+        for index, (price_min, price_max) in enumerate(COURSE_PRICE_BUCKETS):
+            condition = Q(is_free=False, price__gte=price_min)
+            if price_max is not None:
+                condition &= Q(price__lt=price_max)
+            aggregates[f'price_{index}'] = count(condition)
+        for language, _language_name in settings.LANGUAGES:
+            title_field = build_localized_fieldname('title', language)
+            aggregates[f'language_{language}'] = count(
+                Q(**{f'{title_field}__isnull': False}) &
+                ~Q(**{title_field: ''})
+            )
+        for instructor in instructors:
+            aggregates[f'instructor_{instructor["id"]}'] = count(
+                Q(instructors=instructor['id'])
+            )
+        counts = courses.order_by().aggregate(**aggregates)
+        facets = {
+            'total': counts['total'],
+            'is_free': {
+                'free': counts['free'],
+                'paid': counts['paid']
+            },
+            'price': [
+                {
+                    'min': price_min,
+                    'max': price_max,
+                    'count': counts[f'price_{index}']
+                }
+                for index, (price_min, price_max) in
+                enumerate(COURSE_PRICE_BUCKETS)
+            ],
+            'instructors': [
+                {**instructor, 'count': counts[f'instructor_{instructor["id"]}']}
+                for instructor in instructors
+                if counts[f'instructor_{instructor["id"]}']
+            ],
+            'languages': [
+                {'code': language, 'count': counts[f'language_{language}']}
+                for language, _language_name in settings.LANGUAGES
+            ]
+        }
+        cache.set(cache_key, facets, timeout=settings.COURSE_CACHE_TIMEOUT)
+        return facets
+
+    def get_taught_courses(self, user):
+        '''
+        Return all courses of an instructor with the number of
+        lectures, students and videos and the last time the course,
+        its lectures or its videos were updated. Counts come from
+        the counter columns and the update times from subqueries,
+        so the courses are fetched in one query.
+
+        Parameters
+        -------------
+        user : User
+            Instructor
+
+        Returns
+        -------------
+        Queryset of course model instances with last_updated_at,
+        most recently updated first
+        '''
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        video_model = apps.get_model('video_contents', 'VideoContent')
+
+        def last_updated(model):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(course=OuterRef('pk'))
+                    .order_by('-updated_at')
+                    .values('updated_at')[:1]
+                ),
+                F('updated_at')
+            )
+
+        return self.get_queryset().filter(
+            instructors=user
+        ).annotate(
+            last_updated_at=Greatest(
+                F('updated_at'),
+                last_updated(lecture_model),
+                last_updated(video_model)
+            )
+        ).order_by('-last_updated_at', '-id')
+
+
+class CourseSnapshotManager(models.Manager):
+    '''
+    Manager for CourseSnapshot model
+
+    Methods
+    -------------
+    build_snapshot(course):
+        Builds the documents of a course in every language
+
+    get_lecture_order(course_id):
+        Returns sequence numbers of lectures of a course
+
+    reorder_lectures(course_id):
+        Puts lectures in the snapshot of a published course in order
+
+    update_lectures(course_id, lecture_ids):
+        Replaces lectures in the snapshot of a published course
+
+    remove_lecture(course_id, lecture_id):
+        Removes a lecture from the snapshot of a published course
+
+    get_published_snapshot(slug):
+        Returns snapshot of a published course from course slug
+    '''
+
+    def serialize_lecture(self, lecture):
+        '''
+        Return document of a lecture with its videos in active language
+
+        Parameters
+        -------------
+        lecture : Lecture model instance
+
+        Returns
+        -------------
+        dict
+        '''
+        from lectures.serializers import LectureDetailSerializer
+        return dict(LectureDetailSerializer(lecture).data)
+
+    def build_snapshot(self, course):
+        '''
+        Build course document with ordered lectures and their videos
+        for every language and store it as course snapshot.
+
+        Parameters
+        -------------
+        course : Course model instance
+
+        Returns
+        -------------
+        CourseSnapshot model instance
+        '''
+        from .serializers import CourseSerializer
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        lectures = list(
+            lecture_model.objects.with_seq_no(
+                lecture_model.objects.filter(course=course)
+            ).prefetch_related('videos')
+        )
+        documents = {}
+        for language, _language_name in settings.LANGUAGES:
+            with translation.override(language):
+                document = dict(CourseSerializer(course).data)
+                document['lectures'] = [
+                    self.serialize_lecture(lecture) for lecture in lectures
+                ]
+                documents[language] = document
+        snapshot, _created = self.update_or_create(
+            course=course,
+            defaults={'documents': documents}
+        )
+        logger.info(f'Snapshot of course {course.id} built')
+        return snapshot
+
+    def get_snapshot_for_update(self, course_id):
+        '''
+        Return snapshot of a published course
+
+        Parameters
+        -------------
+        course_id : int
+
+        Returns
+        -------------
+        CourseSnapshot model instance or None
+        '''
+        return self.get_queryset().filter(
+            course_id=course_id,
+            course__is_draft=False
+        ).first()
+
+    def get_lecture_order(self, course_id):
+        '''
+        Return sequence numbers of lectures of a course
+
+        Parameters
+        -------------
+        course_id : int
+
+        Returns
+        -------------
+        dict
+            Sequence number of every lecture id
+        '''
+        return {
+            lecture_id: index
+            for index, lecture_id in enumerate(
+                apps.get_model('lectures', 'Lecture').objects.filter(
+                    course_id=course_id
+                ).values_list('id', flat=True),
+                start=1
+            )
+        }
+
+    def reorder_lectures(self, course_id):
+        '''
+        Put lectures in the snapshot of a published course
+        in the current order without serializing them again
+
+        Parameters
+        -------------
+        course_id : int
+        '''
+        snapshot = self.get_snapshot_for_update(course_id)
+        if snapshot is None:
+            return
+        lecture_order = self.get_lecture_order(course_id)
+        for document in snapshot.documents.values():
+            document['lectures'].sort(key=lambda x: lecture_order[x['id']])
+            for lecture_document in document['lectures']:
+                lecture_document['seq_no'] = lecture_order[lecture_document['id']]
+        snapshot.save()
+
+    def update_lectures(self, course_id, lecture_ids):
+        '''
+        Replace lectures in the snapshot of a published course.
+        Other lectures in the snapshot are not serialized again.
+
+        Parameters
+        -------------
+        course_id : int
+        lecture_ids : list
+            Ids of lectures that have changed
+        '''
+        if course_id is None or not lecture_ids:
+            return
+        snapshot = self.get_snapshot_for_update(course_id)
+        if snapshot is None:
+            return
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        lectures = list(
+            lecture_model.objects.filter(
+                course_id=course_id,
+                pk__in=lecture_ids
+            ).prefetch_related('videos')
+        )
+        # Sequence numbers of other lectures change when
+        # a lecture is added or moved
+        lecture_order = self.get_lecture_order(course_id)
+        for lecture in lectures:
+            lecture.seq_no = lecture_order[lecture.id]
+        lecture_ids = set(lecture_ids)
+        for language, document in snapshot.documents.items():
+            with translation.override(language):
+                lecture_documents = [
+                    self.serialize_lecture(lecture) for lecture in lectures
+                ]
+            lecture_documents += [
+                x for x in document['lectures'] if x['id'] not in lecture_ids
+            ]
+            lecture_documents.sort(key=lambda x: lecture_order[x['id']])
+            for lecture_document in lecture_documents:
+                lecture_document['seq_no'] = lecture_order[lecture_document['id']]
+            document['lectures'] = lecture_documents
+        snapshot.save()
+
+    def remove_lecture(self, course_id, lecture_id):
+        '''
+        Remove a lecture from the snapshot of a published course
+
+        Parameters
+        -------------
+        course_id : int
+        lecture_id : int
+        '''
+        snapshot = self.get_snapshot_for_update(course_id)
+        if snapshot is None:
+            return
+        for document in snapshot.documents.values():
+            document['lectures'] = [
+                x for x in document['lectures'] if x['id'] != lecture_id
+            ]
+            for index, lecture_document in enumerate(
+                document['lectures'],
+                start=1
+            ):
+                lecture_document['seq_no'] = index
+        snapshot.save()
+
+    def get_published_snapshot(self, slug):
+        '''
+        Return snapshot of a published course that is not archived
+
+        Parameters
+        -------------
+        slug : str
+            Course slug
+
+        Raises
+        -------------
+        404 error
+            If course is not found, not published or archived
+
+        Returns
+        -------------
+        CourseSnapshot model instance
+        '''
+        snapshot = self.get_queryset().select_related('course').filter(
+            course__slug=slug,
+            course__is_draft=False,
+            course__is_archived=False
+        ).first()
+        if snapshot is None:
+            logger.error(f'Snapshot of course with slug {slug} not found')
+            raise CustomAPIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=_('Course not found')
+            )
+        return snapshot
+
+
+class CourseRecommendationManager(models.Manager):
+    '''
+    Manager for CourseRecommendation model
+
+    Methods
+    -------------
+    get_recommended_courses(course, limit=10):
+        Returns published courses taken by students of a course
+    '''
+
+    def get_recommended_courses(self, course, limit=10):
+        '''
+        Return published courses taken by students of a course
+        with a single lookup of the precomputed recommendations
+
+        Parameters
+        -------------
+        course : Course model instance
+        limit : int
+            Maximum number of courses
+
+        Returns
+        -------------
+        List of course model instances with best match first
+        '''
+        recommendations = self.get_queryset().select_related(
+            'recommended_course'
+        ).filter(
+            course=course,
+            recommended_course__is_draft=False,
+            recommended_course__is_archived=False
+        ).order_by('rank')[:limit]
+        return [x.recommended_course for x in recommendations]
+
+
+class CourseTrendManager(models.Manager):
+    '''
+    Manager for CourseTrend model
+
+    Trending scores decay exponentially with time. Every course stores
+    its score at the last event and a rank key which is the log of the
+    score scaled to a fixed epoch, so that courses can be ordered by
+    an index without decaying every score to the current time.
+
+    Methods
+    -------------
+    get_decay_rate():
+        Returns decay rate of scores per second
+
+    get_time_offset(when):
+        Returns log scale of a score from the epoch to a time
+
+    record_event(course_id, event, when=None):
+        Adds an event to the trending score of a course
+
+    record_lecture_access(course_id, user_id, lecture_id):
+        Adds the first access of a lecture by a user in a time window
+
+    get_trending_courses(limit=10):
+        Returns published courses with highest trending scores
+    '''
+
+    def get_decay_rate(self):
+        '''
+        Return decay rate of trending scores per second
+
+        Returns
+        -------------
+        float
+        '''
+        return math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+    def get_time_offset(self, when):
+        '''
+        Return the log of the factor by which a score at a time
+        is larger than the same score decayed to the epoch
+
+        Parameters
+        -------------
+        when : Datetime
+
+        Returns
+        -------------
+        float
+        '''
+        return self.get_decay_rate() * (when - TRENDING_EPOCH).total_seconds()
+
+    def record_event(self, course_id, event, when=None):
+        '''
+        Add an event to the trending score of a course with a single
+        UPDATE - the stored score is decayed to the time of the event
+        and the weight of the event is added
+
+        Parameters
+        -------------
+        course_id : int
+            Id of course. Nothing is done if None.
+        event : str
+            Type of event in TRENDING_EVENT_WEIGHTS
+        when : Datetime (optional)
+            Time of event. Default is now.
+        '''
+        if course_id is None:
+            return
+        if when is None:
+            when = timezone.now()
+        time_offset = self.get_time_offset(when)
+        event_key = Value(math.log(TRENDING_EVENT_WEIGHTS[event]) + time_offset)
+        # log(exp(a) + exp(b)) without overflow
+        rank_key = Greatest(F('rank_key'), event_key) + Ln(
+            Value(1.0) + Exp(
+                Least(F('rank_key'), event_key) -
+                Greatest(F('rank_key'), event_key)
+            )
+        )
+        updated = self.get_queryset().filter(course_id=course_id).update(
+            rank_key=rank_key,
+            score=Exp(rank_key - Value(time_offset)),
+            last_event_at=when
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                self.create(
+                    course_id=course_id,
+                    rank_key=event_key.value,
+                    score=TRENDING_EVENT_WEIGHTS[event],
+                    last_event_at=when
+                )
+        except IntegrityError:
+            # Created by a concurrent event
+            self.record_event(course_id, event, when=when)
+
+    def record_lecture_access(self, course_id, user_id, lecture_id):
+        '''
+        Add access of a lecture to the trending score of its course.
+        Repeated accesses of a lecture by a user within
+        TRENDING_ACCESS_WINDOW seconds are counted once.
+
+        Parameters
+        -------------
+        course_id : int
+        user_id : int
+        lecture_id : int
+        '''
+        if not cache.add(
+            f'course-trend:access:{user_id}:{lecture_id}',
+            1,
+            timeout=settings.TRENDING_ACCESS_WINDOW
+        ):
+            return
+        self.record_event(course_id, 'lecture_access')
+
+    def get_trending_courses(self, limit=10):
+        '''
+        Return published courses that are not archived
+        ordered by trending score
+
+        Parameters
+        -------------
+        limit : int
+            Maximum number of courses
+
+        Returns
+        -------------
+        List of course model instances
+        '''
+        trends = self.get_queryset().select_related('course').filter(
+            course__is_draft=False,
+            course__is_archived=False
+        ).order_by('-rank_key')[:limit]
+        return [trend.course for trend in trends]
+
+
+class ArchivedCourseManager(models.Manager):
+    '''
+    Manager for ArchivedCourse model
+
+    Methods
+    -------------
+    move_to_cold_storage(archived_before):
+        Moves courses archived before a time out of the live tables
+
+    archive_course(course):
+        Moves a course with its lectures and registrations
+
+    get_by_slug(slug):
+        Returns archived course from course slug
+
+    restore(archived_course):
+        Moves a course back to the live tables and unarchives it
+    '''
+
+    def move_to_cold_storage(self, archived_before):
+        '''
+        Move courses archived and not updated since a time
+
+        Parameters
+        -------------
+        archived_before : Datetime
+
+        Returns
+        -------------
+        int
+            Number of courses moved
+        '''
+        courses = apps.get_model('courses', 'Course').objects.filter(
+            is_archived=True,
+            updated_at__lt=archived_before
+        )
+        # Buffered progress of students is archived with the courses
+        apps.get_model('lectures', 'LectureProgress').objects.flush_progress()
+        no_of_courses = 0
+        for course in courses.iterator():
+            self.archive_course(course)
+            no_of_courses += 1
+        logger.info(f'{no_of_courses} archived courses moved to cold storage')
+        return no_of_courses
+
+    def archive_course(self, course):
+        '''
+        Store a course with its lectures, registrations, progress
+        of students, trending score, recommendations and retired
+        slugs and delete them from the live tables. Videos stay in
+        the video table without the course.
+
+        Parameters
+        -------------
+        course : Course model instance
+
+        Returns
+        -------------
+        ArchivedCourse model instance
+        '''
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        registration_model = apps.get_model(
+            'registration',
+            'CourseStudentRegistration'
+        )
+        video_model = apps.get_model('video_contents', 'VideoContent')
+        progress_model = apps.get_model('lectures', 'LectureProgress')
+        recommendation_model = apps.get_model(
+            'courses',
+            'CourseRecommendation'
+        )
+        lectures = lecture_model.objects.filter(
+            course=course
+        ).prefetch_related('videos')
+        registrations = registration_model.objects.filter(course=course)
+        trend = apps.get_model('courses', 'CourseTrend').objects.filter(
+            course=course
+        ).first()
+        data = {
+            'course': {
+                **get_field_values(course, [
+                    'title', 'subtitle', 'description', 'slug',
+                    'price', 'is_free', 'is_draft'
+                ]),
+                'created_at': course.created_at.isoformat()
+            },
+            'instructors': list(
+                course.instructors.values_list('id', flat=True)
+            ),
+            'lectures': [
+                {
+                    'id': lecture.id,
+                    **get_field_values(
+                        lecture,
+                        ['title', 'description', 'position']
+                    ),
+                    'videos': [video.id for video in lecture.videos.all()]
+                }
+                for lecture in lectures
+            ],
+            # Full precision of times as the JSON encoder keeps milliseconds
+            'registrations': [
+                {'user_id': user_id, 'registered_at': registered_at.isoformat()}
+                for user_id, registered_at in
+                registrations.values_list('user_id', 'registered_at')
+            ],
+            'videos': list(
+                video_model.objects.filter(
+                    course=course
+                ).values_list('id', flat=True)
+            ),
+            'progress': [
+                {
+                    'user_id': user_id,
+                    'lecture_id': lecture_id,
+                    'video_id': video_id,
+                    'position': position,
+                    'completed': completed,
+                    'updated_at': updated_at.isoformat()
+                }
+                for user_id, lecture_id, video_id, position, completed,
+                updated_at in progress_model.objects.filter(
+                    lecture__course=course
+                ).values_list(
+                    'user_id', 'lecture_id', 'video_id',
+                    'position', 'completed', 'updated_at'
+                )
+            ],
+            'trend': {
+                'score': trend.score,
+                'rank_key': trend.rank_key,
+                'last_event_at': trend.last_event_at.isoformat()
+            } if trend is not None else None,
+            # Recommendations of the course and for other courses
+            'recommendations': [
+                {
+                    'course_id': course_id,
+                    'recommended_course_id': recommended_course_id,
+                    'rank': rank,
+                    'score': score,
+                    'computed_at': computed_at.isoformat()
+                }
+                for course_id, recommended_course_id, rank, score,
+                computed_at in recommendation_model.objects.filter(
+                    Q(course=course) | Q(recommended_course=course)
+                ).values_list(
+                    'course_id', 'recommended_course_id',
+                    'rank', 'score', 'computed_at'
+                )
+            ],
+            'slugs': list(
+                course.slug_history.exclude(
+                    slug=course.slug
+                ).values_list('slug', flat=True)
+            )
+        }
+        with transaction.atomic():
+            archived_course = self.create(
+                course_id=course.id,
+                slug=course.slug,
+                title=course.title,
+                data=data
+            )
+            registrations.delete()
+            lectures.delete()
+            course.delete()
+        logger.info(f'Course {course.id} moved to cold storage')
+        return archived_course
+
+    def get_by_slug(self, slug):
+        '''
+        Return archived course from course slug
+
+        Parameters
+        -------------
+        slug : str
+            Course slug
+
+        Raises
+        -------------
+        404 error
+            If course is not in cold storage
+
+        Returns
+        -------------
+        ArchivedCourse model instance
+        '''
+        archived_course = self.get_queryset().filter(slug=slug).first()
+        if archived_course is None:
+            logger.error(f'Archived course with slug {slug} not found')
+            raise CustomAPIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=_('Archived course not found')
+            )
+        return archived_course
+
+    def restore(self, archived_course):
+        '''
+        Move a course with its lectures, registrations, progress of
+        students, trending score, recommendations and retired slugs
+        back to the live tables as an unarchived course. The course
+        and its lectures keep their ids unless other rows have been
+        given the ids. Instructors, students, videos and other courses that
+        have been deleted since are left out.
+
+        Parameters
+        -------------
+        archived_course : ArchivedCourse model instance
+
+        Raises
+        -------------
+        400 error
+            If another course has the same title or slug
+
+        Returns
+        -------------
+        Course model instance
+        '''
+        course_model = apps.get_model('courses', 'Course')
+        lecture_model = apps.get_model('lectures', 'Lecture')
+        registration_model = apps.get_model(
+            'registration',
+            'CourseStudentRegistration'
+        )
+        video_model = apps.get_model('video_contents', 'VideoContent')
+        progress_model = apps.get_model('lectures', 'LectureProgress')
+        recommendation_model = apps.get_model(
+            'courses',
+            'CourseRecommendation'
+        )
+        slug_history_model = apps.get_model('courses', 'CourseSlugHistory')
+        user_model = course_model.instructors.field.related_model
+        data = archived_course.data
+        course_data = dict(data['course'])
+        created_at = parse_datetime(course_data.pop('created_at'))
+        course_data['price'] = Decimal(course_data['price'])
+        if course_model.objects.filter(slug=course_data['slug']).exists():
+            logger.error(
+                f'Course {archived_course.course_id} not restored - slug {course_data["slug"]} is used by another course'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('A course with this slug already exists')
+            )
+        progress = data.get('progress', [])
+        user_ids = set(
+            user_model.objects.filter(
+                id__in=data['instructors'] +
+                [x['user_id'] for x in data['registrations']] +
+                [x['user_id'] for x in progress]
+            ).values_list('id', flat=True)
+        )
+        video_ids = set(
+            video_model.objects.filter(
+                id__in=data['videos'] +
+                [x for lecture in data['lectures'] for x in lecture['videos']]
+            ).values_list('id', flat=True)
+        )
+        registrations = [
+            x for x in data['registrations'] if x['user_id'] in user_ids
+        ]
+        recommendations = data.get('recommendations', [])
+        other_course_ids = set(
+            course_model.objects.filter(
+                id__in=[
+                    x['course_id'] for x in recommendations
+                ] + [
+                    x['recommended_course_id'] for x in recommendations
+                ]
+            ).values_list('id', flat=True)
+        )
+        # Sequences (PostgreSQL) and AUTOINCREMENT keys (SQLite) do not
+        # reuse ids, but an id may have been taken by a row inserted
+        # with an explicit id or after the counter was reset, e.g. by
+        # MySQL before 8.0 on restart. The course then gets a new id.
+        course_id = archived_course.course_id
+        if course_id in other_course_ids or \
+                course_model.objects.filter(id=course_id).exists():
+            course_id = None
+        taken_lecture_ids = set(
+            lecture_model.objects.filter(
+                id__in=[x.get('id') for x in data['lectures']]
+            ).values_list('id', flat=True)
+        )
+        with transaction.atomic():
+            course = course_model.objects.create(
+                id=course_id,
+                is_archived=False,
+                lecture_count=len(data['lectures']),
+                student_count=len(registrations),
+                **course_data
+            )
+            course_model.objects.filter(pk=course.pk).update(
+                created_at=created_at
+            )
+            course.created_at = created_at
+            course.instructors.add(
+                *[x for x in data['instructors'] if x in user_ids]
+            )
+            # bulk_create skips the signals that number and count lectures
+            lectures = lecture_model.objects.bulk_create([
+                lecture_model(
+                    id=lecture.get('id')
+                    if lecture.get('id') not in taken_lecture_ids else None,
+                    course=course,
+                    **{
+                        field_name: value
+                        for field_name, value in lecture.items()
+                        if field_name not in ('id', 'videos')
+                    }
+                )
+                for lecture in data['lectures']
+            ])
+            lecture_ids = {
+                lecture_data.get('id'): lecture.id
+                for lecture, lecture_data in zip(lectures, data['lectures'])
+            }
+            lecture_videos = [
+                (lecture.id, video_id)
+                for lecture, lecture_data in zip(lectures, data['lectures'])
+                for video_id in lecture_data['videos']
+                if video_id in video_ids
+            ]
+            lecture_model.videos.through.objects.bulk_create([
+                lecture_model.videos.through(
+                    lecture_id=lecture_id,
+                    videocontent_id=video_id
+                )
+                for lecture_id, video_id in lecture_videos
+            ])
+            new_registrations = registration_model.objects.bulk_create([
+                registration_model(course=course, user_id=x['user_id'])
+                for x in registrations
+            ])
+            for registration, registration_data in zip(
+                new_registrations,
+                registrations
+            ):
+                registration.registered_at = parse_datetime(
+                    registration_data['registered_at']
+                )
+            registration_model.objects.bulk_update(
+                new_registrations,
+                ['registered_at']
+            )
+            video_model.objects.filter(
+                id__in=data['videos'],
+                course__isnull=True
+            ).update(course=course)
+            course_model.objects.filter(pk=course.pk).update(
+                **{
+                    field_name: Coalesce(
+                        Subquery(
+                            video_model.objects.filter(course=course)
+                            .order_by()
+                            .values('course')
+                            .annotate(total=aggregate)
+                            .values('total')
+                        ),
+                        Value(0)
+                    )
+                    for field_name, aggregate in (
+                        ('video_count', Count('pk')),
+                        ('video_bytes', Sum('file_size'))
+                    )
+                }
+            )
+            lecture_videos = set(lecture_videos)
+            progress_model.objects.bulk_create([
+                progress_model(
+                    user_id=x['user_id'],
+                    lecture_id=lecture_ids[x['lecture_id']],
+                    video_id=x['video_id'],
+                    position=x['position'],
+                    completed=x['completed'],
+                    updated_at=parse_datetime(x['updated_at'])
+                )
+                for x in progress
+                if x['user_id'] in user_ids and
+                (lecture_ids.get(x['lecture_id']), x['video_id']) in lecture_videos
+            ])
+            if data.get('trend') is not None:
+                apps.get_model('courses', 'CourseTrend').objects.create(
+                    course=course,
+                    score=data['trend']['score'],
+                    rank_key=data['trend']['rank_key'],
+                    last_event_at=parse_datetime(
+                        data['trend']['last_event_at']
+                    )
+                )
+            course_ids = {archived_course.course_id: course.id}
+            other_course_ids.add(course.id)
+            # Ranks filled by a later computation are kept
+            recommendation_model.objects.bulk_create(
+                [
+                    recommendation_model(
+                        course_id=course_ids.get(
+                            x['course_id'],
+                            x['course_id']
+                        ),
+                        recommended_course_id=course_ids.get(
+                            x['recommended_course_id'],
+                            x['recommended_course_id']
+                        ),
+                        rank=x['rank'],
+                        score=x['score'],
+                        computed_at=parse_datetime(x['computed_at'])
+                    )
+                    for x in recommendations
+                    if course_ids.get(x['course_id'], x['course_id'])
+                    in other_course_ids and
+                    course_ids.get(
+                        x['recommended_course_id'],
+                        x['recommended_course_id']
+                    ) in other_course_ids
+                ],
+                ignore_conflicts=True
+            )
+            # Slugs taken by other courses since are left out
+            slug_history_model.objects.bulk_create(
+                [
+                    slug_history_model(course=course, slug=slug)
+                    for slug in data.get('slugs', [])
+                ],
+                ignore_conflicts=True
+            )
+            archived_course.delete()
+        bump_cache_version(COURSE_CACHE_NAMESPACE)
+        cache.set(SLUG_HISTORY_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        course.refresh_from_db()
+        if not course.is_draft:
+            apps.get_model('courses', 'CourseSnapshot').objects.build_snapshot(
+                course
+            )
+        logger.info(
+            f'Course {archived_course.course_id} restored from cold storage as course {course.id}'
+        )
+        return course
+
+
+class CourseSlugHistoryManager(models.Manager):
+    '''
+    Manager for CourseSlugHistory model
+
+    Methods
+    -------------
+    record_slug(course, created=False):
+        Adds the current slug of a course to its history
+
+    get_version():
+        Returns version of slug history shared by all processes
+
+    load_redirects():
+        Loads retired slugs into the in-process map
+
+    get_redirect(slug):
+        Returns course id and current slug of a retired slug
+    '''
+
+    def record_slug(self, course, created=False):
+        '''
+        Add the current slug of a course to its history. A slug
+        that belonged to another course is moved to this course.
+        The maps of retired slugs are only reloaded if a slug
+        has been retired or taken over.
+
+        Parameters
+        -------------
+        course : Course model instance
+        created : boolean
+            True if the course has just been created
+        '''
+        if not course.slug:
+            return
+        _slug_history, new_slug = self.get_queryset().update_or_create(
+            slug=course.slug,
+            defaults={'course': course}
+        )
+        logger.info(f'Slug {course.slug} recorded for course {course.id}')
+        if not (created and new_slug):
+            cache.set(SLUG_HISTORY_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    def get_version(self):
+        '''
+        Return version of slug history shared by all processes.
+        A new version is generated if the cache entry is missing
+        so that the maps are reloaded after the cache is cleared.
+
+        Returns
+        -------------
+        str
+        '''
+        version = cache.get(SLUG_HISTORY_VERSION_KEY)
+        if version is None:
+            cache.add(SLUG_HISTORY_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(SLUG_HISTORY_VERSION_KEY)
+        return version
+
+    def load_redirects(self):
+        '''
+        Load slugs that are no longer used by any course
+        into the in-process map
+
+        Returns
+        -------------
+        dict
+            Retired slug mapped to course id and current slug
+        '''
+        version = self.get_version()
+        course_model = apps.get_model('courses', 'Course')
+        redirects = {
+            slug: (course_id, current_slug)
+            for slug, course_id, current_slug in self.get_queryset().exclude(
+                slug__in=course_model.objects.values('slug')
+            ).values_list('slug', 'course_id', 'course__slug')
+        }
+        _slug_redirects['redirects'] = redirects
+        _slug_redirects['version'] = version
+        logger.info(f'{len(redirects)} retired course slugs loaded')
+        return redirects
+
+    def get_redirect(self, slug):
+        '''
+        Return course of a retired slug from the in-process map
+        without a database query unless the map is out of date
+
+        Parameters
+        -------------
+        slug : str
+            Course slug
+
+        Returns
+        -------------
+        tuple or None
+            Course id and current slug of the course, None if
+            the slug is not a retired slug
+        '''
+        redirects = _slug_redirects['redirects']
+        if _slug_redirects['version'] != self.get_version():
+            redirects = self.load_redirects()
+        return redirects.get(slug, None)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-17 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_draft', 'is_archived', 'created_at', 'id'], name='course_catalog_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from courses.search import is_search_index_supported, \
+    create_search_index, \
+    drop_search_index, \
+    get_course_search_row, \
+    insert_search_rows
+
+
+def create_course_search_index(apps, schema_editor):
+    '''Create full text search table and index existing courses'''
+    if not is_search_index_supported(schema_editor.connection):
+        return
+    Course = apps.get_model('courses', 'Course')
+    with schema_editor.connection.cursor() as cursor:
+        create_search_index(cursor)
+        rows = [get_course_search_row(course)
+                for course in Course.objects.order_by('pk')]
+        if rows:
+            insert_search_rows(cursor, rows)
+
+
+def remove_course_search_index(apps, schema_editor):
+    '''Drop full text search table'''
+    if not is_search_index_supported(schema_editor.connection):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        drop_search_index(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_catalog_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_course_search_index,
+            remove_course_search_index
+        ),
+    ]
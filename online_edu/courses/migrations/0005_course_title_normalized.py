@@ -0,0 +1,82 @@
+# Generated by Django 4.2.5 on 2026-10-17 23:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+from courses.utils import normalize_title
+
+
+def populate_normalized_titles(apps, schema_editor):
+    '''
+    Set normalized titles of existing courses. Courses whose title
+    only differs in case from the title of an older course get a
+    numbered suffix, e.g. "Python (2)", in order of their ids.
+    '''
+    Course = apps.get_model('courses', 'Course')
+    max_length = Course._meta.get_field('title').max_length
+    for language, _language_name in settings.LANGUAGES:
+        title_field = f'title_{language}'
+        update_fields = [title_field, f'title_normalized_{language}']
+        if language == settings.LANGUAGE_CODE:
+            update_fields.append('title')
+        taken_titles = {
+            normalize_title(title)
+            for title in Course.objects.values_list(title_field, flat=True)
+        }
+        seen_titles = set()
+        courses = []
+        for course in Course.objects.order_by('pk'):
+            title = getattr(course, title_field, None)
+            normalized_title = normalize_title(title)
+            if normalized_title is not None and normalized_title in seen_titles:
+                suffix_no = 2
+                while True:
+                    suffix = f' ({suffix_no})'
+                    new_title = title[:max_length - len(suffix)] + suffix
+                    if normalize_title(new_title) not in taken_titles:
+                        break
+                    suffix_no += 1
+                title = new_title
+                normalized_title = normalize_title(title)
+                taken_titles.add(normalized_title)
+                setattr(course, title_field, title)
+                if language == settings.LANGUAGE_CODE:
+                    course.title = title
+            seen_titles.add(normalized_title)
+            setattr(course, f'title_normalized_{language}', normalized_title)
+            courses.append(course)
+        Course.objects.bulk_update(courses, update_fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='title_normalized_de',
+            field=models.CharField(editable=False, max_length=300, null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='title_normalized_en',
+            field=models.CharField(editable=False, max_length=300, null=True),
+        ),
+        migrations.RunPython(
+            populate_normalized_titles,
+            migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='title_normalized_de',
+            field=models.CharField(editable=False, max_length=300, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='title_normalized_en',
+            field=models.CharField(editable=False, max_length=300, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.5 on 2026-10-17 23:42
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_counters(apps, schema_editor):
+    '''Count students, lectures and videos of existing courses'''
+    Course = apps.get_model('courses', 'Course')
+    counters = {
+        'student_count': (
+            apps.get_model('registration', 'CourseStudentRegistration'),
+            Count('pk')
+        ),
+        'lecture_count': (apps.get_model('lectures', 'Lecture'), Count('pk')),
+        'video_count': (
+            apps.get_model('video_contents', 'VideoContent'),
+            Count('pk')
+        ),
+        'video_bytes': (
+            apps.get_model('video_contents', 'VideoContent'),
+            Sum('file_size')
+        ),
+    }
+    courses = {course.pk: course for course in Course.objects.all()}
+    for field_name, (model, aggregate) in counters.items():
+        totals = model.objects.filter(course__isnull=False) \
+            .order_by() \
+            .values('course') \
+            .annotate(total=aggregate)
+        for row in totals:
+            setattr(courses[row['course']], field_name, row['total'] or 0)
+    Course.objects.bulk_update(
+        courses.values(),
+        list(counters.keys()),
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_course_title_normalized'),
+        ('registration', '0002_initial'),
+        ('lectures', '0001_initial'),
+        ('video_contents', '0002_videocontent_file_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='lecture_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='student_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='video_bytes',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='video_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_counters,
+            migrations.RunPython.noop
+        ),
+    ]
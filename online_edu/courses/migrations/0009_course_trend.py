@@ -0,0 +1,23 @@
+# Generated by Django 4.2.5 on 2026-10-17 23:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseTrend',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='courses.course')),
+                ('score', models.FloatField(default=0)),
+                ('last_event_at', models.DateTimeField()),
+                ('rank_key', models.FloatField(db_index=True)),
+            ],
+        ),
+    ]
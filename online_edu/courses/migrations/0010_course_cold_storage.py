@@ -0,0 +1,33 @@
+# Generated by Django 4.2.5 on 2026-10-18 00:03
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_course_trend'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCourse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.PositiveIntegerField(unique=True)),
+                ('slug', models.SlugField(max_length=200)),
+                ('title', models.CharField(max_length=300)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='course',
+            name='course_catalog_idx',
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_archived', False), ('is_draft', False)), fields=['created_at', 'id'], name='course_published_idx'),
+        ),
+    ]
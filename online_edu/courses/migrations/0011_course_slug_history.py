@@ -0,0 +1,46 @@
+# Generated by Django 4.2.5 on 2026-10-18 00:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_slug_history(apps, schema_editor):
+    '''Record current slugs of existing courses'''
+    Course = apps.get_model('courses', 'Course')
+    CourseSlugHistory = apps.get_model('courses', 'CourseSlugHistory')
+    CourseSlugHistory.objects.bulk_create(
+        [
+            CourseSlugHistory(course_id=course_id, slug=slug)
+            for course_id, slug in Course.objects.exclude(
+                slug=''
+            ).values_list('id', 'slug')
+        ],
+        batch_size=500,
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_course_cold_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSlugHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_history', to='courses.course')),
+            ],
+            options={
+                'verbose_name_plural': 'course slug history',
+            },
+        ),
+        migrations.RunPython(
+            populate_slug_history,
+            migrations.RunPython.noop
+        ),
+    ]
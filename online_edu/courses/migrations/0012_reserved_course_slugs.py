@@ -0,0 +1,43 @@
+from django.db import migrations
+
+RESERVED_COURSE_SLUGS = (
+    'new-course',
+    'search',
+    'facets',
+    'trending',
+    'taught',
+    'bulk-update',
+    'cache-stats'
+)
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    '''Add a suffix to slugs that are paths of course collection endpoints'''
+    Course = apps.get_model('courses', 'Course')
+    CourseSlugHistory = apps.get_model('courses', 'CourseSlugHistory')
+    courses = list(Course.objects.filter(slug__in=RESERVED_COURSE_SLUGS))
+    for course in courses:
+        course.slug = f'{course.slug}-course'
+    Course.objects.bulk_update(courses, ['slug'])
+    CourseSlugHistory.objects.filter(slug__in=RESERVED_COURSE_SLUGS).delete()
+    CourseSlugHistory.objects.bulk_create(
+        [
+            CourseSlugHistory(course_id=course.id, slug=course.slug)
+            for course in courses
+        ],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_course_slug_history'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rename_reserved_slugs,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -1,13 +1,29 @@
 import logging
-from django.db import models
-from django.db.models.signals import pre_save
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction, IntegrityError
+from django.db.models.signals import pre_save, post_save, post_delete, \
+    m2m_changed
+from django.utils import translation
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 
 from common.error_definitions import CustomAPIError
-from .managers import CourseManager
+from common.cache_handling import bump_cache_version
+from .managers import CourseManager, \
+    CourseSnapshotManager, \
+    CourseRecommendationManager, \
+    CourseTrendManager, \
+    ArchivedCourseManager, \
+    CourseSlugHistoryManager, \
+    COURSE_CACHE_NAMESPACE, \
+    COURSE_COUNTER_FIELDS, \
+    INSTRUCTOR_CACHE_NAMESPACE, \
+    RESERVED_COURSE_SLUGS
+from .search import index_course, remove_course_from_index
+from .utils import normalize_title, normalized_title_field
 
 logger = logging.getLogger(__name__)
 
@@ -44,14 +60,28 @@ class Course(models.Model):
         autogenerated.
     updated_at : Datetime
         autoupdated.
+    student_count : int
+        Number of students registered (maintained by signals).
+    lecture_count : int
+        Number of lectures (maintained by signals).
+    video_count : int
+        Number of videos uploaded (maintained by signals).
+    video_bytes : int
+        Total size of videos uploaded (maintained by signals).
+    title_normalized_<language> : str
+        Case folded title in every language (unique).
+        Autogenerated when saving.
 
     Methods
     ------------
+    from_db(db, field_names, values) : Loads course and remembers its slug
     __str__() : Returns the title of the course
     save() : Saves the course model instance.
+    has_duplicate_title() : Check if another course has the same title
     clean_fields(exclude=None) : Validate course form
     add_instructor(user) : Add a user as an instructor for the course
     check_user_is_instructor(user) : Check if a user is an instructor for the course
+    remember_instructor_check(user, is_instructor) : Remember instructor check of a user
     '''
 
     title = models.CharField(max_length=300, unique=True)
@@ -75,9 +105,33 @@ class Course(models.Model):
     is_archived = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    student_count = models.PositiveIntegerField(default=0, editable=False)
+    lecture_count = models.PositiveIntegerField(default=0, editable=False)
+    video_count = models.PositiveIntegerField(default=0, editable=False)
+    video_bytes = models.PositiveBigIntegerField(default=0, editable=False)
 
     objects = CourseManager()
 
+    class Meta:
+        indexes = [
+            # Only published courses that are not archived
+            models.Index(
+                fields=['created_at', 'id'],
+                name='course_published_idx',
+                condition=models.Q(is_draft=False, is_archived=False)
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        '''
+        Remember the slug loaded from the database
+        to record slug changes when saved
+        '''
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_slug = instance.__dict__.get('slug', None)
+        return instance
+
     def __str__(self):
         '''
         Returns the title of the course.
@@ -94,11 +148,13 @@ class Course(models.Model):
         Saves the course model instance.
 
         Sets the price of a free course to be 0.
+        Sets the normalized titles used for duplicate checks.
 
         Raises
         ---------------
         400 error
             If price and is_free fields are both missing
+            If another course has the same title (case insensitive)
 
         Returns
         ---------------
@@ -114,7 +170,52 @@ class Course(models.Model):
             )
         if self.is_free:
             self.price = 0.00
-        return super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields', None)
+        for language, _language_name in settings.LANGUAGES:
+            setattr(
+                self,
+                normalized_title_field(language),
+                normalize_title(getattr(self, f'title_{language}', None))
+            )
+            if update_fields is not None and f'title_{language}' in update_fields:
+                kwargs['update_fields'] = list(kwargs['update_fields']) + \
+                    [normalized_title_field(language)]
+        # The unique indexes decide between concurrent saves of same title
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError:
+            if not self.has_duplicate_title():
+                raise
+            logger.error(f'Course {self.title} has duplicate title')
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('A course with this title already exists')
+            )
+
+    def has_duplicate_title(self):
+        '''
+        Check if another course has the same title as this course
+        in any language (case insensitive) with one query on the
+        normalized title columns
+
+        Returns
+        ---------------
+        boolean
+        '''
+        duplicate_filter = models.Q()
+        for language, _language_name in settings.LANGUAGES:
+            normalized_title = normalize_title(
+                getattr(self, f'title_{language}', None))
+            if normalized_title is not None:
+                duplicate_filter |= models.Q(
+                    **{normalized_title_field(language): normalized_title}
+                )
+        if not duplicate_filter:
+            return False
+        return Course.objects.filter(
+            duplicate_filter
+        ).exclude(pk=self.pk).exists()
 
     def clean_fields(self, exclude=None):
         '''
@@ -124,12 +225,15 @@ class Course(models.Model):
         -------------
         ValidationError
             If both price and is_free fields are blank
+            If another course has the same title (case insensitive)
         '''
         if not self.is_free and self.price <= 0:
             logger.error(
                 f'Course {self.title} does not have valid price but is not free.'
             )
             raise ValidationError(_('Price of a non-free course is required.'))
+        if self.has_duplicate_title():
+            raise ValidationError(_('A course with this title already exists'))
 
     def add_instructor(self, user):
         '''
@@ -180,15 +284,254 @@ class Course(models.Model):
         boolean
             True if user is an instructor, False otherwise
         '''
-        instuctor_emails = [x.username for x in self.instructors.all()]
-        if user and user.username in instuctor_emails:
-            return True
-        return False
+        if user is None or user.pk is None:
+            return False
+        # Results are only remembered on the instance for the rest of the
+        # request, a grant cached across requests could outlive a removal.
+        request_cache = self.__dict__.setdefault('_instructor_check_cache', {})
+        if user.pk in request_cache:
+            return request_cache[user.pk]
+        is_instructor = self.instructors.filter(pk=user.pk).exists()
+        request_cache[user.pk] = is_instructor
+        return is_instructor
+
+    def remember_instructor_check(self, user, is_instructor):
+        '''
+        Remember on the instance whether a user is an instructor of the
+        course for the rest of the request, for example when it has been
+        fetched with the course
+
+        Parameters
+        -------------
+        user : User
+            user model instance
+        is_instructor : boolean
+            True if user is an instructor
+        '''
+        if user is None or user.pk is None:
+            return
+        self.__dict__.setdefault('_instructor_check_cache', {})[
+            user.pk
+        ] = is_instructor
+
+
+for language, _language_name in settings.LANGUAGES:
+    Course.add_to_class(
+        normalized_title_field(language),
+        models.CharField(
+            max_length=300,
+            unique=True,
+            null=True,
+            editable=False
+        )
+    )
+
+
+class CourseSnapshot(models.Model):
+    '''
+    Precomputed document of a published course
+
+    Attributes
+    -------------
+    course : Course
+        Course of the snapshot (primary key).
+    documents : dict
+        Course data with ordered lectures and their videos
+        for every language, keyed by language code.
+    created_at : Datetime
+        autogenerated.
+    updated_at : Datetime
+        autoupdated.
+    '''
+
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot'
+    )
+    documents = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CourseSnapshotManager()
+
+    def __str__(self):
+        return f'Snapshot of course {self.course_id}'
+
+    def get_document(self, language=None):
+        '''
+        Return course document in a language
+
+        Parameters
+        -------------
+        language : str (optional)
+            Language code. Default is the active language.
+            Falls back to the default language.
+
+        Returns
+        -------------
+        dict
+        '''
+        if language is None:
+            language = translation.get_language()
+        document = self.documents.get(language, None)
+        if document is None:
+            document = self.documents.get(settings.LANGUAGE_CODE, {})
+        return document
+
+
+class CourseRecommendation(models.Model):
+    '''
+    Course taken by students of another course, computed
+    offline from student registrations
+
+    Attributes
+    -------------
+    course : Course
+        Course for which the recommendation is made.
+    recommended_course : Course
+        Course taken by students of the course.
+    rank : int
+        Position of the recommendation (1 is the best).
+    score : float
+        Cosine similarity of the students of the two courses.
+    computed_at : Datetime
+        When the recommendations of the course were computed.
+    '''
+
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='recommendations'
+    )
+    recommended_course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    objects = CourseRecommendationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'rank'],
+                name='course_recommendation_rank_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Course {self.recommended_course_id} for course {self.course_id}'
+
+
+class CourseTrend(models.Model):
+    '''
+    Exponentially decayed score of registrations and
+    lecture accesses of a course
+
+    Attributes
+    -------------
+    course : Course
+        Course of the score (primary key).
+    score : float
+        Score at the time of the last event.
+    last_event_at : Datetime
+        Time of the last event.
+    rank_key : float
+        Log of the score decayed to a fixed epoch.
+        Orders courses by current score.
+    '''
+
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend'
+    )
+    score = models.FloatField(default=0)
+    last_event_at = models.DateTimeField()
+    rank_key = models.FloatField(db_index=True)
+
+    objects = CourseTrendManager()
+
+    def __str__(self):
+        return f'Trend of course {self.course_id}'
+
+
+class ArchivedCourse(models.Model):
+    '''
+    Course that has been archived for long, moved out of the
+    course, lecture and registration tables with its lectures
+    and registrations
+
+    Attributes
+    -------------
+    course_id : int
+        Id of the course before it was moved.
+    slug : str
+        Course slug.
+    title : str
+        Title of the course.
+    data : dict
+        Course fields, instructors, lectures with their
+        videos, registrations, videos and progress of students,
+        trending score, recommendations and retired slugs
+        of the course.
+    archived_at : Datetime
+        autogenerated.
+    '''
+
+    course_id = models.PositiveIntegerField(unique=True)
+    slug = models.SlugField(max_length=200)
+    title = models.CharField(max_length=300)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ArchivedCourseManager()
+
+    def __str__(self):
+        return self.title
+
+
+class CourseSlugHistory(models.Model):
+    '''
+    Slug that a course has had
+
+    Attributes
+    -------------
+    course : Course
+        Course that has or had the slug.
+    slug : str
+        Course slug (unique).
+    created_at : Datetime
+        autogenerated.
+    '''
+
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='slug_history'
+    )
+    slug = models.SlugField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CourseSlugHistoryManager()
+
+    class Meta:
+        verbose_name_plural = 'course slug history'
+
+    def __str__(self):
+        return self.slug
 
 
 def generate_course_slug(sender, instance, *args, **kwargs):
     '''
-    Generate slug for course
+    Generate slug for course. Slugs that are paths of course
+    collection endpoints get a suffix.
 
     Parameters
     -------------
@@ -199,6 +542,110 @@ def generate_course_slug(sender, instance, *args, **kwargs):
     '''
     if not instance.slug:
         instance.slug = slugify(instance.title)
+    if instance.slug in RESERVED_COURSE_SLUGS:
+        instance.slug = f'{instance.slug}-course'
 
 
 pre_save.connect(generate_course_slug, sender=Course)
+
+
+def record_course_slug(sender, instance, created, *args, **kwargs):
+    '''
+    Add slug of a course to slug history when a course
+    is created or its slug changes
+
+    Parameters
+    -------------
+    sender : Model class
+        whose save calls this function
+    instance: model instance
+        that is passed by Django signal
+    created : boolean
+        True if a new course was created
+    '''
+    if created or instance.__dict__.get('_loaded_slug', None) != instance.slug:
+        CourseSlugHistory.objects.record_slug(instance, created=created)
+    instance._loaded_slug = instance.slug
+
+
+post_save.connect(record_course_slug, sender=Course)
+
+
+def invalidate_course_cache(sender, instance, *args, **kwargs):
+    '''
+    Invalidate cached course list and course details
+    when a course is saved or deleted
+
+    Parameters
+    -------------
+    sender : Model class
+        whose save or delete calls this function
+    instance: model instance
+        that is passed by Django signal
+    '''
+    bump_cache_version(COURSE_CACHE_NAMESPACE)
+
+
+post_save.connect(invalidate_course_cache, sender=Course)
+post_delete.connect(invalidate_course_cache, sender=Course)
+
+
+def update_course_search_index(sender, instance, *args, **kwargs):
+    '''
+    Add or replace course in full text search index when saved
+
+    Parameters
+    -------------
+    sender : Model class
+        whose save calls this function
+    instance: model instance
+        that is passed by Django signal
+    '''
+    index_course(instance)
+
+
+def delete_course_search_index(sender, instance, *args, **kwargs):
+    '''
+    Remove course from full text search index when deleted
+
+    Parameters
+    -------------
+    sender : Model class
+        whose delete calls this function
+    instance: model instance
+        that is passed by Django signal
+    '''
+    remove_course_from_index(instance.pk)
+
+
+post_save.connect(update_course_search_index, sender=Course)
+post_delete.connect(delete_course_search_index, sender=Course)
+
+
+def invalidate_instructor_cache(sender, instance, action, reverse, *args, **kwargs):
+    '''
+    Invalidate instructor checks remembered by the course and cached
+    instructor listings when instructors of a course change
+
+    Parameters
+    -------------
+    sender : Model class
+        Through model of Course.instructors
+    instance : model instance
+        Course, or User if the relation is changed from the user side
+    action : str
+        Type of change made to the relation
+    reverse : boolean
+        True if the relation is changed from the user side
+    '''
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        instance.__dict__.pop('_instructor_check_cache', None)
+    bump_cache_version(INSTRUCTOR_CACHE_NAMESPACE)
+
+
+m2m_changed.connect(
+    invalidate_instructor_cache,
+    sender=Course.instructors.through
+)
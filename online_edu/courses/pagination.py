@@ -0,0 +1,16 @@
+from django.conf import settings
+
+from common.pagination import KeysetPagination
+
+
+class CoursePagination(KeysetPagination):
+    '''
+    Keyset pagination of the course catalog on creation time.
+    Uses the partial index course_published_idx of Course
+    for published courses. The number of courses is estimated
+    for large catalogs instead of counted on every page.
+    '''
+
+    ordering = ('created_at', 'id')
+    page_size = settings.COURSE_PAGE_SIZE
+    include_count = True
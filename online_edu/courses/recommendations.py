@@ -0,0 +1,221 @@
+import logging
+import numpy as np
+from scipy import sparse
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 10
+
+
+def build_enrollment_matrix(registrations):
+    '''
+    Build user x course matrix of student registrations
+
+    Parameters
+    -------------
+    registrations : list
+        Pairs of user id and course id
+
+    Returns
+    -------------
+    matrix : scipy.sparse.csr_matrix
+        1 where a user is registered for a course
+    course_ids : numpy.ndarray
+        Course id of every column
+    '''
+    pairs = np.array(registrations, dtype=np.int64).reshape(-1, 2)
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    course_ids, course_index = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs)), (user_index, course_index)),
+        shape=(len(user_ids), len(course_ids))
+    )
+    # Repeated registrations count once
+    matrix.data = np.ones_like(matrix.data)
+    return matrix, course_ids
+
+
+def compute_similarity(matrix, columns=None):
+    '''
+    Compute cosine similarity of courses from the students
+    registered for them
+
+    Parameters
+    -------------
+    matrix : scipy.sparse.csr_matrix
+        User x course enrollment matrix
+    columns : numpy.ndarray (optional)
+        Column indexes of the courses whose similarities are
+        needed. Default is all courses.
+
+    Returns
+    -------------
+    scipy.sparse.csc_matrix
+        Course x course similarity with the courses
+        in columns as columns and zero diagonal
+    '''
+    co_enrollment = (matrix.T @ matrix).tocsc()
+    norms = np.sqrt(co_enrollment.diagonal())
+    if columns is None:
+        columns = np.arange(matrix.shape[1])
+    similarity = sparse.diags(1.0 / norms) @ co_enrollment[:, columns] @ \
+        sparse.diags(1.0 / norms[columns])
+    similarity = similarity.tocoo()
+    # A course is not recommended for itself
+    keep = similarity.row != columns[similarity.col]
+    return sparse.csc_matrix(
+        (similarity.data[keep], (similarity.row[keep], similarity.col[keep])),
+        shape=similarity.shape
+    )
+
+
+def top_k_neighbours(similarity, course_ids, top_k):
+    '''
+    Return the most similar courses of every column
+
+    Parameters
+    -------------
+    similarity : scipy.sparse.csc_matrix
+        Similarity matrix from compute_similarity
+    course_ids : numpy.ndarray
+        Course id of every row
+    top_k : int
+        Number of similar courses
+
+    Returns
+    -------------
+    list
+        For every column, list of (course id, score) with
+        highest score first and lower course id first in a tie
+    '''
+    neighbours = []
+    for column in range(similarity.shape[1]):
+        start, end = similarity.indptr[column], similarity.indptr[column + 1]
+        rows = similarity.indices[start:end]
+        scores = similarity.data[start:end]
+        order = np.lexsort((course_ids[rows], -scores))[:top_k]
+        neighbours.append(
+            list(zip(course_ids[rows[order]].tolist(), scores[order].tolist()))
+        )
+    return neighbours
+
+
+def find_affected_columns(matrix, course_ids, changed_course_ids):
+    '''
+    Return columns of courses whose similarities change when
+    registrations of some courses change - the changed courses
+    and every course that shares a student with them
+
+    Parameters
+    -------------
+    matrix : scipy.sparse.csr_matrix
+        User x course enrollment matrix
+    course_ids : numpy.ndarray
+        Course id of every column
+    changed_course_ids : list
+        Ids of courses with new registrations
+
+    Returns
+    -------------
+    numpy.ndarray
+        Column indexes
+    '''
+    changed_columns = np.flatnonzero(np.isin(course_ids, changed_course_ids))
+    students = matrix[:, changed_columns].getnnz(axis=1) > 0
+    return np.flatnonzero(matrix[students].getnnz(axis=0) > 0)
+
+
+def refresh_recommendations(top_k=DEFAULT_TOP_K, full=False):
+    '''
+    Compute course recommendations from student registrations and
+    store them. An incremental refresh only recomputes courses that
+    share students with courses that have registrations since the last
+    refresh. A full refresh also removes recommendations that came from
+    deleted registrations.
+
+    Parameters
+    -------------
+    top_k : int
+        Number of recommendations stored per course
+    full : boolean
+        Recompute recommendations of all courses
+
+    Returns
+    -------------
+    int
+        Number of courses whose recommendations were stored
+    '''
+    registration_model = apps.get_model(
+        'registration',
+        'CourseStudentRegistration'
+    )
+    recommendation_model = apps.get_model('courses', 'CourseRecommendation')
+    computed_at = timezone.now()
+    last_computed_at = None
+    if not full:
+        last_computed_at = recommendation_model.objects.aggregate(
+            last_computed_at=Max('computed_at')
+        )['last_computed_at']
+    registrations = registration_model.objects.filter(
+        user__isnull=False,
+        course__isnull=False
+    )
+    changed_course_ids = None
+    if last_computed_at is not None:
+        changed_course_ids = list(
+            registrations.filter(
+                registered_at__gt=last_computed_at
+            ).values_list('course_id', flat=True).distinct()
+        )
+        if not changed_course_ids:
+            logger.info('No new registrations for course recommendations')
+            return 0
+    enrollments = list(registrations.values_list('user_id', 'course_id'))
+    if not enrollments:
+        if full:
+            recommendation_model.objects.all().delete()
+        return 0
+    matrix, course_ids = build_enrollment_matrix(enrollments)
+    if changed_course_ids is None:
+        columns = np.arange(len(course_ids))
+    else:
+        columns = find_affected_columns(matrix, course_ids, changed_course_ids)
+    neighbours = top_k_neighbours(
+        compute_similarity(matrix, columns),
+        course_ids,
+        top_k
+    )
+    column_course_ids = course_ids[columns].tolist()
+    recommendations = [
+        recommendation_model(
+            course_id=course_id,
+            recommended_course_id=recommended_course_id,
+            rank=rank,
+            score=score,
+            computed_at=computed_at
+        )
+        for course_id, course_neighbours in zip(column_course_ids, neighbours)
+        for rank, (recommended_course_id, score) in enumerate(
+            course_neighbours,
+            start=1
+        )
+    ]
+    with transaction.atomic():
+        if full:
+            recommendation_model.objects.all().delete()
+        else:
+            recommendation_model.objects.filter(
+                course_id__in=column_course_ids
+            ).delete()
+        recommendation_model.objects.bulk_create(
+            recommendations,
+            batch_size=500
+        )
+    logger.info(
+        f'Recommendations of {len(column_course_ids)} courses refreshed'
+    )
+    return len(column_course_ids)
@@ -0,0 +1,288 @@
+import re
+import logging
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'courses_course_search'
+SEARCH_FIELDS = ('title', 'subtitle', 'description')
+# BM25 weights of title, subtitle and description columns
+SEARCH_FIELD_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def is_search_index_supported(db_connection=None):
+    '''
+    Check if the database supports the full text search index (SQLite FTS5)
+
+    Parameters
+    -------------
+    db_connection : Database connection (optional)
+        Default is the default database connection
+
+    Returns
+    -------------
+    boolean
+    '''
+    if db_connection is None:
+        db_connection = connection
+    return db_connection.vendor == 'sqlite'
+
+
+def get_search_columns(languages=None):
+    '''
+    Return translated course columns in the search index
+
+    Parameters
+    -------------
+    languages : list (optional)
+        Language codes. Default is all languages in settings.
+
+    Returns
+    -------------
+    List of column names like title_en, subtitle_en, description_en
+    '''
+    if languages is None:
+        languages = [code for code, _ in settings.LANGUAGES]
+    return [
+        f'{field_name}_{language}'
+        for language in languages
+        for field_name in SEARCH_FIELDS
+    ]
+
+
+def create_search_index(cursor):
+    '''
+    Create FTS5 virtual table of the search index
+
+    Parameters
+    -------------
+    cursor : Database cursor
+    '''
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+        f'{", ".join(get_search_columns())}, is_published UNINDEXED, '
+        'tokenize="unicode61 remove_diacritics 2")'
+    )
+
+
+def drop_search_index(cursor):
+    '''
+    Drop FTS5 virtual table of the search index
+
+    Parameters
+    -------------
+    cursor : Database cursor
+    '''
+    cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def get_course_search_row(course):
+    '''
+    Return row of search index for a course
+
+    Parameters
+    -------------
+    course : Course model instance
+
+    Returns
+    -------------
+    list
+        Course id, translated column values and published status
+    '''
+    return [course.pk] + [
+        getattr(course, column) or '' for column in get_search_columns()
+    ] + [int(not course.is_draft and not course.is_archived)]
+
+
+def insert_search_rows(cursor, rows):
+    '''
+    Insert rows in search index
+
+    Parameters
+    -------------
+    cursor : Database cursor
+    rows : list
+        Rows from get_course_search_row
+    '''
+    columns = get_search_columns() + ['is_published']
+    placeholders = ', '.join(['%s'] * (len(columns) + 1))
+    cursor.executemany(
+        f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(columns)}) '
+        f'VALUES ({placeholders})',
+        rows
+    )
+
+
+def index_course(course):
+    '''
+    Add or replace a course in the search index
+
+    Parameters
+    -------------
+    course : Course model instance
+    '''
+    index_courses([course])
+
+
+def index_courses(courses):
+    '''
+    Add or replace several courses in the search index
+
+    Parameters
+    -------------
+    courses : list
+        Course model instances
+    '''
+    if not is_search_index_supported() or not courses:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [[course.pk] for course in courses]
+        )
+        insert_search_rows(
+            cursor,
+            [get_course_search_row(course) for course in courses]
+        )
+
+
+def remove_course_from_index(course_id):
+    '''
+    Remove a course from the search index
+
+    Parameters
+    -------------
+    course_id : int
+    '''
+    if not is_search_index_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [course_id]
+        )
+
+
+def rebuild_search_index(courses, batch_size=500):
+    '''
+    Recreate the search index with all courses
+
+    Parameters
+    -------------
+    courses : Queryset
+        All courses
+    batch_size : int
+        Number of courses inserted at a time
+
+    Returns
+    -------------
+    int
+        Number of courses indexed
+    '''
+    if not is_search_index_supported():
+        return 0
+    no_of_courses = 0
+    with connection.cursor() as cursor:
+        drop_search_index(cursor)
+        create_search_index(cursor)
+        rows = []
+        for course in courses.order_by('pk').iterator(chunk_size=batch_size):
+            rows.append(get_course_search_row(course))
+            if len(rows) >= batch_size:
+                insert_search_rows(cursor, rows)
+                no_of_courses += len(rows)
+                rows = []
+        if rows:
+            insert_search_rows(cursor, rows)
+            no_of_courses += len(rows)
+    logger.info(f'Search index rebuilt with {no_of_courses} courses')
+    return no_of_courses
+
+
+def build_match_expression(text, languages):
+    '''
+    Build FTS5 match expression from user search text.
+    Every word is quoted so that user input cannot change the
+    query syntax, and the last word is matched as a prefix.
+
+    Parameters
+    -------------
+    text : str
+        Search text
+    languages : list
+        Language codes whose columns are searched
+
+    Returns
+    -------------
+    str or None
+        Match expression or None if there are no words in the text
+    '''
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] = f'{terms[-1]}*'
+    columns = ' '.join(get_search_columns(languages))
+    return f'{{{columns}}} : ({" ".join(terms)})'
+
+
+def build_search_subquery(text, languages):
+    '''
+    Build SQL selecting ids of courses matching search text,
+    used to narrow other course queries in the same statement
+
+    Parameters
+    -------------
+    text : str
+        Search text
+    languages : list
+        Language codes whose columns are searched
+
+    Returns
+    -------------
+    tuple or None
+        SQL and its parameters or None if there are no words in the text
+    '''
+    match_expression = build_match_expression(text, languages)
+    if match_expression is None:
+        return None
+    return (
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        [match_expression]
+    )
+
+
+def search_course_ids(text, languages, limit):
+    '''
+    Return ids of published courses matching search text ranked by BM25
+
+    Parameters
+    -------------
+    text : str
+        Search text
+    languages : list
+        Language codes whose columns are searched
+    limit : int
+        Maximum number of results
+
+    Returns
+    -------------
+    List of course ids with the best match first
+    '''
+    match_expression = build_match_expression(text, languages)
+    if match_expression is None:
+        return []
+    weights = ', '.join(
+        str(weight)
+        for _ in settings.LANGUAGES
+        for weight in SEARCH_FIELD_WEIGHTS
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND is_published = 1 '
+            f'ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s',
+            [match_expression, limit]
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -3,7 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers, status
 from rest_framework.validators import UniqueValidator
 
-from .models import Course
+from .models import Course, CourseSnapshot
 from common.error_definitions import CustomAPIError
 from common.error_handling import extract_serializer_error
 
@@ -139,6 +139,7 @@ class CourseSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         '''
         Updates a course in database and returns model instance.
+        The snapshot document of a published course is rebuilt.
 
         Parameters
         -------------
@@ -174,6 +175,8 @@ class CourseSerializer(serializers.ModelSerializer):
             instance.is_archived = validated_data.get(
                 'is_archived', instance.is_archived)
             instance.save()
+            if not instance.is_draft:
+                CourseSnapshot.objects.build_snapshot(instance)
             logger.info('Course {instance.title} updated successfully')
             return instance
         else:
@@ -191,7 +194,9 @@ class CourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
         fields = ['title', 'subtitle', 'description',
-                  'price', 'is_free', 'is_draft']
+                  'price', 'is_free', 'is_draft', 'is_archived',
+                  'student_count', 'lecture_count',
+                  'video_count', 'video_bytes']
         extra_kwargs = {
             'description': {
                 'error_messages': {
@@ -201,5 +206,29 @@ class CourseSerializer(serializers.ModelSerializer):
             },
             'is_draft': {
                 'write_only': True
+            },
+            'is_archived': {
+                'write_only': True
             }
         }
+
+
+class CourseDashboardSerializer(serializers.ModelSerializer):
+    '''
+    Read only serializer of a course with statistics for its instructor
+
+    Attributes
+    --------------
+    last_updated_at : Datetime
+        Last update of the course, its lectures or its videos.
+    '''
+
+    last_updated_at = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        model = Course
+        fields = ['title', 'slug', 'is_draft', 'is_archived',
+                  'student_count', 'lecture_count',
+                  'video_count', 'video_bytes',
+                  'created_at', 'last_updated_at']
+        read_only_fields = fields
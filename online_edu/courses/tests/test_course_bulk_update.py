@@ -0,0 +1,143 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSnapshot
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+
+pytestmark = pytest.mark.django_db
+
+
+def test_bulk_update_courses(
+    sample_courses,
+    test_user,
+    access_token,
+    django_assert_max_num_queries
+):
+    '''Test that courses are updated in bulk with a result per course'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user1.is_active = True
+    user1.save()
+    token = access_token(user1, 60)
+    courses = sample_courses(4)
+    for course in courses[:3]:
+        course.add_instructor(user1)
+
+    items = [
+        {'slug': courses[0].slug, 'fields': {'price': 5.99}},
+        {'slug': courses[1].slug, 'fields': {'is_archived': True}},
+        {'slug': courses[2].slug, 'fields': {'title': 'New title'}},
+        {'slug': courses[3].slug, 'fields': {'is_draft': False}},
+        {'slug': 'no-such-course', 'fields': {'is_draft': False}},
+        {'slug': courses[2].slug, 'fields': {'price': 'abc'}},
+    ]
+
+    with django_assert_max_num_queries(12):
+        api_response = client.patch(
+            '/api/courses/bulk-update',
+            items,
+            headers={'Authorization': f'Bearer {token}'},
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert [x['status_code'] for x in api_response.data] == \
+        [200, 200, 400, 403, 404, 400]
+    assert api_response.data[0]['course']['price'] == '5.99'
+    assert api_response.data[0]['course']['is_free'] == False
+    assert api_response.data[1]['course']['title'] == 'Course 2'
+    # Archive flag is write-only like the draft flag
+    assert 'is_archived' not in api_response.data[1]['course']
+    assert 'is_draft' not in api_response.data[1]['course']
+
+    courses = Course.objects.all().order_by('id')
+    assert str(courses[0].price) == '5.99'
+    assert courses[0].is_free == False
+    assert courses[1].is_archived == True
+    assert courses[2].title == 'Course 3'
+    assert courses[3].is_draft == True
+
+
+def test_bulk_update_side_effects(sample_courses, test_user, access_token):
+    '''Test that bulk updates invalidate the catalog and build snapshots'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user1.is_active = True
+    user1.save()
+    token = access_token(user1, 60)
+    courses = sample_courses(2)
+    for course in courses:
+        course.add_instructor(user1)
+
+    api_response = client.get('/api/courses/', format='json')
+    assert len(api_response.data['results']) == 0
+
+    api_response = client.patch(
+        '/api/courses/bulk-update',
+        [
+            {
+                'slug': course.slug,
+                'fields': {'is_draft': False, 'description': 'Updated'}
+            }
+            for course in courses
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response['X-Cache'] == 'MISS'
+    assert len(api_response.data['results']) == 2
+    assert api_response.data['results'][0]['description'] == 'Updated'
+    assert Course.objects.get(id=courses[0].id).description_en == 'Updated'
+    assert CourseSnapshot.objects.count() == 2
+
+    api_response = client.get('/api/courses/search?q=Course', format='json')
+    assert len(api_response.data) == 2
+
+
+def test_bulk_update_bad_requests(sample_course, test_user, access_token):
+    '''Test that bulk update requests are validated'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    user2 = test_user(username='admin@gmail.com', is_staff=True)
+    user2.is_active = True
+    user2.save()
+    course1 = sample_course()
+
+    # Fail - non-admin user
+    api_response = client.patch(
+        '/api/courses/bulk-update',
+        [{'slug': course1.slug, 'fields': {'price': 5}}],
+        headers={'Authorization': f'Bearer {access_token(user1, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    # Fail - not a list
+    token = access_token(user2, 60)
+    api_response = client.patch(
+        '/api/courses/bulk-update',
+        {'slug': course1.slug, 'fields': {'price': 5}},
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+    # Fail - too many items
+    api_response = client.patch(
+        '/api/courses/bulk-update',
+        [{'slug': course1.slug, 'fields': {'price': 5}}] * 101,
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
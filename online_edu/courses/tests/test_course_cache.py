@@ -0,0 +1,153 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import Course, COURSE_CACHE_NAMESPACE
+from registration.models import CourseStudentRegistration
+from common.cache_handling import get_cache_version
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+
+pytestmark = pytest.mark.django_db
+
+
+def test_course_list_cache(sample_courses, django_assert_num_queries):
+    '''Test that course list is served from cache until a course changes'''
+
+    client = APIClient()
+
+    courses = sample_courses(3)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response.status_code == 200
+    assert api_response['X-Cache'] == 'MISS'
+    assert len(api_response.data['results']) == 3
+
+    # Served from cache with only the query for the ETag
+    with django_assert_num_queries(1):
+        api_response = client.get('/api/courses/', format='json')
+    assert api_response['X-Cache'] == 'HIT'
+    assert len(api_response.data['results']) == 3
+
+    # Different query parameters are cached separately
+    api_response = client.get('/api/courses/?page_size=1', format='json')
+    assert api_response['X-Cache'] == 'MISS'
+    assert len(api_response.data['results']) == 1
+
+    # Saving a course invalidates the cache
+    courses[1].is_draft = True
+    courses[1].save()
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response['X-Cache'] == 'MISS'
+    assert len(api_response.data['results']) == 2
+
+    # Deleting a course invalidates the cache
+    courses[2].delete()
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response['X-Cache'] == 'MISS'
+    assert len(api_response.data['results']) == 1
+
+
+def test_course_cache_counters(sample_courses, test_user):
+    '''Test that counter changes only expire entries of the course'''
+
+    client = APIClient()
+
+    courses = sample_courses(2)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+    for course in courses:
+        client.get(f'/api/courses/{course.slug}', format='json')
+    updated_at = Course.objects.get(id=courses[0].id).updated_at
+    version = get_cache_version(COURSE_CACHE_NAMESPACE)
+
+    CourseStudentRegistration.objects.register_student(test_user(), courses[0])
+    assert Course.objects.get(id=courses[0].id).updated_at == updated_at
+    assert get_cache_version(COURSE_CACHE_NAMESPACE) == version
+
+    api_response = client.get(f'/api/courses/{courses[0].slug}', format='json')
+    assert api_response['X-Cache'] == 'MISS'
+    assert api_response.data['student_count'] == 1
+    api_response = client.get(f'/api/courses/{courses[1].slug}', format='json')
+    assert api_response['X-Cache'] == 'HIT'
+
+
+def test_course_cache_per_language(sample_course):
+    '''Test that cached course data is separate for every language'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.title_de = 'Kurs 1'
+    course1.is_draft = False
+    course1.save()
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}',
+        headers={'Accept-Language': 'de'},
+        format='json'
+    )
+    assert api_response['X-Cache'] == 'MISS'
+    assert api_response.data['title'] == 'Kurs 1'
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}',
+        headers={'Accept-Language': 'en'},
+        format='json'
+    )
+    assert api_response['X-Cache'] == 'MISS'
+    assert api_response.data['title'] == 'Course 1'
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}',
+        headers={'Accept-Language': 'de'},
+        format='json'
+    )
+    assert api_response['X-Cache'] == 'HIT'
+    assert api_response.data['title'] == 'Kurs 1'
+
+
+def test_course_cache_admin_bypass(sample_courses, test_user, access_token):
+    '''Test that admin requests are not cached and cache stats'''
+
+    client = APIClient()
+
+    sample_courses(2)
+    Course.objects.filter(title='Course 1').update(is_draft=False)
+
+    user1 = test_user(is_staff=True)
+    user1.is_active = True
+    user1.save()
+    token = access_token(user1, 60)
+
+    # Cache miss and cache hit for non-admin
+    client.get('/api/courses/', format='json')
+    client.get('/api/courses/', format='json')
+
+    # Admin sees draft courses and is never cached
+    for _ in range(2):
+        api_response = client.get(
+            '/api/courses/',
+            headers={'Authorization': f'Bearer {token}'},
+            format='json'
+        )
+        assert api_response.status_code == 200
+        assert not api_response.has_header('X-Cache')
+        assert len(api_response.data['results']) == 2
+
+    api_response = client.get(
+        '/api/courses/cache-stats',
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response.data['hits'] == 1
+    assert api_response.data['misses'] == 1
+    assert api_response.data['hit_ratio'] == 0.5
+
+    # Fail - cache stats only for admin
+    api_response = client.get('/api/courses/cache-stats', format='json')
+    assert api_response.status_code == 403
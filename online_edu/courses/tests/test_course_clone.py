@@ -0,0 +1,161 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSnapshot
+from lectures.models import Lecture
+from video_contents.models import VideoContent
+from .fixtures import sample_course
+from user_auth.tests.fixtures import test_user, access_token
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_clone_course(sample_course, test_user, test_lectures, test_video):
+    '''Test that a course is copied with lectures and shared videos'''
+
+    user1 = test_user(is_staff=True)
+    course1 = sample_course()
+    course1.description_de = 'Kursbeschreibung'
+    course1.is_draft = False
+    course1.save()
+    course1.add_instructor(user1)
+    lectures = test_lectures(course1, 3)
+    lectures[0].title_de = 'Vorlesung 1'
+    lectures[0].save()
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lectures[2].id, video1)
+
+    new_course = Course.objects.clone_course(course1, 'Course 1 - 2024')
+
+    new_course.refresh_from_db()
+    assert new_course.slug == 'course-1-2024'
+    assert new_course.is_draft == True
+    assert new_course.description_en == course1.description_en
+    assert new_course.description_de == 'Kursbeschreibung'
+    assert new_course.lecture_count == 3
+    assert new_course.check_user_is_instructor(user1)
+
+    new_lectures = list(Lecture.objects.filter(course=new_course))
+    assert [x.position for x in new_lectures] == [x.position for x in lectures]
+    assert [x.title for x in new_lectures] == [x.title for x in lectures]
+    assert new_lectures[0].title_de == 'Vorlesung 1'
+    assert list(new_lectures[2].videos.all()) == [video1]
+
+    # Video is shared and not copied
+    assert VideoContent.objects.count() == 1
+    assert Lecture.objects.filter(course=course1).count() == 3
+
+    # Fail - duplicate title
+    with pytest.raises(Exception) as e:
+        Course.objects.clone_course(course1, 'Course 1')
+    assert str(e.value) == 'A course with this title already exists'
+
+    clean_test_media()
+
+
+def test_clone_shared_video_changes(sample_course, test_user, test_lectures, test_video):
+    '''Test that changes of a shared video reach the cloned course'''
+
+    user1 = test_user(is_staff=True)
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    lectures = test_lectures(course1, 1)
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lectures[0].id, video1)
+    new_course = Course.objects.clone_course(course1, 'Course 1 - 2024')
+    new_course.is_draft = False
+    new_course.save()
+    CourseSnapshot.objects.build_snapshot(new_course)
+
+    # Renaming the video invalidates the syllabus of the copy
+    syllabus_key = Lecture.objects.get_syllabus_cache_key(new_course.id)
+    video1.name = 'Renamed video'
+    video1.save()
+    assert Lecture.objects.get_syllabus_cache_key(new_course.id) != syllabus_key
+    snapshot = CourseSnapshot.objects.get(course=new_course)
+    assert snapshot.documents['en']['lectures'][0]['videos'][0]['name'] == \
+        'Renamed video'
+
+    # Deleting the video removes it from the snapshot of the copy
+    syllabus_key = Lecture.objects.get_syllabus_cache_key(new_course.id)
+    video1.delete()
+    assert Lecture.objects.get_syllabus_cache_key(new_course.id) != syllabus_key
+    snapshot = CourseSnapshot.objects.get(course=new_course)
+    assert snapshot.documents['en']['lectures'][0]['videos'] == []
+
+    clean_test_media()
+
+
+def test_clone_course_query_count(sample_course, test_user, test_lectures):
+    '''Test that the number of queries does not depend on lectures'''
+
+    user1 = test_user(is_staff=True)
+    course1 = sample_course(index=1)
+    course1.add_instructor(user1)
+    test_lectures(course1, 2)
+    course2 = sample_course(index=2)
+    course2.add_instructor(user1)
+    test_lectures(course2, 10)
+
+    with CaptureQueriesContext(connection) as few_lectures:
+        Course.objects.clone_course(course1, 'Copy 1')
+    with CaptureQueriesContext(connection) as many_lectures:
+        Course.objects.clone_course(course2, 'Copy 2')
+    assert len(few_lectures) == len(many_lectures)
+
+
+def test_clone_course_endpoint(
+    sample_course,
+    test_user,
+    access_token,
+    test_lectures
+):
+    '''Test that only instructors can copy a course'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user2 = test_user(username='admin@gmail.com', is_staff=True)
+    for user in (user1, user2):
+        user.is_active = True
+        user.save()
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    test_lectures(course1, 2)
+
+    # Fail - not an instructor
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/clone',
+        {'title': 'New course'},
+        headers={'Authorization': f'Bearer {access_token(user2, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    token = access_token(user1, 60)
+
+    # Fail - title missing
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/clone',
+        {},
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+    # Success
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/clone',
+        {'title': 'New course'},
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 201
+    assert api_response.data['title'] == 'New course'
+    assert api_response.data['lecture_count'] == 2
+    assert Course.objects.get(title='New course').is_draft == True
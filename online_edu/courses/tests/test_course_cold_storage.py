@@ -0,0 +1,192 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, \
+    ArchivedCourse, \
+    CourseRecommendation, \
+    CourseSlugHistory, \
+    CourseSnapshot, \
+    CourseTrend
+from lectures.models import Lecture, LectureProgress
+from registration.models import CourseStudentRegistration
+from video_contents.models import VideoContent
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_published_courses_use_partial_index(sample_courses):
+    '''Test that the catalog query uses the partial index'''
+
+    sample_courses(2)
+    queryset = Course.objects.fetch_courses().order_by('created_at', 'id')
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = ' '.join(str(row) for row in cursor.fetchall())
+    assert 'course_published_idx' in plan
+
+
+def test_move_course_to_cold_storage(
+    sample_courses,
+    test_user,
+    test_lectures,
+    test_video
+):
+    '''Test that long archived courses are moved and restored'''
+
+    user1 = test_user(is_staff=True)
+    user2 = test_user(username='student@gmail.com')
+    courses = sample_courses(2)
+    course1 = courses[0]
+    course1.description_de = 'Kursbeschreibung'
+    course1.is_free = False
+    course1.price = 12.5
+    course1.is_draft = False
+    course1.is_archived = True
+    course1.save()
+    course1.add_instructor(user1)
+    lectures = test_lectures(course1, 2)
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lectures[1].id, video1)
+    CourseStudentRegistration.objects.register_student(user2, course1)
+    registered_at = CourseStudentRegistration.objects.get().registered_at
+    created_at = Course.objects.get(id=course1.id).created_at
+    now = timezone.now()
+    LectureProgress.objects.create(
+        user=user2,
+        lecture=lectures[1],
+        video=video1,
+        position=30,
+        completed=True,
+        updated_at=now
+    )
+    CourseTrend.objects.record_event(course1.id, 'registration', when=now)
+    trend_score = CourseTrend.objects.get(course=course1).score
+    for course, recommended_course in (
+        (course1, courses[1]),
+        (courses[1], course1)
+    ):
+        CourseRecommendation.objects.create(
+            course=course,
+            recommended_course=recommended_course,
+            rank=1,
+            score=0.5,
+            computed_at=now
+        )
+    CourseSlugHistory.objects.create(course=course1, slug='old-course-1')
+
+    # Not archived long enough
+    call_command('move_archived_courses')
+    assert ArchivedCourse.objects.count() == 0
+
+    Course.objects.filter(id=course1.id).update(
+        updated_at=timezone.now() - timedelta(days=200)
+    )
+    call_command('move_archived_courses')
+    assert ArchivedCourse.objects.count() == 1
+    assert list(Course.objects.all()) == [courses[1]]
+    assert Lecture.objects.count() == 0
+    assert CourseStudentRegistration.objects.count() == 0
+    assert VideoContent.objects.get().course is None
+    assert LectureProgress.objects.count() == 0
+    assert CourseRecommendation.objects.count() == 0
+
+    course = ArchivedCourse.objects.restore(
+        ArchivedCourse.objects.get_by_slug(course1.slug)
+    )
+    assert ArchivedCourse.objects.count() == 0
+    assert course.id == course1.id
+    assert course.slug == course1.slug
+    assert course.is_archived == False
+    assert course.is_draft == False
+    assert course.description_de == 'Kursbeschreibung'
+    assert str(course.price) == '12.50'
+    assert course.created_at == created_at
+    assert course.check_user_is_instructor(user1)
+    assert course.lecture_count == 2
+    assert course.student_count == 1
+    assert course.video_count == 1
+    assert course.video_bytes == video1.file_size
+    restored_lectures = list(Lecture.objects.filter(course=course))
+    assert [(x.id, x.title) for x in restored_lectures] == \
+        [(x.id, x.title) for x in lectures]
+    assert list(restored_lectures[1].videos.all()) == [video1]
+    registration = CourseStudentRegistration.objects.get(course=course)
+    assert registration.user == user2
+    assert registration.registered_at == registered_at
+    assert VideoContent.objects.get().course == course
+    progress = LectureProgress.objects.get()
+    assert (progress.lecture_id, progress.position, progress.completed) == \
+        (lectures[1].id, 30, True)
+    assert CourseTrend.objects.get(course=course).score == trend_score
+    assert set(CourseRecommendation.objects.values_list(
+        'course_id', 'recommended_course_id'
+    )) == {(course1.id, courses[1].id), (courses[1].id, course1.id)}
+    assert CourseSlugHistory.objects.get_redirect('old-course-1') == \
+        (course1.id, course1.slug)
+    assert CourseSnapshot.objects.filter(course=course).exists()
+
+    # Fail - slug taken by another course
+    ArchivedCourse.objects.archive_course(course)
+    Course.objects.filter(id=courses[1].id).update(slug=course1.slug)
+    with pytest.raises(Exception) as e:
+        ArchivedCourse.objects.restore(
+            ArchivedCourse.objects.get_by_slug(course1.slug)
+        )
+    assert str(e.value) == 'A course with this slug already exists'
+    assert ArchivedCourse.objects.count() == 1
+
+    clean_test_media()
+
+
+def test_unarchive_endpoint(sample_course, test_user, access_token):
+    '''Test that only instructors can bring back a course'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user2 = test_user(username='admin@gmail.com', is_staff=True)
+    for user in (user1, user2):
+        user.is_active = True
+        user.save()
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    course1.is_archived = True
+    course1.save()
+    ArchivedCourse.objects.archive_course(course1)
+
+    # Fail - not an instructor
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/unarchive',
+        headers={'Authorization': f'Bearer {access_token(user2, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    token = access_token(user1, 60)
+
+    # Fail - course not in cold storage
+    api_response = client.post(
+        '/api/courses/no-such-course/unarchive',
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 404
+
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/unarchive',
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response.data['title'] == 'Course 1'
+    assert Course.objects.get(slug=course1.slug).is_archived == False
@@ -0,0 +1,146 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+
+pytestmark = pytest.mark.django_db
+
+
+def test_course_list_etag(sample_courses, django_assert_num_queries):
+    '''Test conditional GET of course list with ETag'''
+
+    client = APIClient()
+
+    courses = sample_courses(3)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response.status_code == 200
+    etag = api_response['ETag']
+    assert api_response.has_header('Last-Modified')
+
+    # Not modified - only the aggregate query is run
+    with django_assert_num_queries(1):
+        api_response = client.get(
+            '/api/courses/',
+            headers={'If-None-Match': etag},
+            format='json'
+        )
+    assert api_response.status_code == 304
+
+    # Different language has a different ETag
+    api_response = client.get(
+        '/api/courses/',
+        headers={'If-None-Match': etag, 'Accept-Language': 'de'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response['ETag'] != etag
+
+    # Updating a course changes the ETag
+    courses[0].description = 'New description'
+    courses[0].save()
+    api_response = client.get(
+        '/api/courses/',
+        headers={'If-None-Match': etag},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response['ETag'] != etag
+    etag = api_response['ETag']
+
+    # Removing a course from the list changes the ETag
+    courses[1].delete()
+    api_response = client.get(
+        '/api/courses/',
+        headers={'If-None-Match': etag},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data['results']) == 2
+
+
+def test_course_list_last_modified(sample_courses):
+    '''Test that Last-Modified of course list does not go back'''
+
+    client = APIClient()
+
+    courses = sample_courses(2)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+    for days, course in zip((2, 1), courses):
+        Course.objects.filter(id=course.id).update(
+            updated_at=timezone.now() - timedelta(days=days)
+        )
+    cache.clear()
+
+    api_response = client.get('/api/courses/', format='json')
+    last_modified = parse_http_date(api_response['Last-Modified'])
+
+    # Latest modified course leaves the list
+    courses[1].is_archived = True
+    courses[1].save()
+    api_response = client.get(
+        '/api/courses/',
+        headers={'If-Modified-Since': http_date(last_modified)},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data['results']) == 1
+    assert parse_http_date(api_response['Last-Modified']) >= last_modified
+
+
+def test_course_detail_last_modified(
+    sample_course,
+    test_user,
+    access_token
+):
+    '''Test conditional GET of course details'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+
+    api_response = client.get(f'/api/courses/{course1.slug}', format='json')
+    assert api_response.status_code == 200
+    etag = api_response['ETag']
+    last_modified = api_response['Last-Modified']
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}',
+        headers={'If-Modified-Since': last_modified},
+        format='json'
+    )
+    assert api_response.status_code == 304
+
+    # Admin response has a different ETag
+    user1 = test_user(is_staff=True)
+    token = access_token(user1, 60)
+    api_response = client.get(
+        f'/api/courses/{course1.slug}',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'If-None-Match': etag
+        },
+        format='json'
+    )
+    assert api_response.status_code == 200
+
+    # Missing course is still not found
+    api_response = client.get(
+        '/api/courses/some-other-course',
+        headers={'If-None-Match': etag},
+        format='json'
+    )
+    assert api_response.status_code == 404
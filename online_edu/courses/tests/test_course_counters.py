@@ -0,0 +1,109 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from lectures.models import Lecture
+from lectures.managers import LECTURE_POSITION_GAP
+from registration.models import CourseStudentRegistration
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_course_counters(sample_course, test_user, test_lectures, test_video):
+    '''Test that course counters follow registrations, lectures and videos'''
+
+    course1 = sample_course()
+    course2 = sample_course(index=2)
+
+    user1 = test_user()
+    user2 = test_user(username='otheruser@gmail.com')
+    CourseStudentRegistration.objects.register_student(user1, course1)
+    registration = CourseStudentRegistration.objects.register_student(
+        user2, course1)
+    lectures = test_lectures(course=course1, no_of_lectures=3)
+    video1 = test_video(course=course1, video_file=None)
+    test_video(course=course2, name='Other video')
+
+    course1.refresh_from_db()
+    assert course1.student_count == 2
+    assert course1.lecture_count == 3
+    assert course1.video_count == 1
+    assert course1.video_bytes == video1.file_size
+    assert video1.file_size == len(b'Some file contents')
+
+    registration.delete()
+    lectures[0].delete()
+    video1.delete()
+    course1.refresh_from_db()
+    assert course1.student_count == 1
+    assert course1.lecture_count == 2
+    assert course1.video_count == 0
+    assert course1.video_bytes == 0
+
+    course2.refresh_from_db()
+    assert course2.student_count == 0
+    assert course2.lecture_count == 0
+    assert course2.video_count == 1
+
+    clean_test_media()
+
+
+def test_reconcile_course_counters(sample_courses, test_lectures):
+    '''Test that drifted counters are repaired in batches'''
+
+    courses = sample_courses(5)
+    for course in courses:
+        test_lectures(course=course, no_of_lectures=2)
+
+    # Counters drift by changes that bypass signals
+    Lecture.objects.filter(course=courses[1]).update(
+        course=courses[3],
+        position=F('position') + 10 * LECTURE_POSITION_GAP,
+        title_en=Concat(F('title_en'), Value(' moved')),
+        title_de=Concat(F('title_de'), Value(' moved'))
+    )
+    Course.objects.filter(pk=courses[4].pk).update(student_count=10)
+
+    call_command('reconcile_course_counters', batch_size=2)
+
+    counts = dict(Course.objects.values_list('pk', 'lecture_count'))
+    assert counts[courses[0].pk] == 2
+    assert counts[courses[1].pk] == 0
+    assert counts[courses[3].pk] == 4
+    assert Course.objects.get(pk=courses[4].pk).student_count == 0
+
+    # Nothing left to repair
+    assert Course.objects.reconcile_counters() == 0
+
+
+def test_course_list_counters(
+    sample_courses,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that course list has counters without queries per course'''
+
+    client = APIClient()
+
+    courses = sample_courses(4)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+        test_lectures(course=course, no_of_lectures=2)
+
+    # One query for the ETag, one for the number of courses
+    # and one for the page
+    with django_assert_num_queries(3):
+        api_response = client.get('/api/courses/', format='json')
+    assert api_response.status_code == 200
+    assert [x['lecture_count'] for x in api_response.data['results']] == \
+        [2, 2, 2, 2]
+    assert api_response.data['results'][0]['student_count'] == 0
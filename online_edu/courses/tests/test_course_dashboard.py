@@ -0,0 +1,109 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from lectures.models import Lecture
+from video_contents.models import VideoContent
+from registration.models import CourseStudentRegistration
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_taught_courses(sample_courses, test_user, test_lectures, test_video):
+    '''Test course statistics and last update time of instructor courses'''
+
+    user1 = test_user(is_staff=True)
+    user2 = test_user(username='student@gmail.com')
+    courses = sample_courses(3)
+    courses[0].add_instructor(user1)
+    courses[1].add_instructor(user1)
+    test_lectures(courses[0], 2)
+    video1 = test_video(courses[0])
+    CourseStudentRegistration.objects.register_student(user2, courses[0])
+    Course.objects.filter(id=courses[0].id).update(
+        updated_at=timezone.now() - timedelta(days=2)
+    )
+    Course.objects.filter(id=courses[1].id).update(
+        updated_at=timezone.now() - timedelta(days=1)
+    )
+
+    taught_courses = list(Course.objects.get_taught_courses(user1))
+    # Lectures and video updated after the course
+    assert taught_courses == [courses[0], courses[1]]
+    assert taught_courses[0].lecture_count == 2
+    assert taught_courses[0].student_count == 1
+    assert taught_courses[0].video_count == 1
+    assert taught_courses[0].last_updated_at == max(
+        Lecture.objects.filter(course=courses[0]).latest('updated_at').updated_at,
+        VideoContent.objects.get(id=video1.id).updated_at
+    )
+    assert taught_courses[1].last_updated_at == \
+        Course.objects.get(id=courses[1].id).updated_at
+
+    clean_test_media()
+
+
+def test_dashboard_endpoint(
+    sample_courses,
+    test_user,
+    access_token,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that the dashboard is fetched with fixed number of queries'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user1.is_active = True
+    user1.save()
+    user2 = test_user(username='student@gmail.com')
+    user2.is_active = True
+    user2.save()
+    token = access_token(user1, 60)
+    courses = sample_courses(5)
+    courses[0].add_instructor(user1)
+    test_lectures(courses[0], 2)
+
+    # Authentication and courses
+    with django_assert_num_queries(2):
+        api_response = client.get(
+            '/api/courses/taught',
+            headers={'Authorization': f'Bearer {token}'},
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert len(api_response.data) == 1
+    assert api_response.data[0]['slug'] == courses[0].slug
+    assert api_response.data[0]['lecture_count'] == 2
+    assert api_response.data[0]['is_draft'] == True
+
+    for course in courses[1:]:
+        course.add_instructor(user1)
+        test_lectures(course, 2)
+        CourseStudentRegistration.objects.register_student(user2, course)
+
+    with django_assert_num_queries(2):
+        api_response = client.get(
+            '/api/courses/taught',
+            headers={'Authorization': f'Bearer {token}'},
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert len(api_response.data) == 5
+    assert sum(x['student_count'] for x in api_response.data) == 4
+
+    # Fail - not an admin
+    api_response = client.get(
+        '/api/courses/taught',
+        headers={'Authorization': f'Bearer {access_token(user2, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
@@ -0,0 +1,143 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def facet_courses(sample_course, test_user):
+    '''Published courses with prices and instructors for facets'''
+
+    def _gen_courses():
+        user1 = test_user(username='teacher1@gmail.com', is_staff=True)
+        user1.first_name = 'First'
+        user1.last_name = 'Teacher'
+        user1.save()
+        user2 = test_user(username='teacher2@gmail.com', is_staff=True)
+        user3 = test_user(username='teacher3@gmail.com', is_staff=True)
+        prices = [None, 5, 12, 30, 60]
+        courses = []
+        for index, price in enumerate(prices, start=1):
+            course = sample_course(index=index)
+            if price is not None:
+                course.is_free = False
+                course.price = price
+            course.is_draft = False
+            course.save()
+            courses.append(course)
+        for course in courses[:3]:
+            course.add_instructor(user1)
+        for course in courses[2:]:
+            course.add_instructor(user2)
+        draft_course = sample_course(index=6)
+        draft_course.add_instructor(user1)
+        draft_course.add_instructor(user3)
+        return courses, user1, user2
+
+    return _gen_courses
+
+
+def test_course_facets(facet_courses, django_assert_num_queries):
+    '''Test that all facets are counted with one query and cached'''
+
+    courses, user1, user2 = facet_courses()
+
+    # Instructors of draft courses are not listed
+    # and email addresses are not shown
+    assert Course.objects.get_instructors() == [
+        {'id': user1.id, 'name': 'First Teacher'},
+        {'id': user2.id, 'name': ''}
+    ]
+    # Counts of courses and courses of instructors
+    with django_assert_num_queries(1):
+        facets = Course.objects.get_facets()
+    assert facets['total'] == 5
+    assert facets['is_free'] == {'free': 1, 'paid': 4}
+    assert [x['count'] for x in facets['price']] == [1, 1, 1, 1]
+    assert facets['instructors'] == [
+        {'id': user1.id, 'name': 'First Teacher', 'count': 3},
+        {'id': user2.id, 'name': '', 'count': 3}
+    ]
+    assert facets['languages'] == [
+        {'code': 'en', 'count': 5},
+        {'code': 'de', 'count': 5}
+    ]
+
+    # Served from cache
+    with django_assert_num_queries(0):
+        Course.objects.get_facets()
+
+    # Cache invalidated when a course changes
+    courses[0].is_draft = True
+    courses[0].save()
+    assert Course.objects.get_facets()['total'] == 4
+
+
+def test_course_facets_filters(facet_courses):
+    '''Test that facets are counted over filtered courses'''
+
+    courses, user1, user2 = facet_courses()
+
+    facets = Course.objects.get_facets(filters={'is_free': False})
+    assert facets['total'] == 4
+    assert facets['is_free'] == {'free': 0, 'paid': 4}
+
+    facets = Course.objects.get_facets(filters={'instructor': user2.id})
+    assert facets['total'] == 3
+    assert facets['instructors'] == [
+        {'id': user1.id, 'name': 'First Teacher', 'count': 1},
+        {'id': user2.id, 'name': '', 'count': 3}
+    ]
+
+    facets = Course.objects.get_facets(
+        filters={'price_min': 10, 'price_max': 40}
+    )
+    assert facets['total'] == 2
+
+    facets = Course.objects.get_facets(search_text='Course 2')
+    assert facets['total'] == 1
+    assert facets['is_free'] == {'free': 0, 'paid': 1}
+
+    # Instructor change invalidates the cached facets
+    courses[4].instructors.remove(user2)
+    facets = Course.objects.get_facets(filters={'instructor': user2.id})
+    assert facets['total'] == 2
+
+
+def test_course_facets_endpoint(facet_courses):
+    '''Test facets endpoint with query parameters'''
+
+    client = APIClient()
+
+    courses, user1, user2 = facet_courses()
+
+    api_response = client.get('/api/courses/facets', format='json')
+    assert api_response.status_code == 200
+    assert api_response.data['total'] == 5
+
+    api_response = client.get(
+        f'/api/courses/facets?is_free=true&instructor={user1.id}',
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response.data['total'] == 1
+
+    # Fail - invalid filters
+    api_response = client.get('/api/courses/facets?is_free=yes', format='json')
+    assert api_response.status_code == 400
+    api_response = client.get(
+        '/api/courses/facets?price_min=abc',
+        format='json'
+    )
+    assert api_response.status_code == 400
+    for value in ('nan', 'inf', '-inf'):
+        api_response = client.get(
+            f'/api/courses/facets?price_min={value}',
+            format='json'
+        )
+        assert api_response.status_code == 400
+        assert api_response.data['detail'] == 'Invalid filter'
@@ -23,7 +23,7 @@ def test_user_course_list_view(sample_courses):
     # No course returned - all in draft
     api_response = client.get('/api/courses/', format='json')
     assert api_response.status_code == 200
-    assert len(api_response.data) == 0
+    assert len(api_response.data['results']) == 0
 
     # Make second course not draft
     courses[1].is_draft = False
@@ -32,10 +32,10 @@ def test_user_course_list_view(sample_courses):
     # One course returned
     api_response = client.get('/api/courses/', format='json')
     assert api_response.status_code == 200
-    assert len(api_response.data) == 1
+    assert len(api_response.data['results']) == 1
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert api_response[0]['title'] == courses[1].title
+    assert api_response['results'][0]['title'] == courses[1].title
 
     # Make fourth course not draft
     courses[3].is_draft = False
@@ -44,11 +44,11 @@ def test_user_course_list_view(sample_courses):
     # Two courses returned
     api_response = client.get('/api/courses/', format='json')
     assert api_response.status_code == 200
-    assert len(api_response.data) == 2
+    assert len(api_response.data['results']) == 2
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert api_response[0]['title'] == courses[1].title
-    assert api_response[1]['title'] == courses[3].title
+    assert api_response['results'][0]['title'] == courses[1].title
+    assert api_response['results'][1]['title'] == courses[3].title
 
     # Make last course not draft
     courses[4].is_draft = False
@@ -57,12 +57,12 @@ def test_user_course_list_view(sample_courses):
     # Three courses returned
     api_response = client.get('/api/courses/', format='json')
     assert api_response.status_code == 200
-    assert len(api_response.data) == 3
+    assert len(api_response.data['results']) == 3
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert api_response[0]['title'] == courses[1].title
-    assert api_response[1]['title'] == courses[3].title
-    assert api_response[2]['title'] == courses[4].title
+    assert api_response['results'][0]['title'] == courses[1].title
+    assert api_response['results'][1]['title'] == courses[3].title
+    assert api_response['results'][2]['title'] == courses[4].title
 
     # Make fourth course as archived
     courses[3].is_archived = True
@@ -71,11 +71,11 @@ def test_user_course_list_view(sample_courses):
     # Two courses should be returned
     api_response = client.get('/api/courses/', format='json')
     assert api_response.status_code == 200
-    assert len(api_response.data) == 2
+    assert len(api_response.data['results']) == 2
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert api_response[0]['title'] == courses[1].title
-    assert api_response[1]['title'] == courses[4].title
+    assert api_response['results'][0]['title'] == courses[1].title
+    assert api_response['results'][1]['title'] == courses[4].title
 
 
 def test_admin_list_view(sample_courses, test_user, access_token):
@@ -100,7 +100,7 @@ def test_admin_list_view(sample_courses, test_user, access_token):
         format='json'
     )
     assert api_response.status_code == 200
-    assert len(api_response.data) == 5
+    assert len(api_response.data['results']) == 5
 
     # Make second course not draft
     courses[1].is_draft = False
@@ -123,7 +123,7 @@ def test_admin_list_view(sample_courses, test_user, access_token):
         format='json'
     )
     assert api_response.status_code == 200
-    assert len(api_response.data) == 5
+    assert len(api_response.data['results']) == 5
 
 
 def test_user_course_detail_view(sample_course, test_user, access_token):
@@ -255,12 +255,12 @@ def test_list_courses_with_lang(sample_courses):
     assert api_response.status_code == 200
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert len(api_response) == 5
-    assert api_response[0]['title'] == 'Course 1'
-    assert api_response[1]['title'] == 'Course 2'
-    assert api_response[2]['title'] == 'Course 3'
-    assert api_response[3]['title'] == 'Course 4'
-    assert api_response[4]['title'] == 'Course 5'
+    assert len(api_response['results']) == 5
+    assert api_response['results'][0]['title'] == 'Course 1'
+    assert api_response['results'][1]['title'] == 'Course 2'
+    assert api_response['results'][2]['title'] == 'Course 3'
+    assert api_response['results'][3]['title'] == 'Course 4'
+    assert api_response['results'][4]['title'] == 'Course 5'
 
     for course in courses:
         course.title_de = f'{course.title} - German'
@@ -279,17 +279,17 @@ def test_list_courses_with_lang(sample_courses):
     assert api_response.status_code == 200
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert len(api_response) == 5
-    assert api_response[0]['title'] == 'Course 1 - German'
-    assert api_response[1]['title'] == 'Course 2 - German'
-    assert api_response[2]['title'] == 'Course 3 - German'
-    assert api_response[3]['title'] == 'Course 4 - German'
-    assert api_response[4]['title'] == 'Course 5 - German'
-    assert api_response[0]['description'] == 'Course description 1'
-    assert api_response[1]['description'] == 'Course description 2'
-    assert api_response[2]['description'] == 'Course description 3'
-    assert api_response[3]['description'] == 'Course description 4'
-    assert api_response[4]['description'] == 'Course description 5'
+    assert len(api_response['results']) == 5
+    assert api_response['results'][0]['title'] == 'Course 1 - German'
+    assert api_response['results'][1]['title'] == 'Course 2 - German'
+    assert api_response['results'][2]['title'] == 'Course 3 - German'
+    assert api_response['results'][3]['title'] == 'Course 4 - German'
+    assert api_response['results'][4]['title'] == 'Course 5 - German'
+    assert api_response['results'][0]['description'] == 'Course description 1'
+    assert api_response['results'][1]['description'] == 'Course description 2'
+    assert api_response['results'][2]['description'] == 'Course description 3'
+    assert api_response['results'][3]['description'] == 'Course description 4'
+    assert api_response['results'][4]['description'] == 'Course description 5'
 
     # Fetching content in unsupported language should
     # return content in default language
@@ -303,12 +303,12 @@ def test_list_courses_with_lang(sample_courses):
     assert api_response.status_code == 200
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert len(api_response) == 5
-    assert api_response[0]['title'] == 'Course 1'
-    assert api_response[1]['title'] == 'Course 2'
-    assert api_response[2]['title'] == 'Course 3'
-    assert api_response[3]['title'] == 'Course 4'
-    assert api_response[4]['title'] == 'Course 5'
+    assert len(api_response['results']) == 5
+    assert api_response['results'][0]['title'] == 'Course 1'
+    assert api_response['results'][1]['title'] == 'Course 2'
+    assert api_response['results'][2]['title'] == 'Course 3'
+    assert api_response['results'][3]['title'] == 'Course 4'
+    assert api_response['results'][4]['title'] == 'Course 5'
 
     # Country specific content should return language content
     api_response = client.get(
@@ -321,12 +321,12 @@ def test_list_courses_with_lang(sample_courses):
     assert api_response.status_code == 200
     api_response.render()
     api_response = json.loads(api_response.content)
-    assert len(api_response) == 5
-    assert api_response[0]['title'] == 'Course 1 - German'
-    assert api_response[1]['title'] == 'Course 2 - German'
-    assert api_response[2]['title'] == 'Course 3 - German'
-    assert api_response[3]['title'] == 'Course 4 - German'
-    assert api_response[4]['title'] == 'Course 5 - German'
+    assert len(api_response['results']) == 5
+    assert api_response['results'][0]['title'] == 'Course 1 - German'
+    assert api_response['results'][1]['title'] == 'Course 2 - German'
+    assert api_response['results'][2]['title'] == 'Course 3 - German'
+    assert api_response['results'][3]['title'] == 'Course 4 - German'
+    assert api_response['results'][4]['title'] == 'Course 5 - German'
 
 
 def test_course_detail_with_lang(test_user, access_token, sample_course):
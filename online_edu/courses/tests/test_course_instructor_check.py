@@ -0,0 +1,77 @@
+import pytest
+
+from courses.models import Course
+from user_auth.models import User
+from .fixtures import sample_course
+from user_auth.tests.fixtures import test_user
+
+pytestmark = pytest.mark.django_db
+
+
+def test_instructor_check_cost_is_constant(
+    sample_course,
+    django_assert_num_queries
+):
+    '''
+    Benchmark instructor check - a single query whatever
+    the number of instructors of the course
+    '''
+
+    course1 = sample_course()
+    for no_of_instructors in [1, 10, 100]:
+        User.objects.bulk_create([
+            User(username=f'user{no_of_instructors}-{i}@gmail.com', is_staff=True)
+            for i in range(no_of_instructors)
+        ])
+        new_instructors = User.objects.filter(
+            username__startswith=f'user{no_of_instructors}-'
+        )
+        course1.instructors.add(*new_instructors)
+        last_instructor = new_instructors.last()
+        other_user = User.objects.create(
+            username=f'other{no_of_instructors}@gmail.com'
+        )
+
+        check_course = Course.objects.get(id=course1.id)
+        with django_assert_num_queries(1) as captured:
+            assert check_course.check_user_is_instructor(last_instructor)
+        assert 'LIMIT 1' in captured.captured_queries[0]['sql']
+
+        with django_assert_num_queries(1):
+            assert not check_course.check_user_is_instructor(other_user)
+
+
+def test_instructor_check_cache(
+    sample_course,
+    test_user,
+    django_assert_num_queries
+):
+    '''Test that instructor checks are only remembered for the request'''
+
+    course1 = sample_course()
+    user1 = test_user(is_staff=True)
+
+    # Result is remembered for the request
+    with django_assert_num_queries(1):
+        assert not course1.check_user_is_instructor(user1)
+        assert not course1.check_user_is_instructor(user1)
+
+    # Result is not cached across requests
+    check_course = Course.objects.get(id=course1.id)
+    with django_assert_num_queries(1):
+        assert not check_course.check_user_is_instructor(user1)
+
+    # Adding an instructor resets the remembered result
+    course1.add_instructor(user1)
+    assert course1.check_user_is_instructor(user1)
+    assert Course.objects.get(
+        id=course1.id).check_user_is_instructor(user1)
+
+    # Removing an instructor is seen by the next request
+    user1.courses_taught.remove(course1)
+    assert not Course.objects.get(
+        id=course1.id).check_user_is_instructor(user1)
+
+    # No user
+    with django_assert_num_queries(0):
+        assert not course1.check_user_is_instructor(None)
@@ -115,3 +115,39 @@ def test_check_if_title_duplicate(sample_course):
 
     with pytest.raises(Exception) as e:
         Course.objects.check_if_title_duplicate(None, course1.title.lower())
+
+
+def test_check_if_title_duplicate_normalized(
+    sample_course,
+    django_assert_num_queries
+):
+    '''
+    Test that duplicate check uses case folded titles
+    of the active language with a single query
+    '''
+
+    course1 = sample_course(title='Grundlagen der Straße')
+    assert course1.title_normalized_en == 'grundlagen der straße'.casefold()
+    assert course1.title_normalized_de == 'grundlagen der strasse'
+
+    # Case folding matches titles that iexact would not
+    with django_assert_num_queries(1):
+        with pytest.raises(Exception):
+            Course.objects.check_if_title_duplicate(
+                None,
+                '  GRUNDLAGEN DER STRASSE '
+            )
+
+    # Different title
+    with django_assert_num_queries(1):
+        assert Course.objects.check_if_title_duplicate(
+            None,
+            'Grundlagen der Wege'
+        ) == False
+
+    # No title in partial updates
+    with django_assert_num_queries(0):
+        assert Course.objects.check_if_title_duplicate(
+            course1.id,
+            None
+        ) == False
@@ -1,7 +1,10 @@
-from django.db import transaction
+from importlib import import_module
+from django.apps import apps
+from django.db import transaction, IntegrityError
 import pytest
 
 from courses.models import Course
+from common.error_definitions import CustomAPIError
 from user_auth.tests.fixtures import test_user
 
 pytestmark = pytest.mark.django_db
@@ -103,3 +106,73 @@ def test_course_instructor(test_user):
     course1.add_instructor(user1)
     instructor1 = course1.instructors.all()[0]
     assert instructor1.username == user1.username
+
+
+def test_normalized_title_migration():
+    '''
+    Test that the migration adding normalized titles renames
+    later courses whose titles only differ in case
+    '''
+
+    migration = import_module('courses.migrations.0005_course_title_normalized')
+    courses = [
+        Course.objects.create(
+            title=title,
+            description='Some course description',
+            price=1.99
+        )
+        for title in ('Python', 'Other', 'Python (2)', 'Another')
+    ]
+    # Titles saved before normalized titles were unique
+    Course.objects.filter(id=courses[1].id).update(
+        title='PYTHON', title_en='PYTHON', title_normalized_en=None)
+    Course.objects.filter(id=courses[3].id).update(
+        title='python', title_en='python', title_normalized_en=None)
+
+    migration.populate_normalized_titles(apps, None)
+    assert list(Course.objects.order_by('id').values_list(
+        'title', 'title_en', 'title_normalized_en'
+    )) == [
+        ('Python', 'Python', 'python'),
+        ('PYTHON (3)', 'PYTHON (3)', 'python (3)'),
+        ('Python (2)', 'Python (2)', 'python (2)'),
+        ('python (4)', 'python (4)', 'python (4)'),
+    ]
+
+
+def test_course_duplicate_title_constraint():
+    '''
+    Test that the unique index on normalized title rejects
+    titles that differ only in case without a prior check
+    '''
+
+    course1 = Course.objects.create(
+        title='Some course title',
+        description='Some course description',
+        price=1.99
+    )
+
+    # Fail - same title in different case
+    with pytest.raises(CustomAPIError) as e:
+        Course.objects.create(
+            title='SOME COURSE TITLE',
+            description='Some course description',
+            price=1.99
+        )
+    assert e.value.status_code == 400
+    assert Course.objects.count() == 1
+
+    # Changing the title updates the normalized title
+    course1.title = 'Other Course Title'
+    course1.save(update_fields=['title_en'])
+    course1.refresh_from_db()
+    assert course1.title_normalized_en == 'other course title'
+
+    # Other integrity errors are not reported as duplicate titles
+    with pytest.raises(IntegrityError):
+        Course(
+            id=course1.id,
+            title='Another course title',
+            description='Some course description',
+            price=1.99
+        ).save(force_insert=True)
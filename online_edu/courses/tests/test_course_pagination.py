@@ -0,0 +1,185 @@
+import pytest
+from django.contrib import admin
+from django.db import connection
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from registration.models import CourseStudentRegistration
+from user_auth.models import User
+from video_contents.models import VideoContent
+from common.pagination import estimate_count, EstimatedCountPaginator
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user
+
+pytestmark = pytest.mark.django_db
+
+
+def test_course_list_pages(sample_courses):
+    '''Test that the course list is fetched page by page with a cursor'''
+
+    client = APIClient()
+
+    courses = sample_courses(7)
+    for course in courses:
+        course.is_draft = False
+        course.save()
+
+    # Default page size is larger than number of courses
+    api_response = client.get('/api/courses/', format='json')
+    assert api_response.status_code == 200
+    assert api_response.data['next'] is None
+    assert api_response.data['count'] == 7
+    assert len(api_response.data['results']) == 7
+
+    # Follow next links with page size 3
+    titles = []
+    next_link = '/api/courses/?page_size=3'
+    no_of_pages = 0
+    while next_link is not None:
+        api_response = client.get(next_link, format='json')
+        assert api_response.status_code == 200
+        assert len(api_response.data['results']) <= 3
+        titles += [x['title'] for x in api_response.data['results']]
+        next_link = api_response.data['next']
+        no_of_pages += 1
+    assert no_of_pages == 3
+    assert titles == [course.title for course in courses]
+
+
+def test_course_list_page_queries(
+    sample_courses,
+    settings,
+    django_assert_num_queries
+):
+    '''
+    Test that a later page costs the same query as the first page
+    (one query for the ETag and one for the page) and that the
+    number of courses of a large catalog is only counted once
+    '''
+
+    client = APIClient()
+
+    courses = sample_courses(10)
+    Course.objects.update(is_draft=False)
+    settings.ESTIMATED_COUNT_THRESHOLD = 5
+
+    with django_assert_num_queries(3):
+        api_response = client.get('/api/courses/?page_size=2', format='json')
+    assert api_response.data['count'] == 10
+    next_link = api_response.data['next']
+    for _ in range(3):
+        api_response = client.get(next_link, format='json')
+        next_link = api_response.data['next']
+    with django_assert_num_queries(2) as captured:
+        api_response = client.get(next_link, format='json')
+    assert 'LIMIT 3' in captured.captured_queries[1]['sql']
+    assert [x['title'] for x in api_response.data['results']] == \
+        [courses[8].title, courses[9].title]
+    assert api_response.data['next'] is None
+    assert api_response.data['count'] == 10
+
+
+def test_course_list_without_pagination(sample_courses):
+    '''Test that pagination can be turned off'''
+
+    client = APIClient()
+
+    courses = sample_courses(3)
+    Course.objects.update(is_draft=False)
+
+    api_response = client.get(
+        '/api/courses/?paginate=false&page_size=1',
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data) == 3
+    assert api_response.data[0]['title'] == courses[0].title
+
+
+def test_course_list_bad_pagination(sample_courses):
+    '''Test that invalid page sizes and cursors are rejected'''
+
+    client = APIClient()
+
+    sample_courses(3)
+
+    # Fail - page size must be a positive number
+    api_response = client.get('/api/courses/?page_size=0', format='json')
+    assert api_response.status_code == 400
+    api_response = client.get('/api/courses/?page_size=abc', format='json')
+    assert api_response.status_code == 400
+
+    # Fail - cursor tampered
+    api_response = client.get('/api/courses/?cursor=abc', format='json')
+    assert api_response.status_code == 400
+    api_response = client.get(
+        '/api/courses/?cursor=WyJhYmMiLCAiMSJd',
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+    # Fail - cursor with missing values
+    api_response = client.get(
+        '/api/courses/?cursor=W251bGwsIG51bGxd',
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'Invalid cursor'
+
+
+def test_estimated_count(
+    sample_course,
+    sample_courses,
+    settings,
+    django_assert_num_queries
+):
+    '''Test that large listings are counted from estimates'''
+
+    sample_courses(5)
+    Course.objects.filter(title='Course 1').update(is_draft=False)
+
+    # Exact count below threshold
+    assert estimate_count(Course.objects.all()) == 5
+
+    settings.ESTIMATED_COUNT_THRESHOLD = 3
+
+    # Unfiltered table estimated from database statistics
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    sample_course(index=6)
+    sample_course(index=7)
+    assert estimate_count(Course.objects.all()) == 5
+
+    # Filtered listing counted once and then cached
+    queryset = Course.objects.filter(is_draft=True)
+    assert estimate_count(queryset) == 6
+    sample_course(index=10)
+    with django_assert_num_queries(0):
+        assert estimate_count(queryset) == 6
+
+    # Cached counts below threshold are counted again
+    assert estimate_count(Course.objects.filter(is_draft=False)) == 1
+    Course.objects.filter(title='Course 2').update(is_draft=False)
+    assert estimate_count(Course.objects.filter(is_draft=False)) == 2
+
+
+def test_admin_changelist_estimated_count(sample_courses, test_user):
+    '''Test that admin changelists use the estimated count paginator'''
+
+    client = APIClient()
+
+    sample_courses(3)
+    user1 = test_user(is_staff=True)
+    user1.is_superuser = True
+    user1.is_active = True
+    user1.save()
+    client.force_login(user1)
+
+    for model in (Course, CourseStudentRegistration, User, VideoContent):
+        model_admin = admin.site._registry[model]
+        assert model_admin.paginator is EstimatedCountPaginator
+        assert model_admin.show_full_result_count == False
+
+    response = client.get('/admin/courses/course/')
+    assert response.status_code == 200
+    assert response.context['cl'].result_count == 3
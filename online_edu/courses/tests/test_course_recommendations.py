@@ -0,0 +1,117 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseRecommendation, CourseSlugHistory
+from courses.recommendations import refresh_recommendations
+from registration.models import CourseStudentRegistration
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user
+
+pytestmark = pytest.mark.django_db
+
+
+def register(user, courses):
+    '''Register a user for courses'''
+    for course in courses:
+        CourseStudentRegistration.objects.create(user=user, course=course)
+
+
+def recommendations_of(course):
+    '''Return recommended course ids and scores of a course'''
+    return [
+        (x.recommended_course_id, round(x.score, 4))
+        for x in CourseRecommendation.objects.filter(
+            course=course
+        ).order_by('rank')
+    ]
+
+
+def test_course_recommendations(sample_courses, test_user):
+    '''Test cosine similarity of courses from co-enrollment'''
+
+    courses = sample_courses(4)
+    users = [test_user(username=f'user{index}@gmail.com') for index in range(4)]
+    register(users[0], [courses[0], courses[1]])
+    register(users[1], [courses[0], courses[1], courses[2]])
+    register(users[2], [courses[0], courses[2]])
+    register(users[3], [courses[3]])
+
+    assert refresh_recommendations(full=True) == 4
+
+    assert recommendations_of(courses[0]) == \
+        [(courses[1].id, 0.8165), (courses[2].id, 0.8165)]
+    assert recommendations_of(courses[1]) == \
+        [(courses[0].id, 0.8165), (courses[2].id, 0.5)]
+    assert recommendations_of(courses[3]) == []
+
+    # Number of recommendations per course is limited
+    refresh_recommendations(top_k=1, full=True)
+    assert recommendations_of(courses[1]) == [(courses[0].id, 0.8165)]
+
+
+def test_incremental_refresh(sample_courses, test_user):
+    '''Test that only courses sharing students with changed courses are refreshed'''
+
+    courses = sample_courses(5)
+    users = [test_user(username=f'user{index}@gmail.com') for index in range(3)]
+    register(users[0], [courses[0], courses[1]])
+    register(users[1], [courses[3]])
+    call_command('refresh_course_recommendations', '--full')
+    first_computed_at = CourseRecommendation.objects.get(
+        course=courses[0]
+    ).computed_at
+
+    # Nothing to do without new registrations
+    assert refresh_recommendations() == 0
+
+    register(users[2], [courses[3], courses[4]])
+    assert refresh_recommendations() == 2
+    assert recommendations_of(courses[3]) == [(courses[4].id, 0.7071)]
+    assert recommendations_of(courses[4]) == [(courses[3].id, 0.7071)]
+    assert CourseRecommendation.objects.get(
+        course=courses[0]
+    ).computed_at == first_computed_at
+
+
+def test_course_recommendation_endpoint(
+    sample_courses,
+    test_user,
+    django_assert_num_queries
+):
+    '''Test that recommendations are served with two queries'''
+
+    client = APIClient()
+
+    courses = sample_courses(3)
+    user1 = test_user()
+    register(user1, courses)
+    refresh_recommendations(full=True)
+    Course.objects.filter(
+        id__in=[courses[0].id, courses[1].id]
+    ).update(is_draft=False)
+    CourseSlugHistory.objects.load_redirects()
+
+    # Draft courses are not recommended
+    with django_assert_num_queries(2):
+        api_response = client.get(
+            f'/api/courses/{courses[0].slug}/recommendations',
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert [x['title'] for x in api_response.data] == [courses[1].title]
+
+    # Fail - draft course
+    api_response = client.get(
+        f'/api/courses/{courses[2].slug}/recommendations',
+        format='json'
+    )
+    assert api_response.status_code == 404
+
+    # Fail - course does not exist
+    api_response = client.get(
+        '/api/courses/no-such-course/recommendations',
+        format='json'
+    )
+    assert api_response.status_code == 404
+    assert api_response.data['detail'] == 'Course not found'
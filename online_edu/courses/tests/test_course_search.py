@@ -0,0 +1,109 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from courses.search import SEARCH_TABLE
+from .fixtures import sample_course
+
+pytestmark = pytest.mark.django_db
+
+
+def publish(course):
+    course.is_draft = False
+    course.save()
+    return course
+
+
+def test_course_search_ranking(sample_course):
+    '''Test that search returns published courses best match first'''
+
+    course1 = publish(sample_course(
+        title='Power electronics',
+        description='Converters and inverters'
+    ))
+    course2 = publish(sample_course(
+        title='Python basics',
+        description='Programming for power users'
+    ))
+    sample_course(title='Power systems draft', description='Draft')
+
+    # Title match ranks above description match, draft not found
+    courses = Course.objects.search_courses('power')
+    assert courses == [course1, course2]
+
+    # Prefix match of last word
+    courses = Course.objects.search_courses('conv')
+    assert courses == [course1]
+
+    # Symbols in search text do not break the query
+    courses = Course.objects.search_courses('"power" (')
+    assert courses == [course1, course2]
+    assert Course.objects.search_courses('*:') == []
+
+    # Deleted and archived courses are removed from results
+    course1.is_archived = True
+    course1.save()
+    assert Course.objects.search_courses('power') == [course2]
+    course2.delete()
+    assert Course.objects.search_courses('power') == []
+
+
+def test_course_search_api(sample_course, django_assert_num_queries):
+    '''Test course search endpoint with translated content'''
+
+    client = APIClient()
+
+    course1 = sample_course(title='Electric machines')
+    course1.title_de = 'Elektrische Maschinen'
+    publish(course1)
+    publish(sample_course(title='Control systems'))
+
+    # Searching the FTS table and fetching courses by primary key
+    with django_assert_num_queries(2) as captured:
+        api_response = client.get(
+            '/api/courses/search?q=machines',
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert [x['title'] for x in api_response.data] == ['Electric machines']
+    assert SEARCH_TABLE in captured.captured_queries[0]['sql']
+    assert '"courses_course"."id" IN' in captured.captured_queries[1]['sql']
+
+    # German content is searched in German
+    api_response = client.get(
+        '/api/courses/search?q=maschinen',
+        headers={'Accept-Language': 'de'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert [x['title'] for x in api_response.data] == ['Elektrische Maschinen']
+
+    # German is not searched for English requests
+    api_response = client.get(
+        '/api/courses/search?q=maschinen',
+        format='json'
+    )
+    assert api_response.data == []
+
+    # Fail - search text missing
+    api_response = client.get('/api/courses/search', format='json')
+    assert api_response.status_code == 400
+    api_response = client.get(
+        '/api/courses/search?q=control&limit=abc',
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+
+def test_rebuild_search_index(sample_course):
+    '''Test that the search index can be rebuilt'''
+
+    publish(sample_course(title='Signals and systems'))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    assert Course.objects.search_courses('signals') == []
+
+    call_command('rebuild_course_search_index')
+    assert len(Course.objects.search_courses('signals')) == 1
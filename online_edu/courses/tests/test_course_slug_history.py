@@ -0,0 +1,103 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSlugHistory
+from courses.managers import SLUG_HISTORY_VERSION_KEY
+from .fixtures import sample_course, sample_courses
+
+pytestmark = pytest.mark.django_db
+
+
+def test_slug_history(sample_course):
+    '''Test that every slug of a course is recorded and old slugs resolve'''
+
+    course1 = sample_course()
+    assert list(
+        CourseSlugHistory.objects.values_list('slug', flat=True)
+    ) == ['course-1']
+    assert CourseSlugHistory.objects.get_redirect('course-1') is None
+
+    course1 = Course.objects.get(id=course1.id)
+    course1.slug = 'first-course'
+    course1.save()
+    # Saving without a slug change does not add to history
+    course1.subtitle = 'Subtitle'
+    course1.save()
+    assert list(
+        CourseSlugHistory.objects.order_by('id').values_list('slug', flat=True)
+    ) == ['course-1', 'first-course']
+    assert CourseSlugHistory.objects.get_redirect('course-1') == \
+        (course1.id, 'first-course')
+
+    # Retired slug resolves to the course in nested URLs
+    assert Course.objects.get_course_by_slug('course-1') == course1
+
+    # Creating a course with a new slug keeps the maps of retired slugs
+    version = CourseSlugHistory.objects.get_version()
+    course2 = sample_course(index=2)
+    assert cache.get(SLUG_HISTORY_VERSION_KEY) == version
+
+    # Slug taken by another course is not redirected
+    course2.slug = 'course-1'
+    course2.save()
+    assert CourseSlugHistory.objects.get_redirect('course-1') is None
+    assert Course.objects.get_course_by_slug('course-1') == course2
+    assert CourseSlugHistory.objects.get(slug='course-1').course == course2
+
+
+def test_slug_redirect_endpoint(sample_course, django_assert_num_queries):
+    '''Test that old course URLs of visible courses are redirected'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    course1.slug = 'first-course'
+    course1.save()
+
+    # Only the visibility of the course is queried
+    CourseSlugHistory.objects.get_redirect('course-1')
+    with django_assert_num_queries(1):
+        api_response = client.get('/api/courses/course-1', format='json')
+    assert api_response.status_code == 301
+    assert api_response['Location'] == '/api/courses/first-course'
+
+    api_response = client.get(api_response['Location'], format='json')
+    assert api_response.status_code == 200
+    assert api_response.data['title'] == 'Course 1'
+
+    # Map is reloaded when the cache is cleared
+    cache.clear()
+    with django_assert_num_queries(2):
+        api_response = client.get('/api/courses/course-1', format='json')
+    assert api_response.status_code == 301
+
+    api_response = client.get('/api/courses/no-such-course', format='json')
+    assert api_response.status_code == 404
+
+    # Fail - retired slug of a draft course
+    course1.is_draft = True
+    course1.save()
+    api_response = client.get('/api/courses/course-1', format='json')
+    assert api_response.status_code == 404
+
+
+def test_reserved_slugs(sample_course):
+    '''Test that courses do not get slugs of collection endpoints'''
+
+    client = APIClient()
+
+    course1 = sample_course(title='Trending')
+    course1.is_draft = False
+    course1.save()
+    assert course1.slug == 'trending-course'
+
+    api_response = client.get('/api/courses/trending-course', format='json')
+    assert api_response.status_code == 200
+    assert api_response.data['title'] == 'Trending'
+
+    course1.slug = 'search'
+    course1.save()
+    assert course1.slug == 'search-course'
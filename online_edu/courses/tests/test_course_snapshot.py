@@ -0,0 +1,204 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSnapshot
+from lectures.models import Lecture
+from registration.models import CourseStudentRegistration
+from .fixtures import sample_course
+from user_auth.tests.fixtures import test_user, access_token
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def publish_course(client, course, token):
+    '''Publish a course through the publish endpoint'''
+    return client.patch(
+        f'/api/courses/{course.slug}/publish',
+        {
+            'is_draft': 'False'
+        },
+        headers={
+            'Authorization': f'Bearer {token}'
+        },
+        format='json'
+    )
+
+
+def test_snapshot_built_on_publish(
+    sample_course,
+    test_user,
+    access_token,
+    test_lectures,
+    test_video
+):
+    '''Test that publishing a course builds its snapshot in every language'''
+
+    client = APIClient()
+
+    user1 = test_user(is_staff=True)
+    user1.is_active = True
+    user1.save()
+    course1 = sample_course()
+    course1.title_de = 'Kurs 1'
+    course1.save()
+    course1.add_instructor(user1)
+    lectures = test_lectures(course1, 2)
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lectures[1].id, video1)
+
+    # Draft courses have no snapshot
+    assert CourseSnapshot.objects.count() == 0
+
+    api_response = publish_course(client, course1, access_token(user1, 60))
+    assert api_response.status_code == 200
+
+    snapshot = CourseSnapshot.objects.get(course=course1)
+    assert set(snapshot.documents.keys()) == {'en', 'de'}
+    assert snapshot.documents['en']['title'] == 'Course 1'
+    assert snapshot.documents['de']['title'] == 'Kurs 1'
+    document_lectures = snapshot.documents['en']['lectures']
+    assert [x['title'] for x in document_lectures] == \
+        ['Lecture 1', 'Lecture 2']
+    assert document_lectures[0]['videos'] == []
+    assert document_lectures[1]['videos'][0]['name'] == video1.name
+
+    clean_test_media()
+
+
+def test_snapshot_incremental_updates(
+    sample_course,
+    test_lectures,
+    test_lecture,
+    test_video
+):
+    '''Test that lecture and video changes update the snapshot'''
+
+    course1 = sample_course()
+    lectures = test_lectures(course1, 2)
+    course1.is_draft = False
+    course1.save()
+    CourseSnapshot.objects.build_snapshot(course1)
+
+    def snapshot_lectures():
+        return CourseSnapshot.objects.get(
+            course=course1
+        ).documents['en']['lectures']
+
+    # Lecture updated
+    lectures[0].title = 'Lecture A'
+    lectures[0].save()
+    assert [x['title'] for x in snapshot_lectures()] == \
+        ['Lecture A', 'Lecture 2']
+
+    # Lecture added
+    test_lecture(course=course1, index=3)
+    assert [x['title'] for x in snapshot_lectures()] == \
+        ['Lecture A', 'Lecture 2', 'Lecture 3']
+
+    # Video added to a lecture and renamed
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lectures[1].id, video1)
+    assert snapshot_lectures()[1]['videos'][0]['name'] == video1.name
+    video1.name = 'New video name'
+    video1.save()
+    assert snapshot_lectures()[1]['videos'][0]['name'] == 'New video name'
+
+    # Video deleted
+    video1.delete()
+    assert snapshot_lectures()[1]['videos'] == []
+
+    # Lecture moved
+    Lecture.objects.move_to(lectures[0], 3)
+    assert [(x['title'], x['seq_no']) for x in snapshot_lectures()] == \
+        [('Lecture 2', 1), ('Lecture 3', 2), ('Lecture A', 3)]
+
+    # Lecture deleted
+    lectures[0].delete()
+    assert [(x['title'], x['seq_no']) for x in snapshot_lectures()] == \
+        [('Lecture 2', 1), ('Lecture 3', 2)]
+
+    # Lectures of draft courses do not touch the snapshot
+    course1.is_draft = True
+    course1.save()
+    lectures[1].title = 'Lecture B'
+    lectures[1].save()
+    assert [x['title'] for x in snapshot_lectures()] == \
+        ['Lecture 2', 'Lecture 3']
+
+    clean_test_media()
+
+
+def test_course_contents_endpoint(
+    sample_course,
+    test_user,
+    access_token,
+    test_lectures,
+    django_assert_max_num_queries
+):
+    '''Test that registered students read the course snapshot'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    test_lectures(course1, 3)
+    user1 = test_user()
+    user2 = test_user(username='someuser@gmail.com')
+    for user in (user1, user2):
+        user.is_active = True
+        user.save()
+    token1 = access_token(user1, 60)
+    token2 = access_token(user2, 60)
+
+    # Fail - course not published
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/contents',
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 404
+
+    course1.is_draft = False
+    course1.save()
+    CourseSnapshot.objects.build_snapshot(course1)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+
+    # Fail - not logged in
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/contents',
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    # Fail - user not registered
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/contents',
+        headers={'Authorization': f'Bearer {token2}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    # Success - no lecture or video queries
+    with django_assert_max_num_queries(3) as captured:
+        api_response = client.get(
+            f'/api/courses/{course1.slug}/contents',
+            headers={'Authorization': f'Bearer {token1}'},
+            format='json'
+        )
+    assert api_response.status_code == 200
+    assert api_response.data['title'] == 'Course 1'
+    assert len(api_response.data['lectures']) == 3
+    for query in captured.captured_queries:
+        assert 'lectures_lecture' not in query['sql']
+        assert 'video_contents_videocontent' not in query['sql']
+
+    # Fail - archived course
+    Course.objects.filter(id=course1.id).update(is_archived=True)
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/contents',
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 404
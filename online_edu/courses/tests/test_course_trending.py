@@ -0,0 +1,140 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseTrend
+from registration.models import CourseStudentRegistration
+from .fixtures import sample_course, sample_courses
+from user_auth.tests.fixtures import test_user, access_token
+from lectures.tests.fixtures import test_lecture, test_lectures
+
+pytestmark = pytest.mark.django_db
+
+
+def test_trend_score_decay(sample_course):
+    '''Test that trending scores decay with half life of 72 hours'''
+
+    course1 = sample_course()
+    now = timezone.now()
+
+    CourseTrend.objects.record_event(course1.id, 'registration', when=now)
+    CourseTrend.objects.record_event(course1.id, 'registration', when=now)
+    trend = CourseTrend.objects.get(course=course1)
+    assert trend.score == pytest.approx(2.0)
+    assert trend.last_event_at == now
+
+    later = now + timedelta(hours=72)
+    CourseTrend.objects.record_event(course1.id, 'lecture_access', when=later)
+    trend = CourseTrend.objects.get(course=course1)
+    assert trend.score == pytest.approx(1.1)
+    assert trend.last_event_at == later
+
+
+def test_trending_order(sample_courses):
+    '''Test that courses are ordered by current score'''
+
+    courses = sample_courses(3)
+    now = timezone.now()
+
+    # 0.25 after two half lives
+    CourseTrend.objects.record_event(
+        courses[0].id,
+        'registration',
+        when=now - timedelta(hours=144)
+    )
+    CourseTrend.objects.record_event(courses[1].id, 'lecture_access', when=now)
+    CourseTrend.objects.record_event(courses[2].id, 'registration', when=now)
+
+    assert CourseTrend.objects.get_trending_courses() == []
+    Course.objects.update(is_draft=False)
+    assert CourseTrend.objects.get_trending_courses() == \
+        [courses[2], courses[0], courses[1]]
+    assert CourseTrend.objects.get_trending_courses(limit=1) == [courses[2]]
+
+
+def test_trending_endpoint(
+    sample_courses,
+    test_user,
+    django_assert_num_queries
+):
+    '''Test that registrations make a course trend and the list is cached'''
+
+    client = APIClient()
+
+    courses = sample_courses(3)
+    Course.objects.update(is_draft=False)
+    user1 = test_user()
+    user2 = test_user(username='someuser@gmail.com')
+    CourseStudentRegistration.objects.register_student(user1, courses[1])
+    CourseStudentRegistration.objects.register_student(user2, courses[1])
+    CourseStudentRegistration.objects.register_student(user1, courses[2])
+
+    with django_assert_num_queries(1):
+        api_response = client.get('/api/courses/trending', format='json')
+    assert api_response.status_code == 200
+    assert [x['title'] for x in api_response.data] == \
+        [courses[1].title, courses[2].title]
+
+    # Served from cache
+    with django_assert_num_queries(0):
+        api_response = client.get('/api/courses/trending', format='json')
+    assert len(api_response.data) == 2
+
+    api_response = client.get('/api/courses/trending?limit=1', format='json')
+    assert [x['title'] for x in api_response.data] == [courses[1].title]
+
+    # Fail - invalid limit
+    api_response = client.get('/api/courses/trending?limit=0', format='json')
+    assert api_response.status_code == 400
+
+
+def test_lecture_access_trend(
+    sample_course,
+    test_user,
+    access_token,
+    test_lectures
+):
+    '''Test that lecture access by a student adds to the trending score'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course1, 1)
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    CourseStudentRegistration.objects.register_student(user1, course1)
+
+    token = access_token(user1, 60)
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    trend = CourseTrend.objects.get(course=course1)
+    assert trend.score == pytest.approx(1.1)
+
+    # Repeated and not modified accesses are not counted
+    client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={'Authorization': f'Bearer {token}'},
+        format='json'
+    )
+    cache.delete(f'course-trend:access:{user1.id}:{lectures[0].id}')
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'If-None-Match': api_response['ETag']
+        },
+        format='json'
+    )
+    assert api_response.status_code == 304
+    assert CourseTrend.objects.get(course=course1).last_event_at == \
+        trend.last_event_at
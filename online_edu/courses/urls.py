@@ -1,6 +1,16 @@
 from django.urls import path, include
 
-from .views import CourseView
+from .views import CourseView, \
+    CourseCacheStatsView, \
+    CourseSearchView, \
+    CourseSnapshotView, \
+    CourseBulkUpdateView, \
+    CourseCloneView, \
+    CourseRecommendationView, \
+    CourseTrendingView, \
+    CourseFacetView, \
+    CourseUnarchiveView, \
+    CourseDashboardView
 
 app_name = 'courses'
 urlpatterns = [
@@ -9,11 +19,61 @@ urlpatterns = [
         CourseView.as_view(),
         name='create-course'
     ),
+    path(
+        'search',
+        CourseSearchView.as_view(),
+        name='search-courses'
+    ),
+    path(
+        'facets',
+        CourseFacetView.as_view(),
+        name='course-facets'
+    ),
+    path(
+        'trending',
+        CourseTrendingView.as_view(),
+        name='trending-courses'
+    ),
+    path(
+        'taught',
+        CourseDashboardView.as_view(),
+        name='taught-courses'
+    ),
+    path(
+        'bulk-update',
+        CourseBulkUpdateView.as_view(),
+        name='bulk-update-courses'
+    ),
+    path(
+        'cache-stats',
+        CourseCacheStatsView.as_view(),
+        name='cache-stats'
+    ),
     path(
         '<str:slug>/publish',
         CourseView.as_view(),
         name='publish-course'
     ),
+    path(
+        '<str:slug>/unarchive',
+        CourseUnarchiveView.as_view(),
+        name='unarchive-course'
+    ),
+    path(
+        '<str:slug>/clone',
+        CourseCloneView.as_view(),
+        name='clone-course'
+    ),
+    path(
+        '<str:slug>/recommendations',
+        CourseRecommendationView.as_view(),
+        name='course-recommendations'
+    ),
+    path(
+        '<str:slug>/contents',
+        CourseSnapshotView.as_view(),
+        name='course-contents'
+    ),
     path(
         '<str:slug>/lectures/',
         include('lectures.urls', namespace='lectures')
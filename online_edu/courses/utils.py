@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.utils import translation
+from modeltranslation.translator import translator
+from modeltranslation.utils import build_localized_fieldname
+
+
+def normalize_title(title):
+    '''
+    Return case folded title used for duplicate checks
+
+    Parameters
+    -------------
+    title : str
+
+    Returns
+    -------------
+    str or None
+        Title without surrounding spaces and case folded
+        or None if title is empty
+    '''
+    if not title:
+        return None
+    return title.strip().casefold()
+
+
+def normalized_title_field(language=None):
+    '''
+    Return name of normalized title column of a language
+
+    Parameters
+    -------------
+    language : str, optional
+        Language code. Default is the active language.
+
+    Returns
+    -------------
+    str
+        Column name like title_normalized_en
+    '''
+    if language is None:
+        language = translation.get_language()
+    if language not in dict(settings.LANGUAGES):
+        language = settings.LANGUAGE_CODE
+    return f'title_normalized_{language}'
+
+
+def get_field_values(instance, field_names):
+    '''
+    Return values of model fields including the
+    translation of translated fields in every language
+
+    Parameters
+    -------------
+    instance : Model instance
+    field_names : list
+        Names of model fields
+
+    Returns
+    -------------
+    dict
+        Field values by field name, for example title,
+        title_en and title_de for translated field title
+    '''
+    translated_fields = translator.get_options_for_model(
+        type(instance)
+    ).fields
+    values = {}
+    for field_name in field_names:
+        values[field_name] = getattr(instance, field_name)
+        if field_name in translated_fields:
+            for language, _language_name in settings.LANGUAGES:
+                localized_field_name = build_localized_fieldname(
+                    field_name,
+                    language
+                )
+                values[localized_field_name] = getattr(
+                    instance,
+                    localized_field_name
+                )
+    return values
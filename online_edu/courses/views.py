@@ -1,4 +1,10 @@
 import logging
+import math
+from hashlib import md5
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,11 +15,25 @@ from rest_framework.mixins import CreateModelMixin, \
 
 from user_auth.models import User
 from user_auth.views import UserAuthentication
-from .models import Course
-from .serializers import CourseSerializer
+from registration.models import CourseStudentRegistration
+from .models import Course, \
+    CourseSnapshot, \
+    CourseRecommendation, \
+    CourseTrend, \
+    ArchivedCourse, \
+    CourseSlugHistory, \
+    COURSE_CACHE_NAMESPACE, \
+    COURSE_COUNTER_FIELDS
+from .serializers import CourseSerializer, CourseDashboardSerializer
+from .pagination import CoursePagination
 from common.base_view import BaseAPIView
+from common.conditional_get import ConditionalGetMixin
 from common.error_definitions import DEFAULT_ERROR_RESPONSE, \
     CustomAPIError
+from common.cache_handling import build_cache_key, \
+    record_cache_access, \
+    get_cache_stats, \
+    get_cache_changed_at
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +46,8 @@ class CourseBaseView(BaseAPIView, UserAuthentication):
     -------------
     serializer_class : class
         CourseSerializer class
+    pagination_class : class
+        Keyset pagination of course list
     user_model : class
         User class
     lookup_field : str
@@ -38,6 +60,7 @@ class CourseBaseView(BaseAPIView, UserAuthentication):
     '''
 
     serializer_class = CourseSerializer
+    pagination_class = CoursePagination
     user_model = User
     lookup_field = 'slug'
 
@@ -65,6 +88,7 @@ class CourseBaseView(BaseAPIView, UserAuthentication):
 
 class CourseView(
     CourseBaseView,
+    ConditionalGetMixin,
     CreateModelMixin,
     ListModelMixin,
     RetrieveModelMixin,
@@ -77,6 +101,8 @@ class CourseView(
     -------------
     perform_create(serializer) : Saves serializer data to create new course
     perform_update(serializer) : Updates course with serializer data
+    fetch_course_data(request) : Returns course list or course data
+    fetch_cached_course_data(request) : Returns course list or course data from cache
     post(request) : Handles POST requests
     get(request) : Handles GET requests (list and detail)
     patch(request) : Handles PATCH requests (partial update of course)
@@ -108,6 +134,59 @@ class CourseView(
             f'Updating course {course.id} by user {self.request.user.id}'
         )
 
+    def fetch_course_data(self, request, *args, **kwargs):
+        '''
+        Return course list or course data
+
+        Parameters
+        --------------
+        request - dict
+
+        Returns
+        --------------
+        200 response with course list or course data
+        '''
+        if self.kwargs.get('slug', None):
+            return self.retrieve(request, *args, **kwargs)
+        return self.list(request, *args, **kwargs)
+
+    def fetch_cached_course_data(self, request, *args, **kwargs):
+        '''
+        Return course list or course data from cache.
+        Cache entries are per language as course content
+        is translated and are invalidated when any course
+        is saved or deleted. The ETag is part of the key so
+        that entries of a course expire when its counters change.
+
+        Parameters
+        --------------
+        request - dict
+
+        Returns
+        --------------
+        200 response with course list or course data
+        '''
+        cache_key = build_cache_key(
+            COURSE_CACHE_NAMESPACE,
+            translation.get_language(),
+            md5(request.build_absolute_uri().encode('utf-8')).hexdigest(),
+            self.etag
+        )
+        data = cache.get(cache_key)
+        record_cache_access(COURSE_CACHE_NAMESPACE, data is not None)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = self.fetch_course_data(request, *args, **kwargs)
+        cache.set(
+            cache_key,
+            response.data,
+            timeout=settings.COURSE_CACHE_TIMEOUT
+        )
+        response['X-Cache'] = 'MISS'
+        return response
+
     def post(self, request, *args, **kwargs):
         '''
         Create a new course - POST request
@@ -140,12 +219,23 @@ class CourseView(
         '''
         Fetch all courses or specific course by slug
 
+        Responses have ETag and Last-Modified headers and a 304
+        response is returned if the data has not changed since.
+
+        The course list is paginated with an opaque cursor.
+        Query parameters of the course list:
+        - page_size : number of courses in a page
+        - cursor : cursor from the "next" link of the previous page
+        - paginate : "false" to fetch all courses without pagination
+
         Parameters
         -------------
         request - dict
 
         Raises
         -------------
+        400 error
+            If page size or cursor in course list is invalid
         404 error
             If slug is for a course that does not exist or
             if non-admin user is accessing unpublished course
@@ -153,9 +243,30 @@ class CourseView(
         Returns
         -------------
         200 response with course list or course data
+        301 response to current course URL if slug was changed
+        304 response if course list or course data has not changed
         '''
         slug = self.kwargs.get('slug', None)
         self.authenticate(request, open_endpoint=True)
+        if slug:
+            redirect = CourseSlugHistory.objects.get_redirect(slug)
+            if redirect is not None:
+                # Retired slugs do not reveal unpublished courses
+                if not self.get_queryset().filter(id=redirect[0]).exists():
+                    raise CustomAPIError(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=_('Course not found from URL')
+                    )
+                logger.info(f'Course slug {slug} redirected to {redirect[1]}')
+                return Response(
+                    status=status.HTTP_301_MOVED_PERMANENTLY,
+                    headers={
+                        'Location': reverse(
+                            'courses:fetch-course',
+                            kwargs={'slug': redirect[1]}
+                        )
+                    }
+                )
         user_id = None
         if self.request.user is not None:
             user_id = self.request.user.id
@@ -163,12 +274,32 @@ class CourseView(
             logger.info(
                 f'Course with slug {slug} fetched by user {user_id}'
             )
-            return self.retrieve(request, *args, *kwargs)
         else:
             logger.info(
                 f'Course list fetched by user {user_id}'
             )
-            return self.list(request, *args, **kwargs)
+        validator_queryset = self.get_queryset()
+        changed_at = None
+        if slug:
+            validator_queryset = validator_queryset.filter(slug=slug)
+        else:
+            # Courses deleted, archived or unpublished leave the list
+            changed_at = get_cache_changed_at(COURSE_CACHE_NAMESPACE)
+        # Counters are changed without the modification time
+        not_modified = self.check_not_modified(
+            request,
+            validator_queryset,
+            sum_fields=COURSE_COUNTER_FIELDS,
+            changed_at=changed_at
+        )
+        if not_modified is not None:
+            return not_modified
+        # Admins can see draft and archived courses
+        if self.request.user is not None and self.request.user.is_staff:
+            response = self.fetch_course_data(request, *args, **kwargs)
+        else:
+            response = self.fetch_cached_course_data(request, *args, **kwargs)
+        return self.set_validator_headers(response)
 
     def patch(self, request, *args, **kwargs):
         '''
@@ -191,3 +322,524 @@ class CourseView(
         '''
         self.authenticate(request)
         return self.partial_update(request, *args, **kwargs)
+
+
+class CourseCacheStatsView(BaseAPIView, UserAuthentication):
+    '''
+    Hit and miss counts of the course cache
+
+    Methods
+    -------------
+    get(request) : Returns cache statistics
+    '''
+
+    user_model = User
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return hits, misses and hit ratio of the course cache
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        403 error
+            If user is not an admin
+
+        Returns
+        -------------
+        200 response with cache statistics
+        '''
+        self.authenticate(request)
+        return Response(get_cache_stats(COURSE_CACHE_NAMESPACE))
+
+
+class CourseSearchView(CourseBaseView):
+    '''
+    Full text search of published courses
+
+    Methods
+    -------------
+    get(request) : Returns courses matching search text
+    '''
+
+    max_results = 100
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Search published courses with query parameters:
+        - q : search text
+        - limit : maximum number of courses (default 20, maximum 100)
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If search text is missing
+            If limit is not a positive number
+
+        Returns
+        -------------
+        200 response with list of courses with best match first
+        '''
+        self.authenticate(request, open_endpoint=True)
+        search_text = request.query_params.get('q', '').strip()
+        if not search_text:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Search text is required')
+            )
+        try:
+            limit = int(request.query_params.get('limit', 20))
+            if limit <= 0:
+                raise ValueError
+        except ValueError:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Limit must be a positive number')
+            )
+        courses = Course.objects.search_courses(
+            search_text,
+            limit=min(limit, self.max_results)
+        )
+        logger.info(f'Course search returned {len(courses)} courses')
+        return Response(self.get_serializer(courses, many=True).data)
+
+
+class CourseSnapshotView(BaseAPIView, UserAuthentication):
+    '''
+    Contents of a published course with its lectures and videos
+    served from the course snapshot
+
+    Methods
+    -------------
+    get(request) : Returns course document in the active language
+    '''
+
+    user_model = User
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return precomputed course document with ordered
+        lectures and their videos
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        403 error
+            If user is not logged in
+            If user is not a student, an instructor or an admin
+        404 error
+            If course is not published or archived
+
+        Returns
+        -------------
+        200 response with course document
+        '''
+        user = self.authenticate(request, check_admin=False)
+        snapshot = CourseSnapshot.objects.get_published_snapshot(
+            self.kwargs.get('slug', None)
+        )
+        course = snapshot.course
+        if not user.is_staff and \
+                not CourseStudentRegistration.objects.is_student_registered(
+                    user=user,
+                    course=course
+                ) and \
+                not course.check_user_is_instructor(user):
+            logger.critical(
+                f'User {user.id} not registered trying to access contents of course {course.id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_('Must be registered for the course to access its contents')
+            )
+        logger.info(
+            f'Contents of course {course.id} fetched by user {user.id}'
+        )
+        return Response(snapshot.get_document())
+
+
+class CourseBulkUpdateView(BaseAPIView, UserAuthentication):
+    '''
+    Update several courses of an instructor in one request
+
+    Methods
+    -------------
+    patch(request) : Updates courses and returns result of every course
+    '''
+
+    user_model = User
+    max_items = 100
+
+    def patch(self, request, *args, **kwargs):
+        '''
+        Update courses from a list of items with course slug
+        and the fields to be changed, for example
+        [{"slug": "course-1", "fields": {"price": 9.99}}]
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If request body is not a list of items
+            If there are more than 100 items
+        403 error
+            If user is not an admin
+
+        Returns
+        -------------
+        200 response with list of results, each with slug, status
+        code and course data or error detail
+        '''
+        user = self.authenticate(request)
+        items = request.data
+        if not isinstance(items, list) or not items or \
+                not all(isinstance(item, dict) for item in items):
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('List of courses to be updated is required')
+            )
+        if len(items) > self.max_items:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Too many courses in one request')
+            )
+        return Response(Course.objects.bulk_update_courses(user, items))
+
+
+class CourseCloneView(CourseBaseView):
+    '''
+    Copy a course with its lectures for a new cohort
+
+    Methods
+    -------------
+    post(request) : Creates a copy of a course
+    '''
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Create a draft copy of a course with its lectures and
+        the videos of the lectures. Request body has the title
+        of the new course.
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If title is missing or not unique
+        403 error
+            If user is not an instructor of the course
+        404 error
+            If course is not found
+
+        Returns
+        -------------
+        201 response with data of the new course
+        '''
+        user = self.authenticate(request)
+        course = self.get_object()
+        if not course.check_user_is_instructor(user):
+            logger.critical(
+                f'User {user.id} not instructor attempting to copy course {course.id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_('Only an instructor of a course can copy a course')
+            )
+        new_course = Course.objects.clone_course(
+            course,
+            request.data.get('title', None)
+        )
+        return Response(
+            self.get_serializer(new_course).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class CourseRecommendationView(CourseBaseView):
+    '''
+    Courses taken by students of a course
+
+    Methods
+    -------------
+    get(request) : Returns recommended courses
+    '''
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return published courses taken by students of a course
+        from precomputed recommendations
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        404 error
+            If course is not found or is not published or archived
+
+        Returns
+        -------------
+        200 response with list of courses with best match first
+        '''
+        self.authenticate(request, open_endpoint=True)
+        course = Course.objects.get_course_by_slug(
+            self.kwargs.get('slug', None),
+            admin_only=False
+        )
+        courses = CourseRecommendation.objects.get_recommended_courses(course)
+        return Response(self.get_serializer(courses, many=True).data)
+
+
+class CourseTrendingView(CourseBaseView):
+    '''
+    Published courses with most recent registrations and lecture accesses
+
+    Methods
+    -------------
+    get(request) : Returns trending courses
+    '''
+
+    max_results = 50
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return trending courses with query parameter:
+        - limit : maximum number of courses (default 10, maximum 50)
+
+        The list is cached for every language and limit.
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If limit is not a positive number
+
+        Returns
+        -------------
+        200 response with list of courses with highest score first
+        '''
+        self.authenticate(request, open_endpoint=True)
+        try:
+            limit = int(request.query_params.get('limit', 10))
+            if limit <= 0:
+                raise ValueError
+        except ValueError:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Limit must be a positive number')
+            )
+        limit = min(limit, self.max_results)
+        cache_key = build_cache_key(
+            COURSE_CACHE_NAMESPACE,
+            'trending',
+            translation.get_language(),
+            limit
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_serializer(
+                CourseTrend.objects.get_trending_courses(limit=limit),
+                many=True
+            ).data
+            cache.set(
+                cache_key,
+                data,
+                timeout=settings.TRENDING_CACHE_TIMEOUT
+            )
+        return Response(data)
+
+
+class CourseFacetView(CourseBaseView):
+    '''
+    Facet counts of the course catalog
+
+    Methods
+    -------------
+    get_filters(request) : Returns facet filters from query parameters
+    get(request) : Returns facet counts
+    '''
+
+    def get_filters(self, request):
+        '''
+        Return facet filters from query parameters
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If a filter value is not valid
+
+        Returns
+        -------------
+        dict
+        '''
+        params = request.query_params
+        filters = {}
+        try:
+            if 'is_free' in params:
+                is_free = params['is_free'].lower()
+                if is_free not in ('true', 'false'):
+                    raise ValueError
+                filters['is_free'] = is_free == 'true'
+            if 'instructor' in params:
+                filters['instructor'] = int(params['instructor'])
+            for param in ('price_min', 'price_max'):
+                if param in params:
+                    filters[param] = float(params[param])
+                    if not math.isfinite(filters[param]):
+                        raise ValueError
+        except ValueError:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Invalid filter')
+            )
+        return filters
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return number of published courses in total, free and paid,
+        in price buckets, of every instructor and in every language.
+        Query parameters narrow the courses counted:
+        - q : search text
+        - is_free : true or false
+        - instructor : user id of instructor
+        - price_min, price_max : price range
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If a filter value is not valid
+
+        Returns
+        -------------
+        200 response with facet counts
+        '''
+        self.authenticate(request, open_endpoint=True)
+        facets = Course.objects.get_facets(
+            search_text=request.query_params.get('q', '').strip() or None,
+            filters=self.get_filters(request)
+        )
+        return Response(facets)
+
+
+class CourseUnarchiveView(CourseBaseView):
+    '''
+    Bring back a course from cold storage
+
+    Methods
+    -------------
+    post(request) : Restores and unarchives a course
+    '''
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Move a course with its lectures and registrations back
+        from cold storage and unarchive it
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        400 error
+            If another course has taken the title of the course
+        403 error
+            If user is not an instructor of the course
+        404 error
+            If course is not in cold storage
+
+        Returns
+        -------------
+        200 response with course data
+        '''
+        user = self.authenticate(request)
+        archived_course = ArchivedCourse.objects.get_by_slug(
+            self.kwargs.get('slug', None)
+        )
+        if user.id not in archived_course.data['instructors']:
+            logger.critical(
+                f'User {user.id} not instructor attempting to unarchive course {archived_course.course_id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_('Only an instructor of a course can update a course')
+            )
+        course = ArchivedCourse.objects.restore(archived_course)
+        return Response(self.get_serializer(course).data)
+
+
+class CourseDashboardView(BaseAPIView, UserAuthentication):
+    '''
+    Courses taught by the logged in instructor with their statistics
+
+    Attributes
+    -------------
+    serializer_class : class
+        CourseDashboardSerializer class
+    user_model : class
+        User class
+
+    Methods
+    -------------
+    get(request) : Returns courses of the instructor
+    '''
+
+    serializer_class = CourseDashboardSerializer
+    user_model = User
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Return draft, published and archived courses of the instructor
+        with the number of lectures, students and videos, most recently
+        updated first. The query count does not depend on the number
+        of courses.
+
+        Parameters
+        -------------
+        request - dict
+
+        Raises
+        -------------
+        403 error
+            If user is not an admin
+
+        Returns
+        -------------
+        200 response with list of courses
+        '''
+        user = self.authenticate(request)
+        logger.info(f'Dashboard of courses fetched by user {user.id}')
+        return Response(
+            self.get_serializer(
+                Course.objects.get_taught_courses(user),
+                many=True
+            ).data
+        )
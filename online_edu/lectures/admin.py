@@ -1,10 +1,11 @@
 from django.contrib import admin
 from modeltranslation.admin import TranslationAdmin
 
-from .models import Lecture
+from common.admin import EstimatedCountAdminMixin
+from .models import Lecture, LectureProgress
 
 
-class LectureAdmin(TranslationAdmin):
+class LectureAdmin(EstimatedCountAdminMixin, TranslationAdmin):
     '''
     Translation of Lecture model for admin
     '''
@@ -12,3 +13,13 @@ class LectureAdmin(TranslationAdmin):
 
 
 admin.site.register(Lecture, LectureAdmin)
+
+
+class LectureProgressAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    '''
+    Progress of students in lectures for admin
+    '''
+    pass
+
+
+admin.site.register(LectureProgress, LectureProgressAdmin)
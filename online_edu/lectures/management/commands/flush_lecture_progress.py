@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.cache_handling import is_cache_shared
+from lectures.models import LectureProgress
+
+
+class Command(BaseCommand):
+    '''
+    Write progress of students buffered in the cache to the database.
+    Progress is also written by the first report after the flush
+    interval, this is for periodic runs and before shutdowns.
+    Progress is only buffered in a cache shared by all processes,
+    the command fails with a process local cache whose buffer it
+    cannot see.
+    '''
+
+    help = 'Write buffered lecture progress to the database'
+
+    def handle(self, *args, **options):
+        if not is_cache_shared():
+            raise CommandError(
+                'Buffered lecture progress needs a cache shared by all '
+                'processes, progress is written directly with this cache'
+            )
+        no_of_videos = LectureProgress.objects.flush_progress()
+        self.stdout.write(f'Flushed progress of {no_of_videos} videos')
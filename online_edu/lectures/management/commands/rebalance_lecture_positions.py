@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from lectures.managers import LECTURE_POSITION_MIN_GAP
+from lectures.models import Lecture
+
+
+class Command(BaseCommand):
+    '''
+    Spread positions of lectures of courses where lectures
+    have been inserted or moved close together.
+    '''
+
+    help = 'Rebalance positions of lectures in crowded courses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-gap',
+            type=int,
+            default=LECTURE_POSITION_MIN_GAP,
+            help='Smallest distance between positions of consecutive lectures'
+        )
+
+    def handle(self, *args, **options):
+        course_ids = Lecture.objects.get_crowded_course_ids(
+            min_gap=options['min_gap']
+        )
+        for course_id in course_ids:
+            Lecture.objects.rebalance_positions(course_id)
+        self.stdout.write(
+            f'Rebalanced lecture positions of {len(course_ids)} courses'
+        )
@@ -1,12 +1,33 @@
 import logging
-from django.db import models
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
+from django.db.models import Q, F, Count, Max, Case, When, Value, \
+    OuterRef, Subquery, Exists
+from django.db.models.functions import Lower
+from django.utils import timezone, translation
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 
 from common.error_definitions import CustomAPIError
+from common.cache_handling import bump_cache_version, build_cache_key, \
+    get_cache_changed_at, \
+    is_cache_shared
 
 logger = logging.getLogger(__name__)
 
+# Attempts to add lectures when concurrent lectures take their positions
+LECTURE_CREATE_ATTEMPTS = 3
+# Distance between positions of consecutive lectures after rebalancing
+LECTURE_POSITION_GAP = 1024
+# Courses with lectures closer than this are rebalanced periodically
+LECTURE_POSITION_MIN_GAP = 16
+SYLLABUS_CACHE_NAMESPACE = 'course-syllabus'
+PROGRESS_BUFFER_NAMESPACE = 'lecture-progress'
+# Flush intervals after which a queue marker and a missing queue slot expire
+PROGRESS_QUEUE_INTERVALS = 10
+
 
 class LectureManager(models.Manager):
     '''
@@ -14,69 +35,577 @@ class LectureManager(models.Manager):
 
     Methods
     -------------
-    check_title_duplicate(course, title, exclude_lecture=None):
-        Checks if a lecture with title already exists in the course
+    check_title_duplicate(course_id, lectures):
+        Checks if other lectures of a course have the same titles
+    bulk_create_lectures(course, items):
+        Adds several lectures at the end of a course
+    get_access_annotations(user, course_ref):
+        Returns registration and instructor annotations of a user
+    get_lecture_access(slug, user=None, lecture_id=None, admin_only=True):
+        Returns course and lecture with access of a user in one query
+    with_seq_no(queryset=None):
+        Annotates lectures with their sequence number in the course
+    get_seq_no(lecture):
+        Returns sequence number of a lecture in the course
+    get_next_position(course_id):
+        Returns position of a lecture added at the end of a course
+    set_positions(course_id, lecture_ids, **fields):
+        Writes positions of all lectures of a course in one update
+    rebalance_positions(course_id):
+        Spreads positions of lectures of a course evenly
+    reorder_lectures(course, lecture_ids):
+        Puts all lectures of a course in a new order
+    get_crowded_course_ids(min_gap=LECTURE_POSITION_MIN_GAP):
+        Returns courses with lectures positioned close together
+    move_to(lecture, seq_no):
+        Moves a lecture to a sequence number in its course
     change_lecture_order(lecture, direction='up'):
         Moves a lecture in the list of lectures for a course
     add_video_to_lecture(id, video):
         Adds a video to a lecture
+    get_syllabus(course):
+        Returns lectures of a course with their videos
+    get_syllabus_cache_key(course_id):
+        Returns cache key of the syllabus of a course
+    invalidate_syllabus(course_id):
+        Removes cached syllabus of a course
+    get_syllabus_changed_at(course_id):
+        Returns time of the last change of the lectures of a course
     '''
 
-    def check_title_duplicate(self, course, title, exclude_lecture=None):
+    def check_title_duplicate(self, course_id, lectures):
+        '''
+        Check if other lectures of a course have the same title as
+        any of the lectures in any language (case insensitive) with
+        one query. Titles are kept unique by the database, so this is
+        only used to find out why saving lectures failed.
+
+        Parameters
+        ---------------
+        course_id : int
+        lectures : list
+            Lecture model instances being saved
+
+        Raises
+        ---------------
+        400 error:
+            If a title of a lecture is a duplicate
+
+        Returns
+        ---------------
+        boolean
+            False if the lecture titles are not duplicate
+        '''
+        # Titles are lowered by the database as in the unique indexes,
+        # some databases (e.g. SQLite) only lower ASCII letters
+        duplicate_filter = Q()
+        for language, _language_name in settings.LANGUAGES:
+            titles = {
+                getattr(lecture, f'title_{language}', None)
+                for lecture in lectures
+            } - {None}
+            if titles:
+                duplicate_filter |= Q(**{
+                    f'lower_title_{language}__in': [
+                        Lower(Value(title)) for title in titles
+                    ]
+                })
+        if not duplicate_filter:
+            return False
+        duplicate_titles = list(
+            self.get_queryset().filter(course_id=course_id).exclude(
+                pk__in=[lecture.pk for lecture in lectures if lecture.pk]
+            ).annotate(**{
+                f'lower_title_{language}': Lower(f'title_{language}')
+                for language, _language_name in settings.LANGUAGES
+            }).filter(duplicate_filter).values_list('title', flat=True)
+        )
+        if not duplicate_titles:
+            return False
+        logger.error(
+            f'Lecture titles {duplicate_titles} are duplicate in course {course_id}'
+        )
+        raise CustomAPIError(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_('Lecture with the same title exists in the course')
+        )
+
+    def bulk_create_lectures(self, course, items):
         '''
-        Check if course with same title exists in course
+        Add several lectures at the end of a course in one transaction.
+        Positions are assigned in memory after the last lecture and the
+        lectures are inserted with a single bulk insert. Titles are kept
+        unique in a course by the database and the lectures of the
+        course are only searched for duplicate titles if the insert
+        fails. Course row is locked so that lectures added in bulk at
+        the same time do not take the same positions.
 
         Parameters
         ---------------
         course : Course model instance
-            The course for which the check is being performed
-        title : str
-            The title being checked for duplicate
-        exclude_lecture : Lecture model instance
-            If a lecture should be excluded while checking for duplicate.
-            Default is None.
-            Used during updating a lecture, when a lecture's title should
-            not be checked against itself.
+        items : list
+            Dictionaries with validated title and description of lectures
 
         Raises
         ---------------
         400 error:
-            If course instance is missing
-            If title string is missing
-            If the proposed title is a duplicate
+            If a title is repeated in items
+            If a title is a duplicate of a lecture in the course
 
         Returns
         ---------------
-        boolean or APIException
-            Returns False is course is not duplicate or throws APIException
+        List of new lectures in the order of items
         '''
-        if course is None:
+        titles = [item['title'].lower() for item in items]
+        if len(titles) != len(set(titles)):
+            logger.error(
+                f'Repeated lecture titles in bulk create for course {course.title}'
+            )
             raise CustomAPIError(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=_('Course must be specified to verify title')
+                detail=_('Lecture titles must be different from each other')
+            )
+        lectures = [
+            self.model(
+                course=course,
+                title=item['title'],
+                description=item.get('description', None)
+            )
+            for item in items
+        ]
+        for attempt in range(LECTURE_CREATE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    list(
+                        apps.get_model('courses', 'Course').objects.filter(
+                            pk=course.id
+                        ).select_for_update().values_list('pk', flat=True)
+                    )
+                    first_position = self.get_next_position(course.id)
+                    for index, lecture in enumerate(lectures):
+                        lecture.position = first_position + \
+                            index * LECTURE_POSITION_GAP
+                    self.bulk_create(lectures)
+                break
+            except IntegrityError:
+                for lecture in lectures:
+                    lecture.pk = None
+                self.check_title_duplicate(course.id, lectures)
+                if attempt == LECTURE_CREATE_ATTEMPTS - 1:
+                    raise
+        # Bulk inserts skip the signals that update the course counters,
+        # the course snapshot and the cached syllabus
+        apps.get_model('courses', 'Course').objects.adjust_counters(
+            course.id,
+            lecture_count=len(lectures)
+        )
+        apps.get_model('courses', 'CourseSnapshot').objects.update_lectures(
+            course.id,
+            [lecture.id for lecture in lectures]
+        )
+        self.invalidate_syllabus(course.id)
+        logger.info(
+            f'{len(lectures)} lectures added to course {course.title}'
+        )
+        return lectures
+
+    def get_access_annotations(self, user, course_ref):
+        '''
+        Return annotations of registration and instructor
+        membership of a user in a course
+
+        Parameters
+        ---------------
+        user : User model instance or None
+        course_ref : OuterRef
+            Reference to id of the course in the outer query
+
+        Returns
+        ---------------
+        dict
+            is_registered and is_instructor expressions
+        '''
+        if user is None or user.pk is None:
+            return {
+                'is_registered': Value(False),
+                'is_instructor': Value(False)
+            }
+        return {
+            'is_registered': Exists(
+                apps.get_model(
+                    'registration',
+                    'CourseStudentRegistration'
+                ).objects.filter(course_id=course_ref, user_id=user.pk)
+            ),
+            'is_instructor': Exists(
+                apps.get_model(
+                    'courses',
+                    'Course'
+                ).instructors.through.objects.filter(
+                    course_id=course_ref,
+                    user_id=user.pk
+                )
             )
-        if title is None:
+        }
+
+    def get_lecture_access(
+        self,
+        slug,
+        user=None,
+        lecture_id=None,
+        admin_only=True
+    ):
+        '''
+        Return a course from its slug and a lecture of the course
+        with one query. The course is annotated with is_registered
+        and is_instructor of the user from EXISTS subqueries and
+        the instructor check of the course uses the annotation.
+        The course is fetched again only if the lecture is not found.
+
+        Parameters
+        ---------------
+        slug : str
+            Course slug, retired slugs are resolved
+        user : User model instance (optional)
+            User accessing the lecture. Default is None.
+        lecture_id : int (optional)
+            Id of lecture. Default is None when only course is needed.
+        admin_only : boolean (optional)
+            If False, course should be published and not archived.
+            Default is True.
+
+        Raises
+        ---------------
+        400 error:
+            If slug is missing
+        404 error:
+            If course is not found or if course is not published
+            or archived but admin_only is False
+
+        Returns
+        ---------------
+        tuple
+            Course model instance and Lecture model instance
+            with seq_no or None if lecture is not found
+        '''
+        if slug is None:
+            logger.error('Course fetched without slug')
             raise CustomAPIError(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=_('Title is required')
+                detail=_('Slug missing')
             )
-        try:
-            query = self.get_queryset()
-            if exclude_lecture is not None:
-                query = query.exclude(id=exclude_lecture.id)
-            query.get(
-                course=course,
-                title__iexact=title
+        redirect = apps.get_model(
+            'courses',
+            'CourseSlugHistory'
+        ).objects.get_redirect(slug)
+        course_filter = {'pk': redirect[0]} if redirect is not None \
+            else {'slug': slug}
+        if not admin_only:
+            course_filter.update(is_draft=False, is_archived=False)
+        lecture = None
+        if lecture_id is not None:
+            lecture = self.with_seq_no(
+                self.get_queryset().select_related('course').filter(
+                    id=lecture_id,
+                    **{
+                        f'course__{field_name}': value
+                        for field_name, value in course_filter.items()
+                    }
+                ).annotate(
+                    **self.get_access_annotations(user, OuterRef('course_id'))
+                )
+            ).first()
+        if lecture is not None:
+            course = lecture.course
+            course.is_registered = lecture.is_registered
+            course.is_instructor = lecture.is_instructor
+        else:
+            course = apps.get_model('courses', 'Course').objects.filter(
+                **course_filter
+            ).annotate(
+                **self.get_access_annotations(user, OuterRef('pk'))
+            ).first()
+        if course is None:
+            logger.error(f'Course with slug {slug} not found')
+            raise CustomAPIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=_('Course not found')
+            )
+        course.remember_instructor_check(user, course.is_instructor)
+        return course, lecture
+
+    def with_seq_no(self, queryset=None):
+        '''
+        Annotate lectures with seq_no, the number of the lecture in
+        the course starting from 1, counted from the positions of the
+        lectures of the course on read
+
+        Parameters
+        ---------------
+        queryset : Queryset of lectures (optional)
+            Default is all lectures
+
+        Returns
+        ---------------
+        Queryset of lectures with seq_no
+        '''
+        if queryset is None:
+            queryset = self.get_queryset()
+        return queryset.annotate(
+            seq_no=Subquery(
+                self.model.objects.filter(
+                    course=OuterRef('course'),
+                    position__lte=OuterRef('position')
+                ).order_by().values('course').annotate(
+                    total=Count('pk')
+                ).values('total')
             )
-        except:
-            return False
-        logger.error(
-            f'Lecture title {title} is duplicate in course {course.title}'
         )
-        raise CustomAPIError(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=_('Lecture with the same title exists in the course')
+
+    def get_seq_no(self, lecture):
+        '''
+        Return sequence number of a lecture in its course
+
+        Parameters
+        ---------------
+        lecture : Lecture model instance
+
+        Returns
+        ---------------
+        int
+        '''
+        if 'seq_no' in lecture.__dict__:
+            return lecture.__dict__['seq_no']
+        return self.get_queryset().filter(
+            course_id=lecture.course_id,
+            position__lte=lecture.position
+        ).count()
+
+    def get_next_position(self, course_id):
+        '''
+        Return position after the last lecture of a course
+
+        Parameters
+        ---------------
+        course_id : int
+
+        Returns
+        ---------------
+        int
+        '''
+        last_position = self.get_queryset().filter(
+            course_id=course_id
+        ).aggregate(last_position=Max('position'))['last_position']
+        return (last_position or 0) + LECTURE_POSITION_GAP
+
+    def set_positions(self, course_id, lecture_ids, **fields):
+        '''
+        Write positions LECTURE_POSITION_GAP apart to lectures of a
+        course in the order of lecture_ids with one CASE update.
+        Positions are first written as negative numbers and then
+        flipped so that the unique index on course and position is
+        never violated while rows are updated.
+
+        Parameters
+        ---------------
+        course_id : int
+        lecture_ids : list
+            Ids of all lectures of the course in the new order
+        fields : dict
+            Other fields written with the positions
+        '''
+        lectures = self.get_queryset().filter(course_id=course_id)
+        lectures.filter(id__in=lecture_ids).update(
+            position=Case(
+                *[
+                    When(id=lecture_id, then=Value(
+                        -(index + 1) * LECTURE_POSITION_GAP
+                    ))
+                    for index, lecture_id in enumerate(lecture_ids)
+                ]
+            ),
+            **fields
+        )
+        lectures.filter(position__lt=0).update(position=-F('position'))
+
+    def rebalance_positions(self, course_id):
+        '''
+        Spread positions of the lectures of a course
+        LECTURE_POSITION_GAP apart keeping their order
+
+        Parameters
+        ---------------
+        course_id : int
+
+        Returns
+        ---------------
+        int
+            Number of lectures in the course
+        '''
+        with transaction.atomic():
+            lecture_ids = list(
+                self.get_queryset().filter(
+                    course_id=course_id
+                ).select_for_update().order_by(
+                    'position'
+                ).values_list('id', flat=True)
+            )
+            if not lecture_ids:
+                return 0
+            self.set_positions(course_id, lecture_ids)
+        logger.info(
+            f'Positions of {len(lecture_ids)} lectures in course {course_id} rebalanced'
+        )
+        return len(lecture_ids)
+
+    def reorder_lectures(self, course, lecture_ids):
+        '''
+        Put all lectures of a course in a new order
+
+        Parameters
+        ---------------
+        course : Course model instance
+        lecture_ids : list
+            Ids of all lectures of the course in the new order
+
+        Raises
+        ---------------
+        400 error:
+            If lecture ids are not the lectures of the course
+            or a lecture is repeated
+        '''
+        if not isinstance(lecture_ids, list) or not all(
+            isinstance(x, int) and not isinstance(x, bool)
+            for x in lecture_ids
+        ):
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('List of lecture ids is required')
+            )
+        with transaction.atomic():
+            course_lecture_ids = set(
+                self.get_queryset().filter(
+                    course=course
+                ).select_for_update().values_list('id', flat=True)
+            )
+            if len(lecture_ids) != len(set(lecture_ids)) or \
+                    set(lecture_ids) != course_lecture_ids:
+                logger.error(
+                    f'Lectures of course {course.title} reordered with wrong lecture ids'
+                )
+                raise CustomAPIError(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=_('Every lecture of the course must appear once')
+                )
+            self.set_positions(
+                course.id,
+                lecture_ids,
+                updated_at=timezone.now()
+            )
+        # Bulk updates skip the signals that update the course snapshot
+        # and the cached syllabus
+        apps.get_model('courses', 'CourseSnapshot').objects.reorder_lectures(
+            course.id
         )
+        self.invalidate_syllabus(course.id)
+        logger.info(f'{len(lecture_ids)} lectures of course {course.title} reordered')
+
+    def get_crowded_course_ids(self, min_gap=LECTURE_POSITION_MIN_GAP):
+        '''
+        Return ids of courses that have consecutive lectures
+        with positions closer than min_gap
+
+        Parameters
+        ---------------
+        min_gap : int (optional)
+            Default is LECTURE_POSITION_MIN_GAP
+
+        Returns
+        ---------------
+        list
+        '''
+        course_ids = []
+        previous_course_id, previous_position = None, None
+        for course_id, position in self.get_queryset().filter(
+            course__isnull=False
+        ).order_by('course_id', 'position').values_list(
+            'course_id',
+            'position'
+        ).iterator():
+            if course_id == previous_course_id and \
+                    position - previous_position < min_gap and \
+                    (not course_ids or course_ids[-1] != course_id):
+                course_ids.append(course_id)
+            previous_course_id, previous_position = course_id, position
+        return course_ids
+
+    def move_to(self, lecture, seq_no):
+        '''
+        Move a lecture to a sequence number in its course. The lecture
+        gets a position between its new neighbours so that only the
+        lecture is updated. If there is no room between the neighbours,
+        the lectures from the next neighbour on are shifted by
+        LECTURE_POSITION_GAP with one update and a sign flip, whatever
+        the distance of the move. Moves in a course are serialized by
+        locking the course row.
+
+        Parameters
+        ---------------
+        lecture : Lecture model instance
+        seq_no : int
+            New sequence number of the lecture starting from 1
+
+        Raises
+        ---------------
+        400 error:
+            If sequence number is not between 1 and number of lectures
+        '''
+        if isinstance(seq_no, bool) or not isinstance(seq_no, int) or \
+                seq_no < 1:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Position of a lecture must be a positive number')
+            )
+        lectures = self.get_queryset().filter(course_id=lecture.course_id)
+        with transaction.atomic():
+            list(
+                apps.get_model('courses', 'Course').objects.filter(
+                    pk=lecture.course_id
+                ).select_for_update().values_list('pk', flat=True)
+            )
+            neighbours = list(
+                lectures.exclude(pk=lecture.pk).order_by(
+                    'position'
+                ).values_list('position', flat=True)[
+                    max(seq_no - 2, 0):seq_no
+                ]
+            )
+            if seq_no == 1:
+                lower, upper = 0, (neighbours or [2 * LECTURE_POSITION_GAP])[0]
+            elif len(neighbours) == 2:
+                lower, upper = neighbours
+            elif neighbours:
+                lower = neighbours[0]
+                upper = lower + 2 * LECTURE_POSITION_GAP
+            else:
+                logger.error(
+                    f'Lecture {lecture.id} moved beyond the last lecture'
+                )
+                raise CustomAPIError(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=_('Position is beyond the last lecture of the course')
+                )
+            if upper - lower < 2:
+                lectures.filter(position__gte=upper).update(
+                    position=-(F('position') + LECTURE_POSITION_GAP)
+                )
+                lectures.filter(position__lt=0).update(
+                    position=-F('position')
+                )
+                upper += LECTURE_POSITION_GAP
+            lecture.position = (lower + upper) // 2
+            lecture.__dict__.pop('seq_no', None)
+            lecture.save(update_fields=['position', 'updated_at'])
 
     def change_lecture_order(self, lecture, direction='up'):
         '''
@@ -98,7 +627,14 @@ class LectureManager(models.Manager):
         '''
         direction = direction.lower()
         course = lecture.course
-        if lecture.seq_no == 1 and direction == 'up':
+        counts = self.get_queryset().filter(
+            course_id=lecture.course_id
+        ).aggregate(
+            before=Count('pk', filter=Q(position__lt=lecture.position)),
+            after=Count('pk', filter=Q(position__gt=lecture.position))
+        )
+        seq_no = counts['before'] + 1
+        if seq_no == 1 and direction == 'up':
             logger.error(
                 f'First lecture in course {course.title} being moved up'
             )
@@ -106,9 +642,7 @@ class LectureManager(models.Manager):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=_('Lecture is already the first in the course')
             )
-
-        no_of_lectures = self.get_queryset().filter(course=course).count()
-        if lecture.seq_no == no_of_lectures and direction == 'down':
+        if counts['after'] == 0 and direction == 'down':
             logger.error(
                 f'Last lecture in course {course.title} being moved down'
             )
@@ -117,9 +651,9 @@ class LectureManager(models.Manager):
                 detail=_('Lecture is already the last in the course')
             )
         if direction == 'up':
-            other_seq_no = lecture.seq_no - 1
+            other_seq_no = seq_no - 1
         elif direction == 'down':
-            other_seq_no = lecture.seq_no + 1
+            other_seq_no = seq_no + 1
         else:
             raise CustomAPIError(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -127,16 +661,10 @@ class LectureManager(models.Manager):
                     'Direction in which the lecture needs to be moved can be up or down'
                 )
             )
-        other_lecture = self.get_queryset().get(
-            course=course,
-            seq_no=other_seq_no
-        )
         logger.info(
-            f'Lecture in course {course.title} at position {lecture.seq_no} moved to {other_seq_no}'
+            f'Lecture in course {course.title} at position {seq_no} moved to {other_seq_no}'
         )
-        lecture.seq_no, other_lecture.seq_no = other_lecture.seq_no, lecture.seq_no
-        lecture.save()
-        other_lecture.save()
+        self.move_to(lecture, other_seq_no)
 
     def add_video_to_lecture(self, id, video):
         '''
@@ -160,3 +688,434 @@ class LectureManager(models.Manager):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=_('Associated lecture could not be found')
             )
+
+    def get_syllabus(self, course):
+        '''
+        Return all lectures of a course with their sequence numbers
+        and videos with one query for lectures and one for videos
+
+        Parameters
+        -------------
+        course : Course model instance
+
+        Returns
+        -------------
+        Queryset of lectures with seq_no and prefetched videos
+        '''
+        return self.with_seq_no(
+            self.get_queryset().filter(course=course)
+        ).prefetch_related('videos')
+
+    def get_syllabus_cache_key(self, course_id):
+        '''
+        Return cache key of the syllabus of a course in active language
+
+        Parameters
+        -------------
+        course_id : int
+
+        Returns
+        -------------
+        str
+        '''
+        return build_cache_key(
+            f'{SYLLABUS_CACHE_NAMESPACE}:{course_id}',
+            translation.get_language()
+        )
+
+    def invalidate_syllabus(self, course_id):
+        '''
+        Remove cached syllabus of a course in all languages
+
+        Parameters
+        -------------
+        course_id : int
+        '''
+        if course_id is None:
+            return
+        bump_cache_version(f'{SYLLABUS_CACHE_NAMESPACE}:{course_id}')
+
+    def get_syllabus_changed_at(self, course_id):
+        '''
+        Return time of the last invalidation of the syllabus of a course,
+        which includes deletions of lectures not visible in the lectures
+
+        Parameters
+        -------------
+        course_id : int
+
+        Returns
+        -------------
+        Datetime or None
+        '''
+        return get_cache_changed_at(f'{SYLLABUS_CACHE_NAMESPACE}:{course_id}')
+
+
+class LectureProgressManager(models.Manager):
+    '''
+    Manager for LectureProgress model
+
+    Positions reported by video players are buffered in the cache and
+    written to the database in batches. A report replaces the buffered
+    state of the same video, so a student watching a video causes one
+    row write per flush however often the player reports. Videos with
+    buffered state are queued once per flush in numbered queue slots.
+    Completion of a video is buffered in a separate marker that is
+    never reset, so concurrent reports cannot undo it.
+
+    Buffering needs a cache shared by all server processes. With a
+    process local cache (e.g. the local memory cache) reports are
+    written to the database directly, as progress buffered by one
+    worker would be invisible to the others and to the flush command.
+
+    Methods
+    -------------
+    get_state_key(user_id, lecture_id, video_id):
+        Returns cache key of buffered progress in a video
+    get_completed_key(user_id, lecture_id, video_id):
+        Returns cache key of buffered completion of a video
+    record_progress(user, lecture, video_id, position, completed=False):
+        Buffers progress of a student in a video of a lecture
+    flush_progress():
+        Writes buffered progress to the database
+    write_progress(progress):
+        Upserts progress rows without resetting completed videos
+    get_progress(user, lecture):
+        Returns progress of a student in the videos of a lecture
+    '''
+
+    def get_state_key(self, user_id, lecture_id, video_id):
+        '''
+        Return cache key of buffered progress of a student in a video
+
+        Parameters
+        -------------
+        user_id : int
+        lecture_id : int
+        video_id : int
+
+        Returns
+        -------------
+        str
+        '''
+        return f'{PROGRESS_BUFFER_NAMESPACE}:state:{user_id}:{lecture_id}:{video_id}'
+
+    def get_completed_key(self, user_id, lecture_id, video_id):
+        '''
+        Return cache key of buffered completion of a video by a student
+
+        Parameters
+        -------------
+        user_id : int
+        lecture_id : int
+        video_id : int
+
+        Returns
+        -------------
+        str
+        '''
+        return f'{PROGRESS_BUFFER_NAMESPACE}:completed:{user_id}:{lecture_id}:{video_id}'
+
+    def get_next_slot(self):
+        '''
+        Return number of a new slot in the queue of buffered progress
+
+        Returns
+        -------------
+        int
+        '''
+        counter_key = f'{PROGRESS_BUFFER_NAMESPACE}:slots'
+        try:
+            return cache.incr(counter_key)
+        except ValueError:
+            cache.add(counter_key, 0, timeout=None)
+            return cache.incr(counter_key)
+
+    def record_progress(self, user, lecture, video_id, position, completed=False):
+        '''
+        Buffer progress of a student in a video of a lecture. Buffered
+        progress is flushed by the first report after
+        PROGRESS_FLUSH_INTERVAL seconds from any process. Reports that
+        are not followed by another one are only written by the flush
+        command, so it has to run periodically. Buffered reports that
+        were not flushed are lost if the cache is lost.
+
+        Progress is written directly if the cache is not shared by all
+        server processes.
+
+        Parameters
+        -------------
+        user : User model instance
+        lecture : Lecture model instance
+        video_id : int
+        position : int
+            Position in the video in seconds
+        completed : boolean (optional)
+            True if the video has been watched to the end.
+            A completed video stays completed. Default is False.
+        '''
+        if not is_cache_shared():
+            self.write_progress([self.model(
+                user_id=user.id,
+                lecture_id=lecture.id,
+                video_id=video_id,
+                position=position,
+                completed=completed,
+                updated_at=timezone.now()
+            )])
+            return
+        if cache.add(
+            f'{PROGRESS_BUFFER_NAMESPACE}:flush-due',
+            1,
+            timeout=settings.PROGRESS_FLUSH_INTERVAL
+        ):
+            self.flush_progress()
+        entry = (user.id, lecture.id, video_id)
+        if completed:
+            cache.set(
+                self.get_completed_key(*entry),
+                True,
+                timeout=settings.PROGRESS_BUFFER_TIMEOUT
+            )
+        cache.set(
+            self.get_state_key(*entry),
+            {
+                'position': position,
+                'updated_at': timezone.now()
+            },
+            timeout=settings.PROGRESS_BUFFER_TIMEOUT
+        )
+        # Queue marker expires in case its slot is lost
+        if cache.add(
+            f'{PROGRESS_BUFFER_NAMESPACE}:queued:{user.id}:{lecture.id}:{video_id}',
+            1,
+            timeout=settings.PROGRESS_FLUSH_INTERVAL * PROGRESS_QUEUE_INTERVALS
+        ):
+            cache.set(
+                f'{PROGRESS_BUFFER_NAMESPACE}:slot:{self.get_next_slot()}',
+                entry,
+                timeout=settings.PROGRESS_BUFFER_TIMEOUT
+            )
+
+    def flush_progress(self):
+        '''
+        Write buffered progress of queued videos to the database with
+        batched upserts. Buffered state is kept in the cache for reads
+        until it expires.
+
+        Queue slots are numbered before they are written, so a missing
+        slot may still be written by a concurrent report. Flushed slots
+        do not advance past a missing slot until the queue marker of
+        its video has expired and a new report queues the video again.
+
+        Returns
+        -------------
+        int
+            Number of progress rows written
+        '''
+        lock_key = f'{PROGRESS_BUFFER_NAMESPACE}:flushing'
+        flushed_key = f'{PROGRESS_BUFFER_NAMESPACE}:flushed'
+        if not cache.add(lock_key, 1, timeout=settings.PROGRESS_FLUSH_INTERVAL):
+            return 0
+        try:
+            last_slot = cache.get(f'{PROGRESS_BUFFER_NAMESPACE}:slots', 0)
+            flushed_slot = cache.get(flushed_key, 0)
+            if flushed_slot > last_slot:
+                # Slot counter was evicted from the cache
+                flushed_slot = 0
+            slot_keys = [
+                f'{PROGRESS_BUFFER_NAMESPACE}:slot:{slot}'
+                for slot in range(flushed_slot + 1, last_slot + 1)
+            ]
+            slots = cache.get_many(slot_keys)
+            entries = set(slots.values())
+            done_slot = self.get_done_slot(flushed_slot, slot_keys, slots)
+            # Reports after this are queued for the next flush
+            cache.delete_many([
+                f'{PROGRESS_BUFFER_NAMESPACE}:queued:{user_id}:{lecture_id}:{video_id}'
+                for user_id, lecture_id, video_id in entries
+            ])
+            states = cache.get_many([
+                self.get_state_key(*entry) for entry in entries
+            ])
+            completed_videos = cache.get_many([
+                self.get_completed_key(*entry) for entry in entries
+            ])
+            lecture_model = apps.get_model('lectures', 'Lecture')
+            lecture_videos = set(
+                lecture_model.videos.through.objects.filter(
+                    lecture_id__in={entry[1] for entry in entries}
+                ).values_list('lecture_id', 'videocontent_id')
+            )
+            user_ids = set(
+                apps.get_model('user_auth', 'User').objects.filter(
+                    id__in={entry[0] for entry in entries}
+                ).values_list('id', flat=True)
+            )
+            progress = []
+            for user_id, lecture_id, video_id in entries:
+                state = states.get(
+                    self.get_state_key(user_id, lecture_id, video_id),
+                    None
+                )
+                # Lectures, videos and users deleted since the report
+                if state is None or user_id not in user_ids or \
+                        (lecture_id, video_id) not in lecture_videos:
+                    continue
+                progress.append(self.model(
+                    user_id=user_id,
+                    lecture_id=lecture_id,
+                    video_id=video_id,
+                    position=state['position'],
+                    completed=self.get_completed_key(
+                        user_id,
+                        lecture_id,
+                        video_id
+                    ) in completed_videos,
+                    updated_at=state['updated_at']
+                ))
+            self.write_progress(progress)
+            cache.set(flushed_key, done_slot, timeout=None)
+            # Slots after a missing slot are read again by the next flush
+            cache.delete_many(slot_keys[:done_slot - flushed_slot])
+        finally:
+            cache.delete(lock_key)
+        if progress:
+            logger.info(f'Progress of {len(progress)} videos flushed')
+        return len(progress)
+
+    def write_progress(self, progress):
+        '''
+        Write progress rows to the database with batched upserts.
+        Progress of completed videos is written separately so that
+        completed videos are not reset.
+
+        Parameters
+        -------------
+        progress : list
+            Unsaved LectureProgress model instances
+        '''
+        if not progress:
+            return
+        with transaction.atomic():
+            for completed in (True, False):
+                rows = [x for x in progress if x.completed == completed]
+                if rows:
+                    self.bulk_create(
+                        rows,
+                        batch_size=500,
+                        update_conflicts=True,
+                        unique_fields=['user', 'lecture', 'video'],
+                        update_fields=['position', 'updated_at'] + (
+                            ['completed'] if completed else []
+                        )
+                    )
+
+    def get_done_slot(self, flushed_slot, slot_keys, slots):
+        '''
+        Return last queue slot before the first missing slot. A slot
+        missing for longer than its queue marker lives is skipped.
+
+        Parameters
+        -------------
+        flushed_slot : int
+            Last slot of the previous flush
+        slot_keys : list
+            Cache keys of the slots after the previous flush
+        slots : dict
+            Slots read from the cache
+
+        Returns
+        -------------
+        int
+        '''
+        gap_key = f'{PROGRESS_BUFFER_NAMESPACE}:missing-slot'
+        gap = cache.get(gap_key)
+        now = timezone.now()
+        done_slot = flushed_slot
+        for slot_key in slot_keys:
+            if slot_key not in slots:
+                if gap is None or gap['slot'] != done_slot + 1:
+                    cache.set(
+                        gap_key,
+                        {'slot': done_slot + 1, 'since': now},
+                        timeout=None
+                    )
+                    break
+                if (now - gap['since']).total_seconds() < \
+                        settings.PROGRESS_FLUSH_INTERVAL * PROGRESS_QUEUE_INTERVALS:
+                    break
+                logger.warning(f'Lost progress queue slot {done_slot + 1} skipped')
+            done_slot += 1
+        return done_slot
+
+    def get_progress(self, user, lecture):
+        '''
+        Return progress of a student in the videos of a lecture
+        from the database merged with buffered progress
+
+        Parameters
+        -------------
+        user : User model instance
+        lecture : Lecture model instance
+
+        Returns
+        -------------
+        dict
+            Lecture id, completed flag of the lecture and
+            list of position and completed flag of every video
+        '''
+        video_ids = list(lecture.videos.values_list('id', flat=True))
+        stored = {
+            progress.video_id: progress
+            for progress in self.get_queryset().filter(
+                user=user,
+                lecture=lecture
+            )
+        }
+        buffered = cache.get_many([
+            self.get_state_key(user.id, lecture.id, video_id)
+            for video_id in video_ids
+        ] + [
+            self.get_completed_key(user.id, lecture.id, video_id)
+            for video_id in video_ids
+        ])
+        videos = []
+        for video_id in video_ids:
+            state = {
+                'video': video_id,
+                'position': 0,
+                'completed': False,
+                'updated_at': None
+            }
+            progress = stored.get(video_id, None)
+            if progress is not None:
+                state.update(
+                    position=progress.position,
+                    completed=progress.completed,
+                    updated_at=progress.updated_at
+                )
+            buffered_state = buffered.get(
+                self.get_state_key(user.id, lecture.id, video_id),
+                None
+            )
+            if buffered_state is not None and (
+                state['updated_at'] is None or
+                buffered_state['updated_at'] >= state['updated_at']
+            ):
+                state.update(
+                    position=buffered_state['position'],
+                    updated_at=buffered_state['updated_at']
+                )
+            if self.get_completed_key(
+                user.id,
+                lecture.id,
+                video_id
+            ) in buffered:
+                state['completed'] = True
+            videos.append(state)
+        return {
+            'lecture': lecture.id,
+            'completed': bool(videos) and all(x['completed'] for x in videos),
+            'videos': videos
+        }
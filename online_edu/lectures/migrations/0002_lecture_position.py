@@ -0,0 +1,73 @@
+# Generated by Django 4.2.5 on 2026-10-18 00:20
+
+from django.db import migrations, models
+
+LECTURE_POSITION_GAP = 1024
+
+
+def populate_positions(apps, schema_editor):
+    '''Spread positions of existing lectures in the order of seq_no'''
+    Lecture = apps.get_model('lectures', 'Lecture')
+    lectures = []
+    course_id = None
+    index = 0
+    for lecture in Lecture.objects.order_by('course_id', 'seq_no', 'id'):
+        if lecture.course_id != course_id:
+            course_id = lecture.course_id
+            index = 0
+        index += 1
+        lecture.position = index * LECTURE_POSITION_GAP
+        lectures.append(lecture)
+    Lecture.objects.bulk_update(lectures, ['position'], batch_size=500)
+
+
+def populate_seq_no(apps, schema_editor):
+    '''Number lectures of every course in the order of position'''
+    Lecture = apps.get_model('lectures', 'Lecture')
+    lectures = []
+    course_id = None
+    index = 0
+    for lecture in Lecture.objects.order_by('course_id', 'position', 'id'):
+        if lecture.course_id != course_id:
+            course_id = lecture.course_id
+            index = 0
+        index += 1
+        lecture.seq_no = index
+        lectures.append(lecture)
+    Lecture.objects.bulk_update(lectures, ['seq_no'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lectures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lecture',
+            name='position',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_positions, populate_seq_no),
+        migrations.AlterField(
+            model_name='lecture',
+            name='position',
+            field=models.BigIntegerField(editable=False),
+        ),
+        migrations.AlterModelOptions(
+            name='lecture',
+            options={'ordering': ['position']},
+        ),
+        migrations.RemoveField(
+            model_name='lecture',
+            name='seq_no',
+        ),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(
+                fields=('course', 'position'),
+                name='lecture_course_position_unique'
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.5 on 2026-10-18 00:32
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+TITLE_FIELDS = ['title_en', 'title_de']
+
+
+def rename_duplicate_titles(apps, schema_editor):
+    '''Number titles repeated in a course so that they become unique'''
+    Lecture = apps.get_model('lectures', 'Lecture')
+    for field_name in TITLE_FIELDS:
+        lectures = []
+        seen_titles = set()
+        for lecture in Lecture.objects.exclude(
+            **{f'{field_name}__isnull': True}
+        ).order_by('course_id', 'position'):
+            title = getattr(lecture, field_name)
+            new_title = title
+            copy_no = 1
+            while (lecture.course_id, new_title.lower()) in seen_titles:
+                copy_no += 1
+                new_title = f'{title} ({copy_no})'
+            seen_titles.add((lecture.course_id, new_title.lower()))
+            if new_title != title:
+                setattr(lecture, field_name, new_title)
+                lectures.append(lecture)
+        Lecture.objects.bulk_update(lectures, [field_name], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lectures', '0002_lecture_position'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_titles, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(models.F('course'), django.db.models.functions.text.Lower('title_en'), name='lecture_course_title_en_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='lecture',
+            constraint=models.UniqueConstraint(models.F('course'), django.db.models.functions.text.Lower('title_de'), name='lecture_course_title_de_unique'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.5 on 2026-10-18 00:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_contents', '0002_videocontent_file_size'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('lectures', '0003_lecture_title_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LectureProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('completed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField()),
+                ('lecture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='lectures.lecture')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lecture_progress', to=settings.AUTH_USER_MODEL)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='video_contents.videocontent')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='lectureprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'lecture', 'video'), name='lecture_progress_unique'),
+        ),
+    ]
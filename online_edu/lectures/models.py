@@ -1,7 +1,13 @@
-from django.db import models
-from django.db.models.signals import pre_save
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Lower
+from django.db.models.signals import post_save, post_delete, \
+    m2m_changed
 
-from .managers import LectureManager
+from courses.models import Course, CourseSnapshot
+from .managers import LectureManager, \
+    LectureProgressManager, \
+    LECTURE_CREATE_ATTEMPTS
 
 
 class Lecture(models.Model):
@@ -11,7 +17,8 @@ class Lecture(models.Model):
     Attributes
     ----------------
     title : str
-        Title of lecture
+        Title of lecture (unique in a course in every language,
+        case insensitive)
     description : str (optional)
         Description of lecture
     videos : ManyToMany relationship
@@ -20,8 +27,12 @@ class Lecture(models.Model):
         Autogenerated when model instance is created
     updated_at: Datetime
         Autoupdated when model instance is updated
-    seq_no : int
-        The position of the lecture in the lecture list of a course
+    position : int
+        Ordering key of the lecture in the lecture list of a course
+        (unique in a course). Positions are kept apart so that a lecture
+        can be inserted or moved by changing only its own position.
+        The sequence number of a lecture is counted from positions
+        with LectureManager.with_seq_no.
     '''
 
     course = models.ForeignKey(
@@ -37,32 +48,275 @@ class Lecture(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    seq_no = models.IntegerField(default=0)
+    position = models.BigIntegerField(editable=False)
 
     objects = LectureManager()
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        '''
+        Saves the lecture model instance.
+
+        A new lecture is added after the last lecture of the course.
+        The unique indexes on course and position and on course and
+        title decide between concurrent saves. Lectures of the course
+        are only searched for a duplicate title if saving fails,
+        otherwise the position is taken again. Saves of other fields
+        of a lecture are not wrapped in a savepoint.
+
+        Raises
+        ---------------
+        400 error:
+            If another lecture in the course has the same title
+        '''
+        new_lecture = self.position is None
+        update_fields = kwargs.get('update_fields', None)
+        if not new_lecture and update_fields is not None and \
+                not any(x.startswith('title') for x in update_fields):
+            return super().save(*args, **kwargs)
+        for attempt in range(LECTURE_CREATE_ATTEMPTS):
+            if new_lecture:
+                self.position = Lecture.objects.get_next_position(
+                    self.course_id
+                )
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if new_lecture:
+                    self.position = None
+                Lecture.objects.check_title_duplicate(self.course_id, [self])
+                if not new_lecture or attempt == LECTURE_CREATE_ATTEMPTS - 1:
+                    raise
+
     class Meta:
-        ordering = ['seq_no']
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'position'],
+                name='lecture_course_position_unique'
+            ),
+        ] + [
+            models.UniqueConstraint(
+                'course',
+                Lower(f'title_{language}'),
+                name=f'lecture_course_title_{language}_unique'
+            )
+            for language, _language_name in settings.LANGUAGES
+        ]
+
+
+def increment_course_lecture_count(sender, instance, created, *args, **kwargs):
+    '''
+    Increment lecture counter of the course of a new lecture
+
+    Parameters
+    ------------------
+    sender : Model class (Lecture)
+        Class that causes the signal to call the fuction
+    instance : model instance (Lecture)
+        The instance that is saved
+    created : boolean
+        True if a new lecture was created
+    '''
+    if created:
+        Course.objects.adjust_counters(instance.course_id, lecture_count=1)
+
+
+def decrement_course_lecture_count(sender, instance, *args, **kwargs):
+    '''
+    Decrement lecture counter of the course of a deleted lecture
+
+    Parameters
+    ------------------
+    sender : Model class (Lecture)
+        Class that causes the signal to call the fuction
+    instance : model instance (Lecture)
+        The instance that is deleted
+    '''
+    Course.objects.adjust_counters(instance.course_id, lecture_count=-1)
+
+
+post_save.connect(increment_course_lecture_count, sender=Lecture)
+post_delete.connect(decrement_course_lecture_count, sender=Lecture)
+
+
+def update_course_snapshot(sender, instance, *args, **kwargs):
+    '''
+    Update lecture in the snapshot of a published course
+
+    Parameters
+    ------------------
+    sender : Model class (Lecture)
+        Class that causes the signal to call the fuction
+    instance : model instance (Lecture)
+        The instance that is saved
+    '''
+    CourseSnapshot.objects.update_lectures(instance.course_id, [instance.id])
+
+
+def remove_from_course_snapshot(sender, instance, *args, **kwargs):
+    '''
+    Remove lecture from the snapshot of a published course
+
+    Parameters
+    ------------------
+    sender : Model class (Lecture)
+        Class that causes the signal to call the fuction
+    instance : model instance (Lecture)
+        The instance that is deleted
+    '''
+    CourseSnapshot.objects.remove_lecture(instance.course_id, instance.id)
 
 
-def generate_sequence_no(sender, instance, *args, **kwargs):
+def update_course_snapshot_videos(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    *args,
+    **kwargs
+):
     '''
-    Generate sequence number for a lecture in a course
+    Update lectures in the snapshot of a published course
+    when videos are added to or removed from lectures
+
+    Parameters
+    ------------------
+    sender : Model class
+        Through model of Lecture.videos
+    instance : model instance
+        Lecture, or VideoContent if the relation is changed from the video side
+    action : str
+        Type of change made to the relation
+    reverse : boolean
+        True if the relation is changed from the video side
+    pk_set : set
+        Primary keys of the related instances added or removed
+    '''
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            CourseSnapshot.objects.update_lectures(
+                instance.course_id,
+                [instance.id]
+            )
+        return
+    if action == 'pre_clear':
+        instance.__dict__['_snapshot_lecture_ids'] = list(
+            instance.lectures.values_list('id', flat=True)
+        )
+        return
+    if action == 'post_clear':
+        lecture_ids = instance.__dict__.pop('_snapshot_lecture_ids', [])
+    elif action in ('post_add', 'post_remove'):
+        lecture_ids = pk_set
+    else:
+        return
+    CourseSnapshot.objects.update_lectures(instance.course_id, lecture_ids)
+
+
+post_save.connect(update_course_snapshot, sender=Lecture)
+post_delete.connect(remove_from_course_snapshot, sender=Lecture)
+m2m_changed.connect(
+    update_course_snapshot_videos,
+    sender=Lecture.videos.through
+)
+
+
+def invalidate_syllabus_cache(sender, instance, *args, **kwargs):
+    '''
+    Invalidate cached syllabus of the course of a lecture
+    when the lecture is saved or deleted
 
     Parameters
     ------------------
     sender : Model class (Lecture)
         Class that causes the signal to call the fuction
     instance : model instance (Lecture)
-        The instance that is being saved
+        The instance that is saved or deleted
+    '''
+    Lecture.objects.invalidate_syllabus(instance.course_id)
+
+
+def invalidate_syllabus_cache_videos(
+    sender,
+    instance,
+    action,
+    *args,
+    **kwargs
+):
     '''
-    if not instance.seq_no:
-        course = instance.course
-        last_lecture_no = sender.objects.filter(course=course).count()
-        instance.seq_no = last_lecture_no + 1
+    Invalidate cached syllabus of a course when videos are
+    added to or removed from its lectures
 
+    Parameters
+    ------------------
+    sender : Model class
+        Through model of Lecture.videos
+    instance : model instance
+        Lecture, or VideoContent if the relation is changed from the video side
+    action : str
+        Type of change made to the relation
+    '''
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Lecture.objects.invalidate_syllabus(instance.course_id)
+
+
+post_save.connect(invalidate_syllabus_cache, sender=Lecture)
+post_delete.connect(invalidate_syllabus_cache, sender=Lecture)
+m2m_changed.connect(
+    invalidate_syllabus_cache_videos,
+    sender=Lecture.videos.through
+)
 
-pre_save.connect(generate_sequence_no, sender=Lecture)
+
+class LectureProgress(models.Model):
+    '''
+    Progress of a student in a video of a lecture.
+    Reports of video players are buffered and saved in batches
+    with LectureProgressManager.flush_progress.
+
+    Attributes
+    ----------------
+    user : Reference to User model instance
+    lecture : Reference to Lecture model instance
+    video : Reference to VideoContent model instance
+    position : int
+        Last reported position in the video in seconds
+    completed : boolean
+        True once the video has been watched to the end
+    updated_at : Datetime
+        Time of the last report of the student
+    '''
+
+    user = models.ForeignKey(
+        'user_auth.User',
+        related_name='lecture_progress',
+        on_delete=models.CASCADE
+    )
+    lecture = models.ForeignKey(
+        Lecture,
+        related_name='progress',
+        on_delete=models.CASCADE
+    )
+    video = models.ForeignKey(
+        'video_contents.VideoContent',
+        related_name='progress',
+        on_delete=models.CASCADE
+    )
+    position = models.PositiveIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField()
+
+    objects = LectureProgressManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'lecture', 'video'],
+                name='lecture_progress_unique'
+            ),
+        ]
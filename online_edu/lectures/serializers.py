@@ -5,7 +5,7 @@ from rest_framework import status
 
 from common.error_definitions import CustomAPIError
 from common.error_handling import extract_serializer_error
-from .models import Lecture
+from .models import Lecture, LectureProgress
 from video_contents.serializers import VideoContentSerializer
 
 logger = logging.getLogger(__name__)
@@ -15,8 +15,15 @@ class LectureSerializer(serializers.ModelSerializer):
     '''
     Serializer for Lecture model
 
+    Attributes
+    -------------
+    seq_no : int
+        Number of the lecture in the course starting from 1.
+
     Methods
     -------------
+    get_seq_no(instance):
+        Returns number of the lecture in the course
     save():
         Saves the serializer data in a lecture model instance
     validate(data):
@@ -29,6 +36,24 @@ class LectureSerializer(serializers.ModelSerializer):
         Creates a new lecture model instance from serializer data
     '''
 
+    seq_no = serializers.SerializerMethodField()
+
+    def get_seq_no(self, instance):
+        '''
+        Return number of the lecture in the course counted from
+        lecture positions. Lectures fetched with
+        LectureManager.with_seq_no need no extra query.
+
+        Parameters
+        --------------
+        instance : Lecture model instance
+
+        Returns
+        --------------
+        int
+        '''
+        return Lecture.objects.get_seq_no(instance)
+
     def save(self, *args, **kwargs):
         '''
         Validates serializer data and returns model instance
@@ -154,12 +179,8 @@ class LectureSerializer(serializers.ModelSerializer):
         if self.check_user_is_instructor(course, user):
             del validated_data['user']
             del validated_data['course']
-        if title_data is not None and not Lecture.objects.check_title_duplicate(
-            course,
-            validated_data.get('title'),
-            exclude_lecture=instance
-        ):
-            instance.title = validated_data.get('title', instance.title)
+        if title_data is not None:
+            instance.title = title_data
         instance.description = validated_data.get(
             'description', instance.description)
         instance.save()
@@ -192,17 +213,14 @@ class LectureSerializer(serializers.ModelSerializer):
         if self.check_user_is_instructor(course, user):
             del validated_data['user']
             del validated_data['course']
-        if not Lecture.objects.check_title_duplicate(
-            course,
-            validated_data.get('title'),
-        ):
-            logger.info(
-                f'Lecture {validated_data.get("title", None)} in course {course.title} created by user {user.id} successfully'
-            )
-            return Lecture.objects.create(
-                **validated_data,
-                course=course
-            )
+        lecture = Lecture.objects.create(
+            **validated_data,
+            course=course
+        )
+        logger.info(
+            f'Lecture {lecture.title} in course {course.title} created by user {user.id} successfully'
+        )
+        return lecture
 
     class Meta:
         model = Lecture
@@ -211,9 +229,6 @@ class LectureSerializer(serializers.ModelSerializer):
             'id': {
                 'read_only': True
             },
-            'seq_no': {
-                'read_only': True
-            },
             'title': {
                 'error_messages': {
                     'required': _('The title of a lecture is required'),
@@ -228,8 +243,32 @@ class LectureDetailSerializer(serializers.ModelSerializer):
     Serializer for detail view of Lecture including related videos
     '''
 
+    seq_no = serializers.SerializerMethodField()
     videos = VideoContentSerializer(many=True, read_only=True)
 
+    def get_seq_no(self, instance):
+        '''Return number of the lecture in the course'''
+        return Lecture.objects.get_seq_no(instance)
+
     class Meta:
         model = Lecture
         fields = ['id', 'title', 'description', 'seq_no', 'videos']
+
+
+class LectureProgressSerializer(serializers.ModelSerializer):
+    '''
+    Serializer for progress reported by a video player.
+    Video is an id so that reports are validated without queries.
+    '''
+
+    video = serializers.IntegerField(source='video_id')
+
+    class Meta:
+        model = LectureProgress
+        fields = ['video', 'position', 'completed']
+        extra_kwargs = {
+            'position': {
+                'required': True,
+                'min_value': 0
+            }
+        }
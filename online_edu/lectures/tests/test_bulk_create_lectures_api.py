@@ -0,0 +1,122 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSnapshot
+from lectures.models import Lecture
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from fixtures import test_lecture, test_lectures
+
+pytestmark = pytest.mark.django_db
+
+
+def test_bulk_create_lectures(sample_course, test_lectures, django_assert_num_queries):
+    '''Test that lectures are added with a fixed number of queries'''
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    test_lectures(course1, 2)
+    CourseSnapshot.objects.build_snapshot(course1)
+    items = [
+        {'title': f'New lecture {index}', 'description': 'Some description'}
+        for index in range(1, 21)
+    ]
+
+    # In a savepoint the course is locked, last position read and
+    # lectures inserted at once. Counters are adjusted with one
+    # update and the snapshot with 5 queries.
+    with django_assert_num_queries(11):
+        lectures = Lecture.objects.bulk_create_lectures(course1, items)
+    assert len(lectures) == 20
+    assert [
+        (x.title, x.seq_no) for x in Lecture.objects.with_seq_no()
+    ] == [('Lecture 1', 1), ('Lecture 2', 2)] + [
+        (f'New lecture {index}', index + 2) for index in range(1, 21)
+    ]
+    assert Course.objects.get(id=course1.id).lecture_count == 22
+    snapshot = CourseSnapshot.objects.get(course=course1)
+    assert len(snapshot.documents['en']['lectures']) == 22
+    assert snapshot.documents['en']['lectures'][21]['seq_no'] == 22
+
+    # Fail - title of an existing lecture in different case
+    with pytest.raises(Exception) as e:
+        Lecture.objects.bulk_create_lectures(
+            course1,
+            [{'title': 'Another lecture'}, {'title': 'new LECTURE 3'}]
+        )
+    assert str(e.value) == 'Lecture with the same title exists in the course'
+    assert Lecture.objects.count() == 22
+
+    # Fail - title repeated in request
+    with pytest.raises(Exception) as e:
+        Lecture.objects.bulk_create_lectures(
+            course1,
+            [{'title': 'Another lecture'}, {'title': 'Another Lecture'}]
+        )
+    assert str(e.value) == 'Lecture titles must be different from each other'
+
+
+def test_bulk_create_endpoint(test_user, access_token, sample_course, test_lectures):
+    '''Test that instructors can add several lectures in one request'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.is_staff = True
+    user1.save()
+    user2 = test_user(username='admin@gmail.com')
+    user2.is_active = True
+    user2.is_staff = True
+    user2.save()
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    test_lectures(course1, 1)
+    token1 = access_token(user1, 60)
+
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/bulk-create',
+        {
+            'lectures': [
+                {'title': 'Lecture 2', 'description': 'Second lecture'},
+                {'title': 'Lecture 3'}
+            ]
+        },
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 201
+    assert [(x['title'], x['seq_no']) for x in api_response.data] == \
+        [('Lecture 2', 2), ('Lecture 3', 3)]
+    assert api_response.data[0]['description'] == 'Second lecture'
+
+    # Fail - title missing
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/bulk-create',
+        {'lectures': [{'title': 'Lecture 4'}, {'description': 'No title'}]},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'The title of a lecture is required'
+    assert Lecture.objects.count() == 3
+
+    # Fail - no list of lectures
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/bulk-create',
+        {'lectures': []},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'List of lectures to be created is required'
+
+    # Fail - not an instructor
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/bulk-create',
+        {'lectures': [{'title': 'Lecture 4'}]},
+        headers={'Authorization': f'Bearer {access_token(user2, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
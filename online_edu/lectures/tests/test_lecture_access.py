@@ -0,0 +1,115 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import CourseSlugHistory
+from lectures.models import Lecture
+from registration.models import CourseStudentRegistration
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from fixtures import test_lecture, test_lectures
+
+pytestmark = pytest.mark.django_db
+
+
+def test_lecture_access(
+    test_user,
+    sample_course,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that course, lecture and access of user are fetched together'''
+
+    user1 = test_user()
+    user2 = test_user(username='instructor@gmail.com', is_staff=True)
+    course1 = sample_course()
+    course2 = sample_course(index=2)
+    course1.add_instructor(user2)
+    lectures = test_lectures(course1, 3)
+    test_lectures(course2, 1)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+    CourseSlugHistory.objects.load_redirects()
+
+    with django_assert_num_queries(1):
+        course, lecture = Lecture.objects.get_lecture_access(
+            course1.slug,
+            user=user2,
+            lecture_id=lectures[1].id
+        )
+        assert course.check_user_is_instructor(user2)
+    assert course == course1
+    assert lecture == lectures[1]
+    assert lecture.seq_no == 2
+    assert course.is_registered == False
+
+    course, lecture = Lecture.objects.get_lecture_access(
+        course1.slug,
+        user=user1,
+        lecture_id=lectures[0].id
+    )
+    assert course.is_registered == True
+    assert course.is_instructor == False
+
+    # Lecture of another course is not found
+    with django_assert_num_queries(2):
+        course, lecture = Lecture.objects.get_lecture_access(
+            course2.slug,
+            user=user1,
+            lecture_id=lectures[0].id
+        )
+    assert course == course2
+    assert lecture is None
+    assert course.is_registered == False
+
+    # Fail - course not published
+    with pytest.raises(Exception) as e:
+        Lecture.objects.get_lecture_access(
+            course1.slug,
+            user=user1,
+            lecture_id=lectures[0].id,
+            admin_only=False
+        )
+    assert str(e.value) == 'Course not found'
+
+
+def test_lecture_detail_queries(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that a lecture is fetched by a student with fixed number of queries'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course1, 3)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+    CourseSlugHistory.objects.load_redirects()
+    token1 = access_token(user1, 60)
+
+    def fetch_lecture(lecture_id):
+        return client.get(
+            f'/api/courses/{course1.slug}/lectures/{lecture_id}',
+            headers={'Authorization': f'Bearer {token1}'},
+            format='json'
+        )
+
+    fetch_lecture(lectures[0].id)
+    # User, course with lecture and registration, trending score,
+    # validators of lecture and videos of lecture
+    with django_assert_num_queries(5):
+        api_response = fetch_lecture(lectures[2].id)
+    assert api_response.status_code == 200
+    assert api_response.data['title'] == 'Lecture 3'
+    assert api_response.data['seq_no'] == 3
+
+    # Fail - lecture not in course
+    api_response = fetch_lecture(lectures[2].id + 100)
+    assert api_response.status_code == 404
+    assert api_response.data['detail'] == 'Lecture not found'
@@ -0,0 +1,161 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from rest_framework.test import APIClient
+
+from lectures.models import Lecture
+from registration.models import CourseStudentRegistration
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from lectures.tests.fixtures import test_lecture, test_lectures
+from video_contents.tests.fixtures import test_video
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_lecture_list_etag(sample_course, test_lectures):
+    '''Test conditional GET of lecture list'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course=course1, no_of_lectures=3)
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        format='json'
+    )
+    assert api_response.status_code == 200
+    etag = api_response['ETag']
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        headers={'If-None-Match': etag},
+        format='json'
+    )
+    assert api_response.status_code == 304
+
+    # Deleting a lecture changes the ETag
+    lectures[2].delete()
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        headers={'If-None-Match': etag},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data) == 2
+
+
+def test_lecture_list_last_modified(sample_course, test_lectures):
+    '''Test that Last-Modified of lecture list does not go back'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course=course1, no_of_lectures=2)
+    for days, lecture in zip((2, 1), lectures):
+        Lecture.objects.filter(id=lecture.id).update(
+            updated_at=timezone.now() - timedelta(days=days)
+        )
+    cache.clear()
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        format='json'
+    )
+    last_modified = parse_http_date(api_response['Last-Modified'])
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        headers={'If-Modified-Since': http_date(last_modified)},
+        format='json'
+    )
+    assert api_response.status_code == 304
+
+    # Latest modified lecture is deleted
+    lectures[1].delete()
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/',
+        headers={'If-Modified-Since': http_date(last_modified)},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data) == 1
+    assert parse_http_date(api_response['Last-Modified']) >= last_modified
+
+
+def test_lecture_detail_etag(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures,
+    test_video
+):
+    '''Test conditional GET of lecture details'''
+
+    client = APIClient()
+
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course=course1, no_of_lectures=2)
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    token1 = access_token(user1, 60)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    etag = api_response['ETag']
+
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={
+            'Authorization': f'Bearer {token1}',
+            'If-None-Match': etag
+        },
+        format='json'
+    )
+    assert api_response.status_code == 304
+
+    # Adding a video changes the ETag
+    video1 = test_video(course=course1, name='Lec 1 video 1')
+    Lecture.objects.add_video_to_lecture(lectures[0].id, video1)
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={
+            'Authorization': f'Bearer {token1}',
+            'If-None-Match': etag
+        },
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert len(api_response.data['videos']) == 1
+
+    # Fail - ETag does not bypass registration check
+    user2 = test_user(username='otheruser@gmail.com')
+    token2 = access_token(user2, 60)
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/{lectures[0].id}',
+        headers={
+            'Authorization': f'Bearer {token2}',
+            'If-None-Match': api_response['ETag']
+        },
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    clean_test_media()
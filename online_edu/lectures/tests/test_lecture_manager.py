@@ -1,42 +1,69 @@
 import pytest
+from django.core.management import call_command
 
 from courses.tests.fixtures import sample_course
 from fixtures import test_lecture, test_lectures
 from lectures.models import Lecture
+from lectures.managers import LECTURE_POSITION_GAP
 
 pytestmark = pytest.mark.django_db
 
 
-def test_lecture_duplicate_title(sample_course, test_lecture):
-    '''Test for method to check for duplicate lecture titles'''
+def test_lecture_duplicate_title(sample_course, test_lecture, django_assert_num_queries):
+    '''Test that lecture titles are unique in a course in every language'''
 
     # Test course
     course1 = sample_course()
+    course2 = sample_course(index=2)
 
     # Test lecture within course
     lecture1 = test_lecture(course=course1)
 
-    # Method should raise exception of duplicate title in course
+    # Fail - same title in different case
     with pytest.raises(Exception) as e:
-        Lecture.objects.check_title_duplicate(course1, lecture1.title.lower())
+        Lecture.objects.create(course=course1, title=lecture1.title.lower())
     assert str(e.value) == 'Lecture with the same title exists in the course'
+    assert Lecture.objects.count() == 1
 
-    # Method should return False if the lecture is excluded
-    # This is so that during updating lectures no exception is raised
-    check_result = Lecture.objects.check_title_duplicate(
-        course1,
-        lecture1.title.lower(),
-        exclude_lecture=lecture1
-    )
-    assert check_result == False
+    # Fail - German title of another lecture
+    lecture2 = test_lecture(course=course1, index=2)
+    lecture2.title_de = lecture1.title_de.upper()
+    with pytest.raises(Exception) as e:
+        lecture2.save()
+    assert str(e.value) == 'Lecture with the same title exists in the course'
+
+    # Fail - title with a non-ASCII capital letter
+    Lecture.objects.create(course=course1, title='Übung 1')
+    with pytest.raises(Exception) as e:
+        Lecture.objects.create(course=course1, title='Übung 1')
+    assert str(e.value) == 'Lecture with the same title exists in the course'
+    with pytest.raises(Exception) as e:
+        Lecture.objects.bulk_create_lectures(course1, [{'title': 'ÜBUNG 1'}])
+    assert str(e.value) == 'Lecture with the same title exists in the course'
 
-    # Non-duplicate title
+    # Same title in another course
+    Lecture.objects.create(course=course2, title=lecture1.title)
+
+    # Title is not searched for before saving. Update in a savepoint
+    # and look up the course snapshot.
+    lecture1.description = 'New description'
+    with django_assert_num_queries(4):
+        lecture1.save()
+
+    # Method should return False if titles are not duplicate
     check_result = Lecture.objects.check_title_duplicate(
-        course1,
-        'Lecture 2'
+        course1.id,
+        [lecture1, Lecture(title='Lecture 3')]
     )
     assert check_result == False
 
+    with pytest.raises(Exception) as e:
+        Lecture.objects.check_title_duplicate(
+            course1.id,
+            [Lecture(title='LECTURE 2')]
+        )
+    assert str(e.value) == 'Lecture with the same title exists in the course'
+
 
 def test_change_lecture_order(sample_course, test_lectures):
     '''Test manager method for changing order of lectures in a course'''
@@ -80,3 +107,115 @@ def test_change_lecture_order(sample_course, test_lectures):
         Lecture.objects.change_lecture_order(lectures[2], 'DowNN')
     assert (str(
         e.value)) == 'Direction in which the lecture needs to be moved can be up or down'
+
+
+def test_lecture_positions(sample_course, test_lectures):
+    '''Test that lectures are numbered from gapped positions'''
+
+    course1 = sample_course()
+    lectures = test_lectures(course=course1, no_of_lectures=4)
+    assert [x.position for x in lectures] == \
+        [LECTURE_POSITION_GAP * (index + 1) for index in range(4)]
+
+    # Sequence numbers are contiguous after a delete
+    lectures[1].delete()
+    check_lectures = Lecture.objects.with_seq_no()
+    assert [(x.title, x.seq_no) for x in check_lectures] == \
+        [('Lecture 1', 1), ('Lecture 3', 2), ('Lecture 4', 3)]
+    assert Lecture.objects.get_seq_no(lectures[3]) == 3
+
+    # A lecture taken by a concurrent save gets the next position
+    lecture = Lecture(course=course1, title='Lecture 5')
+    Lecture.objects.filter(id=lectures[3].id).update(
+        position=LECTURE_POSITION_GAP * 5
+    )
+    lecture.save()
+    assert lecture.position == LECTURE_POSITION_GAP * 6
+
+
+def test_move_lecture_to(sample_course, test_lectures, django_assert_num_queries):
+    '''Test that a lecture is moved by updating only the lecture'''
+
+    course1 = sample_course()
+    lectures = test_lectures(course=course1, no_of_lectures=5)
+
+    # In a savepoint lock the course, read neighbours, write the
+    # lecture and look up the course snapshot
+    with django_assert_num_queries(6):
+        Lecture.objects.move_to(lectures[4], 2)
+    assert lectures[4].position == LECTURE_POSITION_GAP * 3 // 2
+    assert [x.title for x in Lecture.objects.all()] == \
+        ['Lecture 1', 'Lecture 5', 'Lecture 2', 'Lecture 3', 'Lecture 4']
+    assert list(
+        Lecture.objects.exclude(id=lectures[4].id).values_list(
+            'position', flat=True)
+    ) == [LECTURE_POSITION_GAP * (index + 1) for index in range(4)]
+
+    Lecture.objects.move_to(lectures[1], 1)
+    Lecture.objects.move_to(lectures[0], 5)
+    assert [x.title for x in Lecture.objects.all()] == \
+        ['Lecture 2', 'Lecture 5', 'Lecture 3', 'Lecture 4', 'Lecture 1']
+
+    # Later lectures are shifted when there is no room between neighbours
+    for _index in range(12):
+        Lecture.objects.move_to(lectures[3], 2)
+        Lecture.objects.move_to(lectures[2], 2)
+    assert [x.title for x in Lecture.objects.all()] == \
+        ['Lecture 2', 'Lecture 3', 'Lecture 4', 'Lecture 5', 'Lecture 1']
+    assert [x.seq_no for x in Lecture.objects.with_seq_no()] == [1, 2, 3, 4, 5]
+
+
+def test_rebalance_lecture_positions(sample_course, test_lectures):
+    '''Test that crowded lecture positions are spread periodically'''
+
+    course1 = sample_course()
+    course2 = sample_course(index=2)
+    lectures = test_lectures(course=course1, no_of_lectures=3)
+    test_lectures(course=course2, no_of_lectures=3)
+    Lecture.objects.filter(id=lectures[2].id).update(
+        position=LECTURE_POSITION_GAP * 2 + 1
+    )
+    assert Lecture.objects.get_crowded_course_ids() == [course1.id]
+
+    call_command('rebalance_lecture_positions')
+    assert list(
+        Lecture.objects.filter(course=course1).values_list('position', flat=True)
+    ) == [LECTURE_POSITION_GAP * (index + 1) for index in range(3)]
+    assert Lecture.objects.get_crowded_course_ids() == []
+
+
+def test_move_lecture_range_shift(
+    sample_course,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that lectures after a crowded position are shifted at once'''
+
+    course1 = sample_course()
+    lectures = test_lectures(course=course1, no_of_lectures=6)
+    Lecture.objects.filter(id=lectures[2].id).update(
+        position=LECTURE_POSITION_GAP * 2 + 1
+    )
+
+    # Shift and sign flip added to the move
+    with django_assert_num_queries(8):
+        Lecture.objects.move_to(lectures[5], 3)
+    assert [x.title for x in Lecture.objects.all()] == \
+        ['Lecture 1', 'Lecture 2', 'Lecture 6',
+            'Lecture 3', 'Lecture 4', 'Lecture 5']
+    assert list(Lecture.objects.values_list('position', flat=True)) == [
+        LECTURE_POSITION_GAP,
+        LECTURE_POSITION_GAP * 2,
+        LECTURE_POSITION_GAP * 2 + LECTURE_POSITION_GAP // 2,
+        LECTURE_POSITION_GAP * 3 + 1,
+        LECTURE_POSITION_GAP * 5,
+        LECTURE_POSITION_GAP * 6
+    ]
+
+    # Fail - beyond the last lecture
+    with pytest.raises(Exception) as e:
+        Lecture.objects.move_to(lectures[0], 7)
+    assert str(e.value) == 'Position is beyond the last lecture of the course'
+    with pytest.raises(Exception) as e:
+        Lecture.objects.move_to(lectures[0], 0)
+    assert str(e.value) == 'Position of a lecture must be a positive number'
@@ -0,0 +1,264 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from lectures.models import Lecture, LectureProgress
+from registration.models import CourseStudentRegistration
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from video_contents.tests.fixtures import test_video
+from fixtures import test_lecture, test_lectures
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    '''
+    Use a file based cache, which is shared by all processes
+    unlike the local memory cache of the test settings
+    '''
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }
+    }
+
+
+def test_buffered_progress(
+    shared_cache,
+    test_user,
+    sample_course,
+    test_lectures,
+    test_video,
+    django_assert_num_queries
+):
+    '''Test that reports are coalesced in the cache and written in batches'''
+
+    user1 = test_user()
+    user2 = test_user(username='student@gmail.com')
+    course1 = sample_course()
+    lectures = test_lectures(course1, 2)
+    videos = [test_video(course1), test_video(course1, name='Another video')]
+    Lecture.objects.add_video_to_lecture(lectures[0].id, videos[0])
+    Lecture.objects.add_video_to_lecture(lectures[0].id, videos[1])
+    Lecture.objects.add_video_to_lecture(lectures[1].id, videos[0])
+
+    # Reports do not write to the database
+    with django_assert_num_queries(0):
+        for position in range(0, 100, 5):
+            LectureProgress.objects.record_progress(
+                user1,
+                lectures[0],
+                videos[0].id,
+                position
+            )
+        LectureProgress.objects.record_progress(
+            user1,
+            lectures[0],
+            videos[1].id,
+            300,
+            completed=True
+        )
+    assert LectureProgress.objects.count() == 0
+
+    # Reads merge buffered progress
+    progress = LectureProgress.objects.get_progress(user1, lectures[0])
+    assert [(x['video'], x['position'], x['completed'])
+            for x in progress['videos']] == \
+        [(videos[0].id, 95, False), (videos[1].id, 300, True)]
+    assert progress['completed'] == False
+
+    # Users and videos in lectures checked with one query each
+    # and every progress row written once in a savepoint
+    with django_assert_num_queries(6):
+        assert LectureProgress.objects.flush_progress() == 2
+    assert list(LectureProgress.objects.order_by('video_id').values_list(
+        'user_id', 'lecture_id', 'video_id', 'position', 'completed'
+    )) == [
+        (user1.id, lectures[0].id, videos[0].id, 95, False),
+        (user1.id, lectures[0].id, videos[1].id, 300, True),
+    ]
+    assert LectureProgress.objects.flush_progress() == 0
+
+    # Rewatching a completed video does not reset it
+    LectureProgress.objects.record_progress(user1, lectures[0], videos[1].id, 20)
+    LectureProgress.objects.record_progress(user1, lectures[1], videos[0].id, 10)
+    LectureProgress.objects.record_progress(user2, lectures[0], videos[0].id, 5)
+    LectureProgress.objects.record_progress(
+        user1,
+        lectures[0],
+        videos[0].id,
+        200,
+        completed=True
+    )
+    cache.delete(LectureProgress.objects.get_state_key(
+        user1.id,
+        lectures[0].id,
+        videos[1].id
+    ))
+    # Video removed from lecture before the flush
+    lectures[1].videos.remove(videos[0])
+    assert LectureProgress.objects.flush_progress() == 2
+    assert LectureProgress.objects.count() == 3
+    progress = LectureProgress.objects.get_progress(user1, lectures[0])
+    assert [(x['position'], x['completed']) for x in progress['videos']] == \
+        [(200, True), (300, True)]
+    assert progress['completed'] == True
+
+    # Buffered progress is written by the flush command
+    LectureProgress.objects.record_progress(user2, lectures[0], videos[1].id, 15)
+    call_command('flush_lecture_progress')
+    assert LectureProgress.objects.get(user=user2, video=videos[1]).position == 15
+
+    # Completion is kept by later reports before the flush
+    LectureProgress.objects.record_progress(
+        user2,
+        lectures[0],
+        videos[0].id,
+        50,
+        completed=True
+    )
+    LectureProgress.objects.record_progress(user2, lectures[0], videos[0].id, 60)
+    LectureProgress.objects.flush_progress()
+    progress = LectureProgress.objects.get(user=user2, video=videos[0])
+    assert (progress.position, progress.completed) == (60, True)
+
+    # Slot numbered but not yet written when a later slot is flushed
+    slot = LectureProgress.objects.get_next_slot()
+    LectureProgress.objects.record_progress(user2, lectures[0], videos[1].id, 25)
+    assert LectureProgress.objects.flush_progress() == 1
+    cache.set(
+        LectureProgress.objects.get_state_key(user2.id, lectures[0].id, videos[0].id),
+        {'position': 70, 'updated_at': timezone.now()}
+    )
+    cache.set(
+        f'lecture-progress:slot:{slot}',
+        (user2.id, lectures[0].id, videos[0].id)
+    )
+    assert LectureProgress.objects.flush_progress() == 2
+    assert LectureProgress.objects.get(user=user2, video=videos[0]).position == 70
+    assert LectureProgress.objects.flush_progress() == 0
+
+    # Lost slot is skipped after the queue markers have expired
+    slot = LectureProgress.objects.get_next_slot()
+    LectureProgress.objects.record_progress(user2, lectures[0], videos[1].id, 35)
+    assert LectureProgress.objects.flush_progress() == 1
+    assert cache.get('lecture-progress:flushed') == slot - 1
+    cache.set(
+        'lecture-progress:missing-slot',
+        {'slot': slot, 'since': timezone.now() - timedelta(hours=1)}
+    )
+    assert LectureProgress.objects.flush_progress() == 1
+    assert cache.get('lecture-progress:flushed') == slot + 1
+    assert LectureProgress.objects.flush_progress() == 0
+
+    clean_test_media()
+
+
+def test_progress_without_shared_cache(test_user, sample_course, test_lecture, test_video):
+    '''Test that progress is written directly with a process local cache'''
+
+    user1 = test_user()
+    course1 = sample_course()
+    lecture1 = test_lecture(course1)
+    video1 = test_video(course1)
+    Lecture.objects.add_video_to_lecture(lecture1.id, video1)
+
+    LectureProgress.objects.record_progress(user1, lecture1, video1.id, 50, completed=True)
+    LectureProgress.objects.record_progress(user1, lecture1, video1.id, 10)
+    progress = LectureProgress.objects.get(user=user1, video=video1)
+    assert (progress.position, progress.completed) == (10, True)
+    assert LectureProgress.objects.get_progress(user1, lecture1)['completed'] == True
+
+    # Fail - flush command cannot see the buffer of other processes
+    with pytest.raises(CommandError):
+        call_command('flush_lecture_progress')
+
+    clean_test_media()
+
+
+def test_progress_endpoint(
+    shared_cache,
+    test_user,
+    access_token,
+    sample_course,
+    test_lecture,
+    test_video,
+    django_assert_num_queries
+):
+    '''Test that registered students report and read progress'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    user2 = test_user(username='student@gmail.com')
+    user2.is_active = True
+    user2.save()
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lecture1 = test_lecture(course1)
+    video1 = test_video(course1)
+    video2 = test_video(course1, name='Another video')
+    Lecture.objects.add_video_to_lecture(lecture1.id, video1)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+    token1 = access_token(user1, 60)
+    progress_url = f'/api/courses/{course1.slug}/lectures/{lecture1.id}/progress'
+
+    for position in (5, 10, 15):
+        api_response = client.post(
+            progress_url,
+            {'video': video1.id, 'position': position},
+            headers={'Authorization': f'Bearer {token1}'},
+            format='json'
+        )
+        assert api_response.status_code == 202
+    assert LectureProgress.objects.count() == 0
+
+    api_response = client.get(
+        progress_url,
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response.data['lecture'] == lecture1.id
+    assert api_response.data['completed'] == False
+    assert api_response.data['videos'][0]['position'] == 15
+
+    # Fail - video not in lecture
+    api_response = client.post(
+        progress_url,
+        {'video': video2.id, 'position': 5},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 404
+    assert api_response.data['detail'] == 'Video not found in the lecture'
+
+    # Fail - negative position
+    api_response = client.post(
+        progress_url,
+        {'video': video1.id, 'position': -5},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+    # Fail - not registered
+    api_response = client.post(
+        progress_url,
+        {'video': video1.id, 'position': 5},
+        headers={'Authorization': f'Bearer {access_token(user2, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    clean_test_media()
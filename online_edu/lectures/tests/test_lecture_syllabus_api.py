@@ -0,0 +1,131 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import CourseSlugHistory
+from lectures.models import Lecture
+from registration.models import CourseStudentRegistration
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from video_contents.tests.fixtures import test_video
+from fixtures import test_lecture, test_lectures
+from common.file_handling import clean_test_media
+
+pytestmark = pytest.mark.django_db
+
+
+def test_syllabus_endpoint(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures,
+    test_lecture,
+    test_video,
+    django_assert_num_queries
+):
+    '''Test that the syllabus is fetched with fixed number of queries and cached'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    course1 = sample_course()
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course1, 2)
+    video1 = test_video(course1)
+    video2 = test_video(course1, name='Another video')
+    Lecture.objects.add_video_to_lecture(lectures[0].id, video1)
+    Lecture.objects.add_video_to_lecture(lectures[1].id, video2)
+    CourseStudentRegistration.objects.register_student(user1, course1)
+    token1 = access_token(user1, 60)
+
+    def fetch_syllabus():
+        return client.get(
+            f'/api/courses/{course1.slug}/lectures/syllabus',
+            headers={'Authorization': f'Bearer {token1}'},
+            format='json'
+        )
+
+    # User, course with registration, lectures and videos
+    CourseSlugHistory.objects.load_redirects()
+    with django_assert_num_queries(4):
+        api_response = fetch_syllabus()
+    assert api_response.status_code == 200
+    assert [(x['title'], x['seq_no']) for x in api_response.data] == \
+        [('Lecture 1', 1), ('Lecture 2', 2)]
+    assert [x['name'] for x in api_response.data[1]['videos']] == \
+        ['Another video']
+
+    # Served from cache
+    with django_assert_num_queries(2):
+        fetch_syllabus()
+
+    # Number of queries does not depend on number of lectures
+    for index in range(3, 7):
+        lecture = test_lecture(course=course1, index=index)
+        Lecture.objects.add_video_to_lecture(lecture.id, video1)
+    with django_assert_num_queries(4):
+        api_response = fetch_syllabus()
+    assert len(api_response.data) == 6
+    assert api_response.data[5]['videos'][0]['name'] == video1.name
+
+    # Cache invalidated when lectures and videos change
+    lectures[0].title = 'Lecture A'
+    lectures[0].save()
+    assert fetch_syllabus().data[0]['title'] == 'Lecture A'
+    lectures[1].videos.remove(video2)
+    assert fetch_syllabus().data[1]['videos'] == []
+    video1.name = 'New video name'
+    video1.save()
+    assert fetch_syllabus().data[0]['videos'][0]['name'] == 'New video name'
+    Lecture.objects.reorder_lectures(
+        course1,
+        list(reversed(Lecture.objects.values_list('id', flat=True)))
+    )
+    assert fetch_syllabus().data[0]['title'] == 'Lecture 6'
+
+    clean_test_media()
+
+
+def test_unauthorized_syllabus(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures
+):
+    '''Test that the syllabus is only for registered students and admins'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.save()
+    course1 = sample_course()
+    test_lectures(course1, 2)
+
+    # Fail - no credentials
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/syllabus',
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    # Fail - course not published
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/syllabus',
+        headers={'Authorization': f'Bearer {access_token(user1, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 404
+
+    # Fail - not registered
+    course1.is_draft = False
+    course1.save()
+    api_response = client.get(
+        f'/api/courses/{course1.slug}/lectures/syllabus',
+        headers={'Authorization': f'Bearer {access_token(user1, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+    assert api_response.data['detail'] == 'Must register for the course to access a lecture'
@@ -280,3 +280,67 @@ def test_moving_lecture_bad_data(
     )
     assert api_response.status_code == 400
     assert api_response.data['detail'] == 'Direction in which the lecture needs to be moved can be up or down'
+
+
+def test_move_lecture_to_endpoint(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures
+):
+    '''Test that a lecture is moved to any position in the course'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.is_staff = True
+    user1.save()
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    token1 = access_token(user1, 60)
+    lectures = test_lectures(course1, 5)
+
+    # Success - move last lecture to second position
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/{lectures[4].id}/move-to/2',
+        headers={
+            'Authorization': f'Bearer {token1}'
+        },
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert api_response.data['id'] == lectures[4].id
+    assert api_response.data['seq_no'] == 2
+    check_lectures = Lecture.objects.all()
+    assert [x.title for x in check_lectures] == [
+        lectures[0].title,
+        lectures[4].title,
+        lectures[1].title,
+        lectures[2].title,
+        lectures[3].title
+    ]
+
+    # Fail - beyond the last lecture
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/{lectures[4].id}/move-to/6',
+        headers={
+            'Authorization': f'Bearer {token1}'
+        },
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'Position is beyond the last lecture of the course'
+
+    # Fail - not an instructor
+    user2 = test_user(username='admin@gmail.com', is_staff=True)
+    user2.is_active = True
+    user2.save()
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/{lectures[4].id}/move-to/1',
+        headers={
+            'Authorization': f'Bearer {access_token(user2, 60)}'
+        },
+        format='json'
+    )
+    assert api_response.status_code == 403
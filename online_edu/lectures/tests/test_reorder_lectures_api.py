@@ -0,0 +1,121 @@
+import pytest
+from rest_framework.test import APIClient
+
+from courses.models import CourseSnapshot
+from lectures.models import Lecture
+from user_auth.tests.fixtures import test_user, access_token
+from courses.tests.fixtures import sample_course
+from fixtures import test_lecture, test_lectures
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reorder_lectures_endpoint(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures,
+    django_assert_num_queries
+):
+    '''Test that all lectures of a course are reordered at once'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.is_staff = True
+    user1.save()
+    course1 = sample_course()
+    course1.add_instructor(user1)
+    course1.is_draft = False
+    course1.save()
+    lectures = test_lectures(course1, 5)
+    CourseSnapshot.objects.build_snapshot(course1)
+    token1 = access_token(user1, 60)
+    new_order = [lectures[x].id for x in (4, 2, 0, 3, 1)]
+
+    # In a savepoint the lectures are validated with one query and
+    # positions written with one update and a sign flip. The snapshot
+    # is reordered with 3 queries.
+    Lecture.objects.reorder_lectures(course1, list(reversed(new_order)))
+    with django_assert_num_queries(8):
+        Lecture.objects.reorder_lectures(course1, new_order)
+
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': new_order},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 200
+    assert [x['id'] for x in api_response.data] == new_order
+    assert [x['seq_no'] for x in api_response.data] == [1, 2, 3, 4, 5]
+    assert list(Lecture.objects.values_list('id', flat=True)) == new_order
+    snapshot = CourseSnapshot.objects.get(course=course1)
+    assert [
+        (x['id'], x['seq_no']) for x in snapshot.documents['en']['lectures']
+    ] == [(x, index) for index, x in enumerate(new_order, start=1)]
+
+    # Fail - lecture missing
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': new_order[:4]},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'Every lecture of the course must appear once'
+
+    # Fail - lecture repeated
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': new_order + [new_order[0]]},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+
+    # Fail - no list of ids
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': 'abc'},
+        headers={'Authorization': f'Bearer {token1}'},
+        format='json'
+    )
+    assert api_response.status_code == 400
+    assert api_response.data['detail'] == 'List of lecture ids is required'
+    assert list(Lecture.objects.values_list('id', flat=True)) == new_order
+
+
+def test_unauthorized_reorder_lectures(
+    test_user,
+    access_token,
+    sample_course,
+    test_lectures
+):
+    '''Test that lectures can be reordered only by instructors'''
+
+    client = APIClient()
+
+    user1 = test_user()
+    user1.is_active = True
+    user1.is_staff = True
+    user1.save()
+    course1 = sample_course()
+    lectures = test_lectures(course1, 2)
+
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': [lectures[1].id, lectures[0].id]},
+        format='json'
+    )
+    assert api_response.status_code == 403
+
+    api_response = client.post(
+        f'/api/courses/{course1.slug}/lectures/reorder',
+        {'lectures': [lectures[1].id, lectures[0].id]},
+        headers={'Authorization': f'Bearer {access_token(user1, 60)}'},
+        format='json'
+    )
+    assert api_response.status_code == 403
+    assert api_response.data['detail'] == 'Only an instructor can change the order of lectures'
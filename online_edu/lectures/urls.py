@@ -1,6 +1,12 @@
 from django.urls import path, include
 
-from .views import LectureView, AdjustLectureOrderView
+from .views import LectureView, \
+    AdjustLectureOrderView, \
+    MoveLectureView, \
+    BulkCreateLecturesView, \
+    ReorderLecturesView, \
+    LectureSyllabusView, \
+    LectureProgressView
 
 app_name = 'lectures'
 urlpatterns = [
@@ -9,11 +15,36 @@ urlpatterns = [
         LectureView.as_view(),
         name='create-lecture'
     ),
+    path(
+        'bulk-create',
+        BulkCreateLecturesView.as_view(),
+        name='bulk-create-lectures'
+    ),
+    path(
+        'syllabus',
+        LectureSyllabusView.as_view(),
+        name='lecture-syllabus'
+    ),
+    path(
+        'reorder',
+        ReorderLecturesView.as_view(),
+        name='reorder-lectures'
+    ),
     path(
         '<int:id>/move-lecture/<str:direction>',
         AdjustLectureOrderView.as_view(),
         name='move-lecture'
     ),
+    path(
+        '<int:id>/move-to/<int:seq_no>',
+        MoveLectureView.as_view(),
+        name='move-lecture-to'
+    ),
+    path(
+        '<int:id>/progress',
+        LectureProgressView.as_view(),
+        name='lecture-progress'
+    ),
     path(
         '<int:id>/videos/',
         include('video_contents.urls', namespace='video_contents')
@@ -1,4 +1,6 @@
 import logging
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,13 +11,16 @@ from rest_framework.mixins import CreateModelMixin, \
     DestroyModelMixin
 
 from common.base_view import BaseAPIView
+from common.error_handling import extract_serializer_error
+from common.conditional_get import ConditionalGetMixin
 from user_auth.models import User
 from user_auth.views import UserAuthentication
-from courses.models import Course
+from courses.models import Course, CourseTrend
 from common.error_definitions import CustomAPIError
-from registration.models import CourseStudentRegistration
-from .models import Lecture
-from .serializers import LectureSerializer, LectureDetailSerializer
+from .models import Lecture, LectureProgress
+from .serializers import LectureSerializer, \
+    LectureDetailSerializer, \
+    LectureProgressSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -33,16 +38,20 @@ class LectureBaseView(BaseAPIView, UserAuthentication):
     lookup_field : str
         Model field to extract model instance in detail and update views
     course : Course model instance
+    lecture : Lecture model instance
+        Lecture with id in URL fetched with the course
     '''
 
     serializer_class = LectureSerializer
     user_model = User
     lookup_field = 'id'
     course = None
+    lecture = None
 
     def init_lecture(self, admin_only=True):
         '''
-        Initialize lecture view by fetching course.
+        Initialize lecture view by fetching course, the lecture if
+        its id is in URL and access of the user with one query.
         Course slug is in URL.
 
         Parameters
@@ -55,9 +64,10 @@ class LectureBaseView(BaseAPIView, UserAuthentication):
         404 error:
             If course is not published or archived and admin_only=True
         '''
-        course_slug = self.kwargs.get('slug', None)
-        self.course = Course.objects.get_course_by_slug(
-            course_slug,
+        self.course, self.lecture = Lecture.objects.get_lecture_access(
+            self.kwargs.get('slug', None),
+            user=self.request.user,
+            lecture_id=self.kwargs.get('id', None),
             admin_only=admin_only
         )
 
@@ -85,10 +95,7 @@ class LectureBaseView(BaseAPIView, UserAuthentication):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=_('Must be logged in to access a lecture')
             )
-        if not request.user.is_staff and not CourseStudentRegistration.objects.is_student_registered(
-            user=request.user,
-            course=self.course
-        ):
+        if not request.user.is_staff and not self.course.is_registered:
             logger.error(
                 f'Unregistered student {self.request.user.id} attempting to access lecture'
             )
@@ -105,30 +112,29 @@ class LectureBaseView(BaseAPIView, UserAuthentication):
         ------------
         List of lectures for a given course
         '''
-        return Lecture.objects.filter(
-            course=self.course
+        return Lecture.objects.with_seq_no(
+            Lecture.objects.filter(course=self.course)
         )
 
     def get_object(self):
         '''
-        Fetch lecture object
+        Return lecture fetched with the course
 
         Raises
         ---------------
         404 error:
-            If lecture id does not exist in db
+            If lecture id does not exist in course
 
         Returns
         ---------------
         Lecture model instance with id in URL
         '''
-        try:
-            return super().get_object()
-        except:
+        if self.lecture is None:
             raise CustomAPIError(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=_('Lecture not found')
             )
+        return self.lecture
 
     def get_serializer_class(self):
         '''
@@ -146,6 +152,7 @@ class LectureBaseView(BaseAPIView, UserAuthentication):
 
 class LectureView(
     LectureBaseView,
+    ConditionalGetMixin,
     CreateModelMixin,
     ListModelMixin,
     RetrieveModelMixin,
@@ -196,6 +203,9 @@ class LectureView(
         '''
         List and detail view for lectures
 
+        Responses have ETag and Last-Modified headers and a 304
+        response is returned if the lectures have not changed since.
+
         Parameters
         --------------
         request : Request
@@ -212,6 +222,7 @@ class LectureView(
         Returns
         -------------
         Array with lectures in a course or lecture details
+        304 response if lectures have not changed
         '''
         try:
             self.authenticate(request, check_admin=False)
@@ -222,13 +233,40 @@ class LectureView(
         else:
             self.init_lecture(admin_only=False)
         if self.kwargs.get('id', None) is None:
-            return self.list(request, *args, **kwargs)
+            # Deleted lectures keep Last-Modified from going back
+            not_modified = self.check_not_modified(
+                request,
+                self.get_queryset(),
+                changed_at=Lecture.objects.get_syllabus_changed_at(self.course.id)
+            )
+            if not_modified is not None:
+                return not_modified
+            return self.set_validator_headers(
+                self.list(request, *args, **kwargs)
+            )
         self.check_lecture_permissions(request)
         logger.info('Lecture {} accessed by user {}'.format(
             self.kwargs.get('id'),
             self.request.user.id
         ))
-        return self.retrieve(request, *args, **kwargs)
+        # Videos added to the lecture are part of the details
+        not_modified = self.check_not_modified(
+            request,
+            self.get_queryset().filter(id=self.kwargs.get('id')),
+            modified_fields=('updated_at', 'videos__updated_at'),
+            count_fields=('id', 'videos__id')
+        )
+        if not_modified is not None:
+            return not_modified
+        if not self.request.user.is_staff:
+            CourseTrend.objects.record_lecture_access(
+                self.course.id,
+                self.request.user.id,
+                self.kwargs.get('id')
+            )
+        return self.set_validator_headers(
+            self.retrieve(request, *args, **kwargs)
+        )
 
     def post(self, request, *args, **kwargs):
         '''
@@ -366,3 +404,391 @@ class AdjustLectureOrderView(LectureBaseView):
         Lecture.objects.change_lecture_order(
             lecture, self.kwargs.get('direction'))
         return Response()
+
+
+class MoveLectureView(LectureBaseView):
+    '''
+    Move a lecture to any position in a course
+
+    Methods
+    --------------
+    post(request, *args, **kwargs):
+        Moves the lecture
+    '''
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Moves the lecture to the sequence number in URL
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        400 error:
+            Sequence number is beyond the last lecture
+        403 error:
+            User not logged in
+            User is not an instructor of the course
+        404 error:
+            Course not found
+            Lecture not found
+
+        Returns
+        -------------
+        Moved lecture details
+        '''
+        self.authenticate(self.request)
+        self.init_lecture()
+        if not self.course.check_user_is_instructor(request.user):
+            logger.critical(
+                f'Non instructor user {self.request.user.id} moving lecture {self.kwargs.get("id", None)}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_('Only an instructor can change the order of lectures')
+            )
+        lecture = self.get_object()
+        Lecture.objects.move_to(lecture, self.kwargs.get('seq_no'))
+        return Response(self.get_serializer(lecture).data)
+
+
+class BulkCreateLecturesView(LectureBaseView):
+    '''
+    Add several lectures to a course in one request
+
+    Attributes
+    --------------
+    max_items : int
+        Largest number of lectures in one request
+
+    Methods
+    --------------
+    post(request, *args, **kwargs):
+        Creates the lectures
+    '''
+
+    max_items = 100
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Creates lectures at the end of a course from request data:
+        - lectures : list of lectures with title and description
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        400 error:
+            List of lectures missing
+            More than 100 lectures
+            Title is missing
+            Title is duplicate
+        403 error:
+            User not logged in
+            User is not an instructor of the course
+        404 error:
+            Course not found
+
+        Returns
+        -------------
+        201 response with the new lectures
+        '''
+        self.authenticate(self.request)
+        self.init_lecture()
+        if not self.course.check_user_is_instructor(request.user):
+            logger.critical(
+                f'Non instructor user {self.request.user.id} creating lectures in course {self.course.id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_(
+                    'Must be an instructor of the course to create or update lectures'
+                )
+            )
+        items = None
+        if isinstance(request.data, dict):
+            items = request.data.get('lectures', None)
+        if not isinstance(items, list) or not items or \
+                not all(isinstance(item, dict) for item in items):
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('List of lectures to be created is required')
+            )
+        if len(items) > self.max_items:
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=_('Too many lectures in one request')
+            )
+        validated_items = []
+        for item in items:
+            serializer = LectureSerializer(data=item)
+            if not serializer.is_valid():
+                err_message = extract_serializer_error(serializer.errors)
+                logger.error(f'Error in creating lectures - {err_message}')
+                raise CustomAPIError(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=err_message
+                )
+            validated_items.append(serializer.validated_data)
+        lectures = Lecture.objects.bulk_create_lectures(
+            self.course,
+            validated_items
+        )
+        return Response(
+            self.get_serializer(
+                self.get_queryset().filter(
+                    id__in=[lecture.id for lecture in lectures]
+                ),
+                many=True
+            ).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class ReorderLecturesView(LectureBaseView):
+    '''
+    Put all lectures of a course in a new order
+
+    Methods
+    --------------
+    post(request, *args, **kwargs):
+        Reorders the lectures
+    '''
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Reorders lectures of a course with the ids of all lectures
+        of the course in the new order in request data:
+        - lectures : list of lecture ids
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        400 error:
+            Lecture ids missing
+            Lecture ids are not the lectures of the course
+        403 error:
+            User not logged in
+            User is not an instructor of the course
+        404 error:
+            Course not found
+
+        Returns
+        -------------
+        Lectures of the course in the new order
+        '''
+        self.authenticate(self.request)
+        self.init_lecture()
+        if not self.course.check_user_is_instructor(request.user):
+            logger.critical(
+                f'Non instructor user {self.request.user.id} reordering lectures of course {self.course.id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=_('Only an instructor can change the order of lectures')
+            )
+        lecture_ids = None
+        if isinstance(request.data, dict):
+            lecture_ids = request.data.get('lectures', None)
+        Lecture.objects.reorder_lectures(self.course, lecture_ids)
+        return Response(
+            self.get_serializer(self.get_queryset(), many=True).data
+        )
+
+
+class LectureSyllabusView(LectureBaseView):
+    '''
+    All lectures of a course with their videos
+
+    Attributes
+    --------------
+    serializer_class : class
+        LectureDetailSerializer
+
+    Methods
+    --------------
+    get(request, *args, **kwargs):
+        Returns the syllabus of the course
+    '''
+
+    serializer_class = LectureDetailSerializer
+
+    def get_serializer_class(self):
+        '''Return LectureDetailSerializer'''
+        return self.serializer_class
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Returns all lectures of a course in order with their videos.
+        The syllabus is cached for every course and language until
+        lectures or their videos change.
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        403 error:
+            User not logged in
+            User not registered for the course
+        404 error:
+            Course not found
+            Non-admin user accessing unpublished course
+
+        Returns
+        -------------
+        List of lectures with videos
+        '''
+        self.authenticate(request, check_admin=False)
+        if self.request.user.is_staff:
+            self.init_lecture()
+        else:
+            self.init_lecture(admin_only=False)
+        self.check_lecture_permissions(request)
+        logger.info(
+            f'Syllabus of course {self.course.id} fetched by user {self.request.user.id}'
+        )
+        cache_key = Lecture.objects.get_syllabus_cache_key(self.course.id)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_serializer(
+                Lecture.objects.get_syllabus(self.course),
+                many=True
+            ).data
+            cache.set(cache_key, data, timeout=settings.SYLLABUS_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class LectureProgressView(LectureBaseView):
+    '''
+    Progress of a student in the videos of a lecture
+
+    Methods
+    --------------
+    get(request, *args, **kwargs):
+        Returns progress in the lecture
+    post(request, *args, **kwargs):
+        Records progress in a video of the lecture
+    '''
+
+    def init_progress(self, request):
+        '''
+        Authenticate a registered student and fetch the lecture
+
+        Parameters
+        --------------
+        request : Request
+
+        Raises
+        --------------
+        403 error:
+            User not logged in
+            User not registered for the course
+        404 error:
+            Course not found
+            Lecture not found
+
+        Returns
+        --------------
+        Lecture model instance
+        '''
+        self.authenticate(request, check_admin=False)
+        if self.request.user.is_staff:
+            self.init_lecture()
+        else:
+            self.init_lecture(admin_only=False)
+        self.check_lecture_permissions(request)
+        return self.get_object()
+
+    def get(self, request, *args, **kwargs):
+        '''
+        Returns position and completed flag of every video
+        of the lecture including progress not yet saved
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        403 error:
+            User not logged in
+            User not registered for the course
+        404 error:
+            Course not found
+            Lecture not found
+
+        Returns
+        -------------
+        Progress in the lecture and its videos
+        '''
+        lecture = self.init_progress(request)
+        return Response(
+            LectureProgress.objects.get_progress(request.user, lecture)
+        )
+
+    def post(self, request, *args, **kwargs):
+        '''
+        Records progress reported by a video player in request data:
+        - video : id of video in the lecture
+        - position : position in the video in seconds
+        - completed : true if the video has been watched to the end
+
+        Progress is buffered and saved to the database in batches
+        if the cache is shared by all server processes.
+
+        Parameters
+        -------------
+        request : Request
+
+        Raises
+        -------------
+        400 error:
+            Video or position missing
+            Position is negative
+        403 error:
+            User not logged in
+            User not registered for the course
+        404 error:
+            Course not found
+            Lecture not found
+            Video not found in the lecture
+
+        Returns
+        -------------
+        202 response
+        '''
+        lecture = self.init_progress(request)
+        serializer = LectureProgressSerializer(data=request.data)
+        if not serializer.is_valid():
+            err_message = extract_serializer_error(serializer.errors)
+            logger.error(f'Error in recording lecture progress - {err_message}')
+            raise CustomAPIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=err_message
+            )
+        video_id = serializer.validated_data['video_id']
+        if not lecture.videos.filter(id=video_id).exists():
+            logger.error(
+                f'Progress recorded for video {video_id} not in lecture {lecture.id}'
+            )
+            raise CustomAPIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=_('Video not found in the lecture')
+            )
+        LectureProgress.objects.record_progress(
+            request.user,
+            lecture,
+            video_id,
+            serializer.validated_data['position'],
+            completed=serializer.validated_data.get('completed', False)
+        )
+        return Response(status=status.HTTP_202_ACCEPTED)
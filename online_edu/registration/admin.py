@@ -1,5 +1,14 @@
 from django.contrib import admin
 
+from common.admin import EstimatedCountAdminMixin
 from .models import CourseStudentRegistration
 
-admin.site.register(CourseStudentRegistration)
+
+class CourseStudentRegistrationAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    '''
+    Student registrations for admin
+    '''
+    pass
+
+
+admin.site.register(CourseStudentRegistration, CourseStudentRegistrationAdmin)
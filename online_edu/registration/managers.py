@@ -34,11 +34,7 @@ class CourseStudentRegistrationManager(models.Manager):
         boolean
             True if student is registered for a course else False
         '''
-        try:
-            self.get(user=user, course=course)
-        except:
-            return False
-        return True
+        return self.filter(user=user, course=course).exists()
 
     def register_student(self, user, course):
         '''
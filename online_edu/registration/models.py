@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
 
+from courses.models import Course, CourseTrend
 from .managers import CourseStudentRegistrationManager
 
 
@@ -27,3 +29,53 @@ class CourseStudentRegistration(models.Model):
     registered_at = models.DateTimeField(auto_now_add=True)
 
     objects = CourseStudentRegistrationManager()
+
+
+def increment_course_student_count(sender, instance, created, *args, **kwargs):
+    '''
+    Increment student counter of the course of a new registration
+
+    Parameters
+    --------------
+    sender : Model class (CourseStudentRegistration)
+    instance : model instance (CourseStudentRegistration)
+    created : boolean
+        True if a new registration was created
+    '''
+    if created:
+        Course.objects.adjust_counters(instance.course_id, student_count=1)
+
+
+def decrement_course_student_count(sender, instance, *args, **kwargs):
+    '''
+    Decrement student counter of the course of a deleted registration
+
+    Parameters
+    --------------
+    sender : Model class (CourseStudentRegistration)
+    instance : model instance (CourseStudentRegistration)
+    '''
+    Course.objects.adjust_counters(instance.course_id, student_count=-1)
+
+
+def record_course_trend_event(sender, instance, created, *args, **kwargs):
+    '''
+    Add a new registration to the trending score of the course
+
+    Parameters
+    --------------
+    sender : Model class (CourseStudentRegistration)
+    instance : model instance (CourseStudentRegistration)
+    created : boolean
+        True if a new registration was created
+    '''
+    if created:
+        CourseTrend.objects.record_event(instance.course_id, 'registration')
+
+
+post_save.connect(increment_course_student_count,
+                  sender=CourseStudentRegistration)
+post_delete.connect(decrement_course_student_count,
+                    sender=CourseStudentRegistration)
+post_save.connect(record_course_trend_event,
+                  sender=CourseStudentRegistration)
@@ -176,6 +176,51 @@ LOGGING = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Time in seconds for which course list and course details are cached
+COURSE_CACHE_TIMEOUT = 600
+
+# Time in seconds for which the syllabus of a course is cached
+SYLLABUS_CACHE_TIMEOUT = 600
+
+# Time in seconds between writes of buffered lecture progress.
+# Progress is only buffered if the default cache is shared by all
+# processes (e.g. Redis or Memcached), otherwise it is written directly.
+PROGRESS_FLUSH_INTERVAL = 30
+
+# Time in seconds for which buffered lecture progress is kept
+PROGRESS_BUFFER_TIMEOUT = 86400
+
+# Default number of courses in a page of the course catalog
+COURSE_PAGE_SIZE = 20
+
+# Time in hours after which the trending score of a course halves
+TRENDING_HALF_LIFE_HOURS = 72
+
+# Time in seconds for which the trending course list is cached
+TRENDING_CACHE_TIMEOUT = 60
+
+# Time in seconds in which repeated accesses of a lecture by a user
+# add to the trending score of the course only once
+TRENDING_ACCESS_WINDOW = 3600
+
+# Days after which archived courses are moved to cold storage
+COLD_STORAGE_AFTER_DAYS = 180
+
+# Listings with more items than this show an estimated count
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Time in seconds for which counts of filtered listings are cached
+ESTIMATED_COUNT_CACHE_TIMEOUT = 300
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -1,5 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from common.admin import EstimatedCountAdminMixin
 from .models import User
 
-admin.site.register(User, UserAdmin)
+
+class EstimatedCountUserAdmin(EstimatedCountAdminMixin, UserAdmin):
+    '''
+    Users for admin
+    '''
+    pass
+
+
+admin.site.register(User, EstimatedCountUserAdmin)
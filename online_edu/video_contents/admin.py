@@ -1,10 +1,11 @@
 from django.contrib import admin
 from modeltranslation.admin import TranslationAdmin
 
+from common.admin import EstimatedCountAdminMixin
 from .models import VideoContent
 
 
-class VideoContentAdmin(TranslationAdmin):
+class VideoContentAdmin(EstimatedCountAdminMixin, TranslationAdmin):
     '''
     Translation of VideoContent model for admin
     '''
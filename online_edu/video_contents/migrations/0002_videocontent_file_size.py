@@ -0,0 +1,35 @@
+# Generated by Django 4.2.5 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+def populate_file_sizes(apps, schema_editor):
+    '''Store sizes of existing video files'''
+    VideoContent = apps.get_model('video_contents', 'VideoContent')
+    videos = []
+    for video in VideoContent.objects.all():
+        try:
+            video.file_size = video.video_file.size
+        except (OSError, ValueError):
+            video.file_size = 0
+        videos.append(video)
+    VideoContent.objects.bulk_update(videos, ['file_size'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_contents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videocontent',
+            name='file_size',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_file_sizes,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -1,9 +1,11 @@
+from django.apps import apps
 from django.db import models
+from django.db.models.signals import pre_delete, post_save, post_delete
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status
 
 from django.conf import settings
-from courses.models import Course
+from courses.models import Course, CourseSnapshot
 from common.error_definitions import CustomAPIError
 from .managers import VideoContentManager
 
@@ -46,6 +48,8 @@ class VideoContent(models.Model):
     ---------------
     course : Reference to a course model instance
     video_file : File
+    file_size : int
+        Size of video file in bytes. Autogenerated when saved.
     created_at: Datetime
         Autogenerated when model is created
     updated_at: Datetime
@@ -62,6 +66,7 @@ class VideoContent(models.Model):
         default=_('Video name')
     )
     video_file = models.FileField(upload_to=video_file_path, max_length=300)
+    file_size = models.PositiveBigIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,3 +78,154 @@ class VideoContent(models.Model):
 
     def __str__(self):
         return self.video_file.url
+
+    def save(self, *args, **kwargs):
+        '''
+        Saves video and stores the size of the video file
+        '''
+        if self.video_file:
+            try:
+                self.file_size = self.video_file.size
+            except OSError:
+                self.file_size = 0
+        return super().save(*args, **kwargs)
+
+
+def increment_course_video_counters(sender, instance, created, *args, **kwargs):
+    '''
+    Increment video counters of the course of a new video
+
+    Parameters
+    ------------------
+    sender : Model class (VideoContent)
+        Class that causes the signal to call the fuction
+    instance : model instance (VideoContent)
+        The instance that is saved
+    created : boolean
+        True if a new video was created
+    '''
+    if created:
+        Course.objects.adjust_counters(
+            instance.course_id,
+            video_count=1,
+            video_bytes=instance.file_size
+        )
+
+
+def decrement_course_video_counters(sender, instance, *args, **kwargs):
+    '''
+    Decrement video counters of the course of a deleted video
+
+    Parameters
+    ------------------
+    sender : Model class (VideoContent)
+        Class that causes the signal to call the fuction
+    instance : model instance (VideoContent)
+        The instance that is deleted
+    '''
+    Course.objects.adjust_counters(
+        instance.course_id,
+        video_count=-1,
+        video_bytes=-instance.file_size
+    )
+
+
+post_save.connect(increment_course_video_counters, sender=VideoContent)
+post_delete.connect(decrement_course_video_counters, sender=VideoContent)
+
+
+def get_video_lectures(instance):
+    '''
+    Return ids of lectures of a video grouped by course. Videos are
+    shared by reference with cloned courses, so the lectures may
+    belong to several courses. The lectures are remembered on the
+    instance until the syllabus handler has run.
+
+    Parameters
+    ------------------
+    instance : model instance (VideoContent)
+
+    Returns
+    ------------------
+    dict
+        Course id mapped to list of lecture ids
+    '''
+    video_lectures = instance.__dict__.get('_video_lectures', None)
+    if video_lectures is None:
+        video_lectures = {}
+        for lecture_id, course_id in instance.lectures.values_list(
+            'id',
+            'course_id'
+        ):
+            video_lectures.setdefault(course_id, []).append(lecture_id)
+        instance.__dict__['_video_lectures'] = video_lectures
+    return video_lectures
+
+
+def update_course_snapshot(sender, instance, *args, **kwargs):
+    '''
+    Update lectures of a video in the snapshots of published
+    courses that use the video
+
+    Parameters
+    ------------------
+    sender : Model class (VideoContent)
+        Class that causes the signal to call the fuction
+    instance : model instance (VideoContent)
+        The instance that is saved or deleted
+    '''
+    if kwargs.get('created', False):
+        # A new video is not part of any lecture yet
+        return
+    for course_id, lecture_ids in get_video_lectures(instance).items():
+        CourseSnapshot.objects.update_lectures(course_id, lecture_ids)
+
+
+def store_video_lectures(sender, instance, *args, **kwargs):
+    '''
+    Store lectures of a video before it is deleted so that
+    they can be updated in the course snapshots and syllabi
+    after deletion
+
+    Parameters
+    ------------------
+    sender : Model class (VideoContent)
+        Class that causes the signal to call the fuction
+    instance : model instance (VideoContent)
+        The instance that is deleted
+    '''
+    instance.__dict__.pop('_video_lectures', None)
+    get_video_lectures(instance)
+
+
+post_save.connect(update_course_snapshot, sender=VideoContent)
+pre_delete.connect(store_video_lectures, sender=VideoContent)
+post_delete.connect(update_course_snapshot, sender=VideoContent)
+
+
+def invalidate_syllabus_cache(sender, instance, *args, **kwargs):
+    '''
+    Invalidate cached syllabus of the course of a video and of
+    other courses with lectures of the video when the video
+    is saved or deleted
+
+    Parameters
+    ------------------
+    sender : Model class (VideoContent)
+        Class that causes the signal to call the fuction
+    instance : model instance (VideoContent)
+        The instance that is saved or deleted
+    '''
+    if kwargs.get('created', False):
+        # A new video is not part of any lecture yet
+        return
+    course_ids = set(get_video_lectures(instance)) | {instance.course_id}
+    # Lectures are looked up again by the next save
+    instance.__dict__.pop('_video_lectures', None)
+    lecture_manager = apps.get_model('lectures', 'Lecture').objects
+    for course_id in course_ids:
+        lecture_manager.invalidate_syllabus(course_id)
+
+
+post_save.connect(invalidate_syllabus_cache, sender=VideoContent)
+post_delete.connect(invalidate_syllabus_cache, sender=VideoContent)
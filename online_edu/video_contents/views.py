@@ -6,7 +6,6 @@ from rest_framework import status
 from common.base_view import BaseAPIView
 from common.error_definitions import CustomAPIError
 from .models import VideoContent
-from courses.models import Course
 from lectures.models import Lecture
 from user_auth.models import User
 from user_auth.views import UserAuthentication
@@ -61,10 +60,10 @@ class VideoContentView(BaseAPIView, UserAuthentication):
         user = self.authenticate(request)
         file_obj = request.data['File']
 
-        course_slug = self.kwargs.get('slug', None)
-        course_obj = Course.objects.get_course_by_slug(
-            course_slug,
-            admin_only=True
+        course_obj, lecture_obj = Lecture.objects.get_lecture_access(
+            self.kwargs.get('slug', None),
+            user=user,
+            lecture_id=self.kwargs.get('id')
         )
         if not course_obj.check_user_is_instructor(user):
             raise CustomAPIError(
@@ -72,6 +71,12 @@ class VideoContentView(BaseAPIView, UserAuthentication):
                 detail=_('Only an instructor can add videos')
             )
 
+        if lecture_obj is None:
+            raise CustomAPIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=_('Associated lecture could not be found')
+            )
+
         video_name = request.data.get('name')
         if video_name is None:
             raise CustomAPIError(
@@ -87,8 +92,7 @@ class VideoContentView(BaseAPIView, UserAuthentication):
             video_file=file_obj
         )
 
-        lecture_id = self.kwargs.get('id')
-        Lecture.objects.add_video_to_lecture(lecture_id, video_obj)
+        lecture_obj.videos.add(video_obj)
 
         serializer = VideoContentSerializer(video_obj)
 